@@ -1,4 +1,6 @@
 from quran_transcript.utils import Aya
+from quran_transcript.persistence import PersistenceWorker
+from dataclasses import asdict
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response, status
 from pydantic import BaseModel
@@ -30,9 +32,14 @@ async def lifespan(app: FastAPI):
             AYA = aya
             break
 
+    # saving rasm maps in the background (debounced and atomic)
+    global PERSISTENCE
+    PERSISTENCE = PersistenceWorker(start_aya.corpus, debounce=2.0)
+    PERSISTENCE.start()
+
     yield
     # Shutdow event (called before shutdown)
-    AYA.save_quran_dict()
+    PERSISTENCE.stop(flush=True)
 
 
 app = FastAPI(lifespan=lifespan)
@@ -47,7 +54,7 @@ async def root():
 def get(sura_idx: int, aya_idx: int) -> dict:
     global AYA
     new_aya = AYA.set_new(sura_idx=sura_idx, aya_idx=aya_idx)
-    return new_aya.get().__dict__
+    return asdict(new_aya.get())
 
 
 @app.get("/get_suar_names/")
@@ -62,7 +69,7 @@ async def get_suar_list() -> list[str]:
 def step_ayat(sura_idx: int, aya_idx: int, step: int) -> dict:
     new_aya = AYA.set_new(sura_idx=sura_idx, aya_idx=aya_idx)
     new_aya = new_aya.step(step)
-    return new_aya.get().__dict__
+    return asdict(new_aya.get())
 
 
 @app.get("/get_first_aya_to_annotate/")
@@ -78,10 +85,11 @@ async def walk():
                 new_aya.set_rasm_map(
                     uthmani_list=uthmani_words,
                     imlaey_list=imlaey_words)
+                PERSISTENCE.mark_dirty(new_aya.sura_idx, new_aya.aya_idx)
             else:
                 AYA = new_aya
                 break
-    return new_aya.get().__dict__
+    return asdict(new_aya.get())
 
 
 class RasmMap(BaseModel):
@@ -105,9 +113,19 @@ async def save_rasm_map(rasm_map: RasmMap, response: Response):
             uthmani_list=uthmani_words, imlaey_list=imlaey_words)
     except AssertionError:
         response.status_code = status.HTTP_406_NOT_ACCEPTABLE
+        return
+    PERSISTENCE.mark_dirty(new_aya.sura_idx, new_aya.aya_idx)
 
 
 @app.get('/save_quran_dict/')
 async def save_quran_dict():
-    global AYA
-    AYA.save_quran_dict()
+    # saved by the persistence worker (not waiting for the debounce window)
+    PERSISTENCE.request_flush()
+
+
+@app.get('/persistence_status/')
+async def persistence_status() -> dict:
+    """
+    The persistence lag: number of unsaved ayat and the last save time
+    """
+    return PERSISTENCE.status()
@@ -1,5 +1,6 @@
 from quran_transcript.utils import (
-    Aya, AyaFormat, search, RasmFormat,
-    SearchItem, WordSpan, normalize_aya)
-
-import quran_transcript.alphabet as alphabet
+    Aya, AyaFormat, search, search_many, iter_search, RasmFormat,
+    SearchItem, LazySearchItem, WordSpan, CharSpan, normalize_aya)
+from quran_transcript.corpus import QuranCorpus, get_corpus
+from quran_transcript.normalize import normalize_many
+from quran_transcript.fuzzy import fuzzy_search
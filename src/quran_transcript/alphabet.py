@@ -49,9 +49,25 @@ imlaey_starts: ["يا", "ويا", "ها"]
 
 BASE_PATH = Path(__file__).parent
 alphabet_path = BASE_PATH / 'quran-script/quran-alphabet.json'
-with open(alphabet_path, 'r', encoding='utf8') as f:
-    alphabet_dict = json.load(f)
-    imlaey = ImlaeyAlphabet(**alphabet_dict['imlaey'])
-    uthmani = UthmaniAlphabet(**alphabet_dict['uthmani'])
-    unique_rasm = UniqueRasmMap(**alphabet_dict['unique_rasm_map'])
-    istiaatha = Istiaatha(**alphabet_dict['istiaatha'])
+
+# alphabets are loaded lazily on first access (ex: alphabet.imlaey)
+_ALPHABETS = {
+    'imlaey': ('imlaey', ImlaeyAlphabet),
+    'uthmani': ('uthmani', UthmaniAlphabet),
+    'unique_rasm': ('unique_rasm_map', UniqueRasmMap),
+    'istiaatha': ('istiaatha', Istiaatha),
+}
+
+
+def _load_alphabets():
+    with open(alphabet_path, 'r', encoding='utf8') as f:
+        alphabet_dict = json.load(f)
+    for name, (key, alphabet_class) in _ALPHABETS.items():
+        globals()[name] = alphabet_class(**alphabet_dict[key])
+
+
+def __getattr__(name: str):
+    if name in _ALPHABETS:
+        _load_alphabets()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,272 @@
+import argparse
+from pathlib import Path
+from array import array
+import struct
+import json
+import mmap
+import sys
+
+from quran_transcript.corpus import QuranCorpus, DEFAULT_QURAN_PATH, _write_atomic
+
+MAGIC = b'QTCORP01'
+BINARY_SUFFIX = '.bin'
+
+"""
+Binary corpus layout (little endian):
+    MAGIC (8 bytes)
+    header length (uint32)
+    header (utf8 json): {
+        "sura_names": [str],
+        "num_ayat": [int],  # per sura
+        "join_prefix": str,
+        "sections": {name: [byte offset, byte length]},
+    }
+    sections (4 bytes aligned):
+        * text blobs (utf8): for every `TEXT_FIELDS` and "maps" (json of
+          the rasm_map and bismillah_map of every aya)
+        * "{field}_aya_offsets" (int32[num_ayat + 1]): byte offsets of
+          every aya in the blob of `field`. A `None` field of an aya has
+          an empty span
+"""
+TEXT_FIELDS = ['uthmani', 'imlaey', 'bismillah_uthmani', 'bismillah_imlaey']
+
+
+def _int32_bytes(values: list[int]) -> bytes:
+    arr = array('i', values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def compile_binary_corpus(
+    corpus: QuranCorpus,
+    out_path: str | Path,
+):
+    """
+    Compile the `corpus` into a single binary file read by `MmapQuranCorpus`
+    """
+    keys = {
+        'uthmani': corpus.uthmani_key,
+        'imlaey': corpus.imlaey_key,
+        'bismillah_uthmani': corpus.bismillah_uthmani_key,
+        'bismillah_imlaey': corpus.bismillah_imlaey_key,
+    }
+    blobs = {field: bytearray() for field in TEXT_FIELDS + ['maps']}
+    int_sections = {}
+    for field in TEXT_FIELDS + ['maps']:
+        int_sections[f'{field}_aya_offsets'] = [0]
+
+    sura_names = []
+    num_ayat = []
+    for sura_idx in range(corpus.num_suar):
+        sura_names.append(corpus.get_sura_name(sura_idx))
+        num_ayat.append(corpus.get_num_ayat(sura_idx))
+        for aya_idx in range(num_ayat[-1]):
+            aya = corpus.get_aya(sura_idx, aya_idx)
+            for field in TEXT_FIELDS:
+                text = aya.get(keys[field])
+                if text is not None:
+                    blobs[field] += text.encode('utf8')
+                int_sections[f'{field}_aya_offsets'].append(len(blobs[field]))
+
+            maps = {key: aya[key] for key in [
+                corpus.map_key, corpus.bismillah_map_key] if key in aya}
+            if maps:
+                blobs['maps'] += json.dumps(maps, ensure_ascii=False).encode('utf8')
+            int_sections['maps_aya_offsets'].append(len(blobs['maps']))
+
+    sections = dict(blobs)
+    sections.update(
+        {name: _int32_bytes(values) for name, values in int_sections.items()})
+
+    # computing sections offsets (the header length depends on them)
+    header = {
+        'sura_names': sura_names,
+        'num_ayat': num_ayat,
+        'join_prefix': corpus.join_prefix,
+        'sections': {name: [0, 0] for name in sections},
+    }
+    data_start = 0
+    while True:
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf8')
+        start = len(MAGIC) + 4 + len(header_bytes)
+        start += -start % 4
+        if start == data_start:
+            break
+        data_start = start
+        offset = data_start
+        for name, section in sections.items():
+            header['sections'][name] = [offset, len(section)]
+            offset += len(section) + (-len(section) % 4)
+
+    data = bytearray(MAGIC)
+    data += struct.pack('<I', len(header_bytes))
+    data += header_bytes
+    data += b'\0' * (data_start - len(data))
+    for name, section in sections.items():
+        assert len(data) == header['sections'][name][0]
+        data += section
+        data += b'\0' * (-len(section) % 4)
+    # never truncated in place: the running processes keep their mapping
+    # of the old file
+    _write_atomic(out_path, data)
+
+
+class MmapQuranCorpus(QuranCorpus):
+    supports_journal = False
+
+    def __init__(
+        self,
+        quran_path: str | Path,
+        **kwargs,
+    ):
+        """
+        Read only `QuranCorpus` of a binary file compiled with
+        `compile_binary_corpus`. The file is accessed through `mmap` so
+        processes reading the same file share a single page cache copy.
+        """
+        super().__init__(None, quran_path=quran_path, **kwargs)
+        with open(quran_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assert self._mmap[:len(MAGIC)] == MAGIC, (
+            f'Not a binary Quran corpus: {quran_path}')
+        header_len, = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(
+            self._mmap[header_start: header_start + header_len].decode('utf8'))
+        assert self.header['join_prefix'] == self.join_prefix, (
+            f"join_prefix mismatch: file={self.header['join_prefix']!r}"
+            + f" corpus={self.join_prefix!r}")
+
+        self._sura_names: list[str] = self.header['sura_names']
+        self._num_ayat: list[int] = self.header['num_ayat']
+        self._sura_starts = [0]
+        for num_ayat in self._num_ayat:
+            self._sura_starts.append(self._sura_starts[-1] + num_ayat)
+
+        view = memoryview(self._mmap)
+        self._sections = {}
+        for name, (offset, length) in self.header['sections'].items():
+            section = view[offset: offset + length]
+            if name.endswith('_offsets'):
+                if sys.byteorder == 'little':
+                    section = section.cast('i')
+                else:
+                    section = array('i', section.tobytes())
+                    section.byteswap()
+            self._sections[name] = section
+
+    def _get_init_args(self) -> tuple:
+        """
+        pickled as its path (read again from the file)
+        """
+        return (self.quran_path,)
+
+    @property
+    def num_suar(self) -> int:
+        return len(self._num_ayat)
+
+    @property
+    def quran_dict(self) -> dict:
+        """
+        The full quran dict (built on every call, avoid on hot paths)
+        """
+        suar = []
+        for sura_idx in range(self.num_suar):
+            suar.append(self.get_sura_object(sura_idx))
+        return {'quran': {'sura': suar}}
+
+    @quran_dict.setter
+    def quran_dict(self, value):
+        # `QuranCorpus.__init__` sets it to None
+        assert value is None, 'MmapQuranCorpus is read only'
+
+    def _check_sura(self, sura_idx: int):
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+
+    def _get_text(self, field: str, idx: int) -> str | None:
+        offsets = self._sections[f'{field}_aya_offsets']
+        start, end = offsets[idx], offsets[idx + 1]
+        if start == end:
+            return None
+        return str(self._sections[field][start: end], 'utf8')
+
+    def get_sura(self, sura_idx: int) -> list[dict]:
+        return [self.get_aya(sura_idx, aya_idx)
+                for aya_idx in range(self.get_num_ayat(sura_idx))]
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        return {
+            '@index': str(sura_idx + 1),
+            self.sura_name_key: self.get_sura_name(sura_idx),
+            'aya': self.get_sura(sura_idx),
+        }
+
+    def get_sura_name(self, sura_idx: int) -> str:
+        self._check_sura(sura_idx)
+        return self._sura_names[sura_idx]
+
+    def get_num_ayat(self, sura_idx: int) -> int:
+        self._check_sura(sura_idx)
+        return self._num_ayat[sura_idx]
+
+    def get_aya(self, sura_idx: int, aya_idx: int) -> dict:
+        idx = self.get_absolute_idx(sura_idx, aya_idx)
+        keys = {
+            'uthmani': self.uthmani_key,
+            'imlaey': self.imlaey_key,
+            'bismillah_uthmani': self.bismillah_uthmani_key,
+            'bismillah_imlaey': self.bismillah_imlaey_key,
+        }
+        aya = {'@index': str(aya_idx + 1)}
+        for field in TEXT_FIELDS:
+            text = self._get_text(field, idx)
+            if text is not None:
+                aya[keys[field]] = text
+        maps = self._get_text('maps', idx)
+        if maps is not None:
+            aya.update(json.loads(maps))
+        return aya
+
+    def _split_aya_words(self, absolute_idx: int) -> dict[str, tuple[str, ...] | None]:
+        """
+        the texts are read from their blobs directly (the aya dict and its
+        rasm maps are not built)
+        """
+        words = {}
+        for field in TEXT_FIELDS:
+            text = self._get_text(field, absolute_idx)
+            words[field] = None if text is None else tuple(text.split(self.join_prefix))
+        return words
+
+    def set_aya_maps(self, *args, **kwargs):
+        raise PermissionError(
+            'MmapQuranCorpus is read only. Set rasm maps on the json corpus'
+            + ' and compile it again with `compile_binary_corpus`')
+
+    def save(self, *args, **kwargs):
+        raise PermissionError('MmapQuranCorpus is read only')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        'Compile the merged Quran json script into a binary corpus file')
+    parser.add_argument(
+        '--quran-file',
+        type=Path,
+        default=DEFAULT_QURAN_PATH,
+        help='The path to the merged Quran script "file.json"')
+    parser.add_argument(
+        '--output-file',
+        type=Path,
+        help=f'The path to the output file "file{BINARY_SUFFIX}"')
+    args = parser.parse_args()
+
+    assert args.output_file.suffix == BINARY_SUFFIX, (
+        f'Output file extention has to be "{BINARY_SUFFIX}"'
+        + f' your input: {args.output_file.suffix}')
+
+    compile_binary_corpus(
+        QuranCorpus.from_file(args.quran_file),
+        out_path=args.output_file,
+    )
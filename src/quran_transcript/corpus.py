@@ -0,0 +1,830 @@
+from typing import TYPE_CHECKING
+from pathlib import Path
+from collections import OrderedDict
+from array import array
+from bisect import bisect_right
+import threading
+import tempfile
+import json
+import time
+import os
+
+from quran_transcript.vocab import Vocabulary
+from quran_transcript.normalize import normalize_aya, get_normalization_profile
+from quran_transcript.search_index import SearchIndex
+
+if TYPE_CHECKING:
+    from quran_transcript.word_index import WordIndex
+
+BASE_PATH = Path(__file__).parent
+DEFAULT_QURAN_PATH = BASE_PATH / 'quran-script/quran-uthmani-imlaey.json'
+
+# the text fields of an aya that are split into words (see `get_words`)
+WORD_FIELDS = ['uthmani', 'imlaey', 'bismillah_uthmani', 'bismillah_imlaey']
+
+# the default keys of the quran dict (the `QuranCorpus` arguments) so the
+# calls of `get_corpus` with and without them share the same corpus
+DEFAULT_CORPUS_KEYS = dict(
+    prefix="@",
+    map_key="rasm_map",
+    bismillah_map_key="bismillah_map",
+    bismillah_key="bismillah",
+    uthmani_key="uthmani",
+    imlaey_key="imlaey",
+    sura_name_key="name",
+    join_prefix=" ",
+)
+
+# the directory of the cached data (ex: suffix arrays) (default: user cache dir)
+CACHE_DIR_ENV = 'QURAN_TRANSCRIPT_CACHE_DIR'
+
+
+class QuranCorpus(object):
+    # only the in-memory json corpus supports the rasm map journal
+    supports_journal = True
+    # maximum number of normalization profiles cached by
+    # `get_normalized_imlaey` (least recently used profiles are evicted)
+    max_normalized_profiles = 4
+
+    def __init__(
+        self,
+        quran_dict: dict,
+        quran_path: str | Path = None,
+        prefix="@",
+        map_key="rasm_map",
+        bismillah_map_key="bismillah_map",
+        bismillah_key="bismillah",
+        uthmani_key="uthmani",
+        imlaey_key="imlaey",
+        sura_name_key="name",
+        join_prefix=" ",
+    ):
+        """
+        The whole Holy Quran script loaded once and shared by every `Aya`
+        object pointing to the same file (see `get_corpus`)
+
+        Args:
+            quran_dict (dict): the merged uthmani imlaey quran dict
+            quran_path (str | Path): the path of the json file the
+                `quran_dict` is loaded from (None for in-memory dicts)
+            the rest of the Args are the keys of the quran_dict
+        """
+        self.quran_dict = quran_dict
+        self.quran_path = None if quran_path is None else Path(quran_path)
+        # the keys Args (to create a copy of the corpus see `__reduce__`)
+        self.corpus_keys = dict(
+            prefix=prefix,
+            map_key=map_key,
+            bismillah_map_key=bismillah_map_key,
+            bismillah_key=bismillah_key,
+            uthmani_key=uthmani_key,
+            imlaey_key=imlaey_key,
+            sura_name_key=sura_name_key,
+            join_prefix=join_prefix,
+        )
+
+        self.map_key = map_key
+        self.bismillah_map_key = bismillah_map_key
+        self.uthmani_key = prefix + uthmani_key
+        self.imlaey_key = prefix + imlaey_key
+        self.sura_name_key = prefix + sura_name_key
+        self.bismillah_uthmani_key = f"{prefix}{bismillah_key}_{uthmani_key}"
+        self.bismillah_imlaey_key = f"{prefix}{bismillah_key}_{imlaey_key}"
+        self.join_prefix = join_prefix
+
+        # set by `get_corpus` for the process wide shared corpora
+        self.cache_key = None
+
+        # absolute aya index tables (built once see `get_sura_starts`)
+        self._sura_starts: list[int] = None
+        self._sura_names: list[str] = None
+
+        # rasm maps journal (see `enable_journal`)
+        self.journal_enabled = False
+        # guards writing rasm maps against dumping the quran dict
+        self._maps_lock = threading.RLock()
+        self._journal_file = None
+
+        # {absolute aya idx: AyaFormat} built by `Aya.get` and invalidated
+        # by `set_aya_maps`
+        self.aya_formats: dict[int, object] = {}
+
+        # {script: Vocabulary} and {field: [word ids of every aya]} the words
+        # are stored as word ids only built once per aya (see `get_word_ids`)
+        self._vocabs: dict[str, Vocabulary] = None
+        self._word_ids: dict[str, list[array | None]] = None
+        self._words_built: bytearray = None
+        self._words_lock = threading.Lock()
+        # {normalization profile: (Vocabulary, {field: [word ids]})}
+        self._normalized_word_ids: dict[frozenset, tuple] = {}
+
+        # {(normalization profile, suffix): [normalized imlaey of every aya]}
+        # LRU of `max_normalized_profiles` (see `get_normalized_imlaey`)
+        self._normalized_ayat: OrderedDict[tuple, list[tuple | None]] = OrderedDict()
+        self._normalized_lock = threading.Lock()
+        self.normalized_hits = 0
+        self.normalized_misses = 0
+        # {(normalization profile, suffix, include_bismillah): SearchIndex}
+        # LRU of `max_normalized_profiles` (see `get_search_index`)
+        self._search_indices: OrderedDict[tuple, SearchIndex] = OrderedDict()
+        # {(normalization profile, suffix): WordIndex} (see `get_word_index`)
+        self._word_indices: OrderedDict[tuple, 'WordIndex'] = OrderedDict()
+
+    @classmethod
+    def from_file(cls, quran_path: str | Path, **kwargs):
+        """
+        load the quran json script of `quran_path`
+        """
+        quran_dict = load_quran_dict(quran_path)
+        corpus = cls(quran_dict, quran_path=quran_path, **kwargs)
+        corpus.replay_journal()
+        return corpus
+
+    @property
+    def journal_path(self) -> Path:
+        """
+        The rasm maps journal of the corpus: "{quran_path}.journal"
+        """
+        return Path(f'{self.quran_path}.journal')
+
+    @property
+    def _compacting_journal_path(self) -> Path:
+        return Path(f'{self.quran_path}.journal.compacting')
+
+    def enable_journal(self):
+        """
+        Append every `set_aya_maps` to the journal file instead of saving
+        the whole corpus: `save` costs O(one aya) and a crash never
+        corrupts the main file. The journal is replayed on load and merged
+        into the main file by `compact`.
+        """
+        assert self.supports_journal, (
+            f'{type(self).__name__} does not support the rasm maps journal')
+        assert self.quran_path is not None, 'No `quran_path` for the journal'
+        self.journal_enabled = True
+
+    def replay_journal(self):
+        """
+        apply the journal records to the corpus (a partially written
+        record of a crash is skipped)
+        """
+        if self.quran_path is None:
+            return
+        for journal_path in [self._compacting_journal_path, self.journal_path]:
+            if not journal_path.exists():
+                continue
+            with open(journal_path, 'r', encoding='utf8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._set_aya_maps(
+                        record['sura_idx'],
+                        record['aya_idx'],
+                        rasm_map=record['rasm_map'],
+                        bismillah_map=record['bismillah_map'],
+                    )
+
+    def _append_journal(
+        self,
+        sura_idx: int,
+        aya_idx: int,
+        rasm_map: list[dict[str, str]],
+        bismillah_map: list[dict[str, str]] = None,
+    ):
+        record = {
+            'sura_idx': sura_idx,
+            'aya_idx': aya_idx,
+            'rasm_map': rasm_map,
+            'bismillah_map': bismillah_map,
+            'timestamp': time.time(),
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self._maps_lock:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf8')
+                # starting a new line after a partially written record
+                if self._journal_file.tell() > 0:
+                    with open(self.journal_path, 'rb') as f:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b'\n':
+                            self._journal_file.write('\n')
+            self._journal_file.write(line + '\n')
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+
+    def compact(self, background=False) -> threading.Thread | None:
+        """
+        merge the journal into the main file (written atomically) then
+        remove the journal
+        Args:
+            background (bool): compact in a background thread (returned)
+        """
+        if background:
+            thread = threading.Thread(target=self.compact, daemon=True)
+            thread.start()
+            return thread
+
+        with self._maps_lock:
+            # new records go to a new journal while writing the main file
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            if self.journal_path.exists():
+                os.replace(self.journal_path, self._compacting_journal_path)
+            quran_dict = self._copy_quran_dict()
+        data = json.dumps(quran_dict, ensure_ascii=False, indent=2).encode("utf8")
+        self._write_main_file(self.quran_path, data)
+        self._compacting_journal_path.unlink(missing_ok=True)
+
+    @property
+    def num_suar(self) -> int:
+        return len(self.quran_dict["quran"]["sura"])
+
+    def get_sura_starts(self) -> list[int]:
+        """
+        Return the prefix sum table of suar lengths: the absolute index of
+        the first aya of every sura and the total number of ayat at the end
+        (len = num_suar + 1)
+        """
+        if self._sura_starts is None:
+            sura_starts = [0]
+            for sura_idx in range(self.num_suar):
+                sura_starts.append(sura_starts[-1] + self.get_num_ayat(sura_idx))
+            self._sura_starts = sura_starts
+        return self._sura_starts
+
+    def get_sura_names(self) -> list[str]:
+        if self._sura_names is None:
+            self._sura_names = [
+                self.get_sura_name(sura_idx) for sura_idx in range(self.num_suar)]
+        return self._sura_names
+
+    @property
+    def num_ayat(self) -> int:
+        """
+        The total number of ayat in the Holy Quran
+        """
+        return self.get_sura_starts()[-1]
+
+    def get_absolute_idx(self, sura_idx: int, aya_idx: int) -> int:
+        """
+        Return the absolute index of an aya in the Holy Quran
+        Args:
+            sura_idx (int): from 0 to 113
+            aya_idx (int): form 0 to len(sura) - 1
+        Return:
+            (int): from 0 to 6235
+        """
+        self.check_indices(sura_idx, aya_idx)
+        return self.get_sura_starts()[sura_idx] + aya_idx
+
+    def get_sura_aya_idx(self, absolute_idx: int) -> tuple[int, int]:
+        """
+        Return the (sura_idx, aya_idx) starting from 0 of an absolute aya index
+        """
+        sura_starts = self.get_sura_starts()
+        assert absolute_idx >= 0 and absolute_idx < sura_starts[-1], (
+            f"Absolute aya index out of range {absolute_idx} "
+            + f"and number of ayat={sura_starts[-1]}")
+        sura_idx = bisect_right(sura_starts, absolute_idx) - 1
+        return sura_idx, absolute_idx - sura_starts[sura_idx]
+
+    def _split_aya_words(self, absolute_idx: int) -> dict[str, tuple[str, ...] | None]:
+        """
+        Return {field: the words of the aya split by `join_prefix`} for
+        every field of `WORD_FIELDS` (None if the aya has no such field)
+        """
+        keys = {
+            'uthmani': self.uthmani_key,
+            'imlaey': self.imlaey_key,
+            'bismillah_uthmani': self.bismillah_uthmani_key,
+            'bismillah_imlaey': self.bismillah_imlaey_key,
+        }
+        aya = self.get_aya(*self.get_sura_aya_idx(absolute_idx))
+        words = {}
+        for field in WORD_FIELDS:
+            text = aya.get(keys[field])
+            words[field] = None if text is None else tuple(text.split(self.join_prefix))
+        return words
+
+    def _build_aya_word_ids(self, absolute_idx: int):
+        """
+        encode the words of an aya into word ids (once per aya). Bismillah
+        words share the vocabulary of their script
+        """
+        words = self._split_aya_words(absolute_idx)
+        with self._words_lock:
+            if self._word_ids is None:
+                self._vocabs = {'uthmani': Vocabulary(), 'imlaey': Vocabulary()}
+                self._word_ids = {
+                    field: [None] * self.num_ayat for field in WORD_FIELDS}
+                self._words_built = bytearray(self.num_ayat)
+            if self._words_built[absolute_idx]:
+                return
+            for field in WORD_FIELDS:
+                if words[field] is not None:
+                    vocab = self._vocabs[field.split('_')[-1]]
+                    self._word_ids[field][absolute_idx] = vocab.encode(
+                        words[field], add=True)
+            self._words_built[absolute_idx] = 1
+
+    def get_word_ids(self, field: str, absolute_idx: int) -> array | None:
+        """
+        Return the word ids (`array('I')`) of an aya in the vocabulary of
+        the field script (see `get_vocab`)
+        Args:
+            field (str): one of `WORD_FIELDS`
+            absolute_idx (int): the absolute aya index (from 0 to 6235)
+        Return:
+            array: the word ids or None if the aya has no such field
+                (ex: bismillah of aya not at the start of the sura)
+        """
+        if self._word_ids is None or not self._words_built[absolute_idx]:
+            self._build_aya_word_ids(absolute_idx)
+        return self._word_ids[field][absolute_idx]
+
+    def get_words(self, field: str, absolute_idx: int) -> tuple[str, ...] | None:
+        """
+        Return the words of an aya split by `join_prefix` decoded from its
+        word ids (every distinct word is a single shared str object)
+        Args:
+            field (str): one of `WORD_FIELDS`
+            absolute_idx (int): the absolute aya index (from 0 to 6235)
+        Return:
+            tuple[str]: the words or None if the aya has no such field
+                (ex: bismillah of aya not at the start of the sura)
+        """
+        word_ids = self.get_word_ids(field, absolute_idx)
+        if word_ids is None:
+            return None
+        return self._vocabs[field.split('_')[-1]].decode(word_ids)
+
+    def get_word_starts(self, field: str, absolute_idx: int) -> tuple[int, ...] | None:
+        """
+        Return the character index of every word start in the aya text
+        (see `get_words`)
+        """
+        words = self.get_words(field, absolute_idx)
+        if words is None:
+            return None
+        starts = []
+        start = 0
+        for word in words:
+            starts.append(start)
+            start += len(word) + len(self.join_prefix)
+        return tuple(starts)
+
+    def get_vocab(self, script='imlaey') -> Vocabulary:
+        """
+        Return the vocabulary of the `script` either "uthmani" or "imlaey"
+        (encoding the words of every aya)
+        """
+        if self._word_ids is None or 0 in self._words_built:
+            for absolute_idx in range(self.num_ayat):
+                self.get_word_ids(script, absolute_idx)
+        return self._vocabs[script]
+
+    def _get_normalized_tables(self, normalize_kwargs: dict) -> tuple:
+        profile = get_normalization_profile(**normalize_kwargs)
+        tables = self._normalized_word_ids.get(profile)
+        if tables is not None:
+            return tables
+
+        # normalizing every distinct imlaey word once
+        imlaey_vocab = self.get_vocab('imlaey')
+        vocab = Vocabulary()
+        id2norm_id = array('I', [
+            vocab.add(normalize_aya(word, remove_spaces=False, **normalize_kwargs))
+            for word in imlaey_vocab.id2word
+        ])
+        word_ids = {}
+        for field in ['imlaey', 'bismillah_imlaey']:
+            word_ids[field] = []
+            for absolute_idx in range(self.num_ayat):
+                ids = self.get_word_ids(field, absolute_idx)
+                if ids is not None:
+                    ids = array('I', [id2norm_id[word_id] for word_id in ids])
+                    for word_id in ids:
+                        vocab.counts[word_id] += 1
+                word_ids[field].append(ids)
+        tables = (vocab, word_ids)
+        self._normalized_word_ids[profile] = tables
+        return tables
+
+    def get_normalized_vocab(self, **kwargs) -> Vocabulary:
+        """
+        Return the vocabulary of the normalized imlaey words
+        Args:
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        return self._get_normalized_tables(kwargs)[0]
+
+    def get_normalized_word_ids(
+        self, field: str, absolute_idx: int, **kwargs
+    ) -> array | None:
+        """
+        Return the normalized imlaey word ids (see `get_normalized_vocab`)
+        Args:
+            field (str): either "imlaey" or "bismillah_imlaey"
+            absolute_idx (int): the absolute aya index (from 0 to 6235)
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        return self._get_normalized_tables(kwargs)[1][field][absolute_idx]
+
+    def get_normalized_imlaey(
+        self, absolute_idx: int, suffix=" ", **kwargs
+    ) -> tuple[tuple[str, ...], str, tuple[str, ...] | None, str | None]:
+        """
+        Return the normalized imlaey of an aya computed once per
+        normalization profile: (words, script, bismillah_words,
+        bismillah_script) where words are split by `suffix` and the script
+        is the joined words without spaces (bismillah is None for ayat
+        without bismillah)
+
+        Args:
+            absolute_idx (int): the absolute aya index (from 0 to 6235)
+            suffix (str): the separator of the words
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        return self.get_normalized_imlaey_range(
+            absolute_idx, 1, suffix=suffix, **kwargs)[0]
+
+    def get_normalized_imlaey_range(
+        self, start_idx: int, num_ayat: int, suffix=" ", **kwargs
+    ) -> list[tuple]:
+        """
+        `get_normalized_imlaey` of `num_ayat` ayat starting from the
+        absolute index `start_idx` (wrapping around the end of the Quran)
+        """
+        key = (get_normalization_profile(**kwargs), suffix)
+        with self._normalized_lock:
+            ayat = self._normalized_ayat.get(key)
+            if ayat is None:
+                ayat = [None] * self.num_ayat
+                self._normalized_ayat[key] = ayat
+                if len(self._normalized_ayat) > self.max_normalized_profiles:
+                    self._normalized_ayat.popitem(last=False)
+            else:
+                self._normalized_ayat.move_to_end(key)
+
+        items = []
+        total_ayat = self.num_ayat
+        for absolute_idx in range(start_idx, start_idx + num_ayat):
+            absolute_idx %= total_ayat
+            item = ayat[absolute_idx]
+            if item is None:
+                self.normalized_misses += 1
+                item = self._normalize_imlaey(absolute_idx, suffix, kwargs)
+                ayat[absolute_idx] = item
+            else:
+                self.normalized_hits += 1
+            items.append(item)
+        return items
+
+    def _normalize_imlaey(
+        self, absolute_idx: int, suffix: str, normalize_kwargs: dict
+    ) -> tuple:
+        aya = self.get_aya(*self.get_sura_aya_idx(absolute_idx))
+        item = ()
+        for key in [self.imlaey_key, self.bismillah_imlaey_key]:
+            if key in aya:
+                words = tuple(normalize_aya(
+                    aya[key], remove_spaces=False, **normalize_kwargs).split(suffix))
+                item += (words, ''.join(''.join(words).split()))
+            else:
+                item += (None, None)
+        return item
+
+    def get_search_index(
+        self, include_bismillah=False, suffix=" ", build=True, **kwargs
+    ) -> SearchIndex | None:
+        """
+        Return the `SearchIndex` of the whole Quran for a normalization
+        profile (built once, see `max_normalized_profiles`)
+        Args:
+            include_bismillah (bool): prepend the bismillah words to the
+                first aya of every sura having bismillah
+            suffix (str): the separator of the words
+            build (bool): if False: return None if the index is not built yet
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        key = (get_normalization_profile(**kwargs), suffix, include_bismillah)
+        with self._normalized_lock:
+            index = self._search_indices.get(key)
+            if index is not None:
+                self._search_indices.move_to_end(key)
+                return index
+        if not build:
+            return None
+
+        index = SearchIndex(
+            self, include_bismillah=include_bismillah, suffix=suffix, **kwargs)
+        with self._normalized_lock:
+            self._search_indices[key] = index
+            if len(self._search_indices) > 2 * self.max_normalized_profiles:
+                self._search_indices.popitem(last=False)
+        return index
+
+    def get_word_index(self, suffix=" ", **kwargs) -> 'WordIndex':
+        """
+        Return the `WordIndex` of the whole Quran for a normalization
+        profile (built once, see `max_normalized_profiles`)
+        Args:
+            suffix (str): the separator of the words
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        # the word index module uses `SearchItem` of utils
+        from quran_transcript.word_index import WordIndex
+
+        key = (get_normalization_profile(**kwargs), suffix)
+        with self._normalized_lock:
+            index = self._word_indices.get(key)
+            if index is not None:
+                self._word_indices.move_to_end(key)
+                return index
+
+        index = WordIndex(self, suffix=suffix, **kwargs)
+        with self._normalized_lock:
+            self._word_indices[key] = index
+            if len(self._word_indices) > self.max_normalized_profiles:
+                self._word_indices.popitem(last=False)
+        return index
+
+    def normalized_cache_info(self) -> dict:
+        """
+        statistics of the normalized imlaey cache (see `get_normalized_imlaey`)
+        """
+        return {
+            'hits': self.normalized_hits,
+            'misses': self.normalized_misses,
+            'profiles': len(self._normalized_ayat),
+            'max_profiles': self.max_normalized_profiles,
+        }
+
+    def check_indices(self, sura_idx: int, aya_idx: int):
+        """
+        Args:
+            sura_idx (int): from 0 to 113
+            aya_idx (int): form 0 to len(sura) - 1
+        """
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        num_ayat = self.get_num_ayat(sura_idx)
+        assert aya_idx >= 0 and aya_idx < num_ayat, (
+            f"Aya index out of range (sura_index={sura_idx + 1} "
+            + f"aya_index={aya_idx + 1}) "
+            + f"and length of sura={num_ayat}"
+        )
+
+    def get_sura(self, sura_idx: int) -> list[dict]:
+        """
+        Args:
+            sura_idx (int): from 0 to 113
+        """
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        return self.quran_dict["quran"]["sura"][sura_idx]["aya"]
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        return self.quran_dict["quran"]["sura"][sura_idx]
+
+    def get_sura_name(self, sura_idx: int) -> str:
+        return self.get_sura_object(sura_idx)[self.sura_name_key]
+
+    def get_num_ayat(self, sura_idx: int) -> int:
+        return len(self.get_sura(sura_idx))
+
+    def get_aya(self, sura_idx: int, aya_idx: int) -> dict:
+        """
+        Return the raw aya dict
+        Args:
+            sura_idx (int): from 0 to 113
+            aya_idx (int): form 0 to len(sura) - 1
+        """
+        sura = self.get_sura(sura_idx)
+        assert aya_idx >= 0 and aya_idx < len(sura), (
+            f"Aya index out of range (sura_index={sura_idx + 1} "
+            + f"aya_index={aya_idx + 1}) "
+            + f"and length of sura={len(sura)}"
+        )
+        return sura[aya_idx]
+
+    def set_aya_maps(
+        self,
+        sura_idx: int,
+        aya_idx: int,
+        rasm_map: list[dict[str, str]],
+        bismillah_map: list[dict[str, str]] = None,
+    ):
+        """
+        set the rasm_map (and the bismillah_map if not None) of an aya
+        (appended to the journal if enabled see `enable_journal`)
+        """
+        with self._maps_lock:
+            self._set_aya_maps(
+                sura_idx, aya_idx, rasm_map=rasm_map, bismillah_map=bismillah_map)
+            if self.journal_enabled:
+                self._append_journal(
+                    sura_idx, aya_idx, rasm_map=rasm_map, bismillah_map=bismillah_map)
+
+    def _set_aya_maps(
+        self,
+        sura_idx: int,
+        aya_idx: int,
+        rasm_map: list[dict[str, str]],
+        bismillah_map: list[dict[str, str]] = None,
+    ):
+        aya = self.get_aya(sura_idx, aya_idx)
+        aya[self.map_key] = rasm_map
+        if bismillah_map is not None:
+            aya[self.bismillah_map_key] = bismillah_map
+        self.invalidate_aya(sura_idx, aya_idx)
+
+    def invalidate_aya(self, sura_idx: int, aya_idx: int):
+        """
+        drop the cached records of an aya after changing it
+        """
+        self.aya_formats.pop(self.get_absolute_idx(sura_idx, aya_idx), None)
+
+    def __reduce__(self):
+        """
+        The shared corpora of `get_corpus` are pickled as a reference (not
+        as the whole Quran script) so `Aya` and `SearchItem` objects are
+        cheap to send to process pools: unpickling returns the shared corpus
+        of the same file in that process, loaded from disk if not loaded
+        yet, so the rasm maps not saved yet are not in it.
+        Other corpora are pickled with their quran dict (as a new corpus
+        without the caches, the journal is not enabled)
+        """
+        if self.cache_key is not None:
+            real_path, keys = self.cache_key
+            return _get_shared_corpus, (real_path, keys)
+        return _new_corpus, (type(self), self._get_init_args(), self.corpus_keys)
+
+    def _get_init_args(self) -> tuple:
+        """
+        the positional Args of `__init__` to pickle (see `__reduce__`)
+        """
+        return self.quran_dict, self.quran_path
+
+    def save(self, quran_path: str | Path = None):
+        """
+        save the quran dict into `quran_path` (default: `self.quran_path`)
+        If the journal is enabled saving to `self.quran_path` does nothing
+        as every change is already in the journal (see `compact`)
+        """
+        if quran_path is None:
+            if self.journal_enabled:
+                return
+            quran_path = self.quran_path
+        assert quran_path is not None, "No `quran_path` to save the corpus to"
+        # serialized outside the lock so `set_aya_maps` waits for the copy only
+        with self._maps_lock:
+            quran_dict = self._copy_quran_dict()
+        data = json.dumps(quran_dict, ensure_ascii=False, indent=2).encode("utf8")
+        self._write_main_file(quran_path, data)
+
+    def _copy_quran_dict(self) -> dict:
+        """
+        a snapshot of the quran dict to serialize (taken under `_maps_lock`):
+        the aya dicts are copied and their values shared as `set_aya_maps`
+        replaces the rasm maps and never changes them in place
+        """
+        quran_dict = dict(self.quran_dict)
+        quran_dict['quran'] = dict(quran_dict['quran'])
+        quran_dict['quran']['sura'] = [
+            _copy_sura(sura) for sura in quran_dict['quran']['sura']]
+        return quran_dict
+
+    def _write_main_file(self, quran_path: str | Path, data: bytes):
+        """
+        write the json `data` atomically (temporary file then `os.replace`)
+        """
+        _write_atomic(quran_path, data)
+        if Path(quran_path) == self.quran_path:
+            _refresh_corpus_mtime(self)
+
+
+def _copy_sura(sura: dict) -> dict:
+    """
+    a snapshot of a sura object to serialize (see `_copy_quran_dict`)
+    """
+    return {**sura, 'aya': [dict(aya) for aya in sura['aya']]}
+
+
+def _write_atomic(path: str | Path, data: bytes):
+    """
+    write `data` to a temporary file then replace `path` with it so a crash
+    never leaves a partially written file
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, delete=False, suffix='.tmp'
+    ) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f.name, path)
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the cache directory of the suffix arrays of the search indices
+    (see `SearchIndex.enable_suffix_array`):
+    $QURAN_TRANSCRIPT_CACHE_DIR else $XDG_CACHE_HOME/quran_transcript else
+    ~/.cache/quran_transcript
+    """
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'quran_transcript'
+
+
+def load_quran_dict(quran_path: str | Path) -> dict:
+    """
+    load the quran json script of `quran_path`
+    """
+    with open(quran_path, 'rb') as f:
+        return json.loads(f.read())
+
+
+# Process wide corpora: {(quran_path, kwargs): (mtime, QuranCorpus)}
+_CORPORA: dict[tuple, tuple[int, QuranCorpus]] = {}
+_CORPORA_LOCK = threading.Lock()
+_REAL_PATHS: dict[str | Path, str] = {}
+
+
+def _refresh_corpus_mtime(corpus: QuranCorpus):
+    """
+    keep `corpus` as the shared corpus after saving it to its own file
+    """
+    if corpus.cache_key is None:
+        return
+    with _CORPORA_LOCK:
+        _CORPORA[corpus.cache_key] = (
+            os.stat(corpus.quran_path).st_mtime_ns, corpus)
+
+
+def _new_corpus(cls: type, args: tuple, keys: dict) -> QuranCorpus:
+    """
+    unpickling of `QuranCorpus.__reduce__` for not shared corpora
+    """
+    return cls(*args, **keys)
+
+
+def _get_shared_corpus(real_path: str, keys: tuple) -> QuranCorpus:
+    """
+    unpickling of `QuranCorpus.__reduce__`
+    """
+    return get_corpus(real_path, **dict(keys))
+
+
+def _load_corpus(quran_path: str | Path, **kwargs) -> QuranCorpus:
+    """
+    load the corpus of `quran_path` according to its file extention
+    """
+    if Path(quran_path).is_dir():
+        from quran_transcript.sharded_corpus import ShardedQuranCorpus
+        return ShardedQuranCorpus(quran_path, **kwargs)
+    elif Path(quran_path).suffix == '.bin':
+        from quran_transcript.binary_corpus import MmapQuranCorpus
+        return MmapQuranCorpus(quran_path, **kwargs)
+    elif Path(quran_path).suffix in ['.sqlite', '.db']:
+        from quran_transcript.sqlite_corpus import SqliteQuranCorpus
+        return SqliteQuranCorpus(quran_path, **kwargs)
+    return QuranCorpus.from_file(quran_path, **kwargs)
+
+
+def get_corpus(
+    quran_path: str | Path = DEFAULT_QURAN_PATH,
+    **kwargs,
+) -> QuranCorpus:
+    """
+    Return the process wide shared `QuranCorpus` of `quran_path`.
+    The file is loaded lazily on the first call and loaded again only if
+    the file modification time changes.
+
+    Args:
+        quran_path (str | Path): path to the quran json script or a binary
+            corpus compiled by `binary_corpus.compile_binary_corpus` (".bin")
+            or a sqlite3 database of `sqlite_corpus.migrate_to_sqlite`
+            (".sqlite", ".db") or a directory of
+            `sharded_corpus.split_quran_script` (a file per sura)
+        the rest of **kwargs are the `QuranCorpus` keys
+    """
+    kwargs = {**DEFAULT_CORPUS_KEYS, **kwargs}
+    real_path = _REAL_PATHS.get(quran_path)
+    if real_path is None:
+        real_path = _REAL_PATHS[quran_path] = os.path.realpath(quran_path)
+    key = (real_path, tuple(sorted(kwargs.items())))
+    mtime = os.stat(quran_path).st_mtime_ns
+    with _CORPORA_LOCK:
+        cached = _CORPORA.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        corpus = _load_corpus(quran_path, **kwargs)
+        corpus.cache_key = key
+        _CORPORA[key] = (mtime, corpus)
+        return corpus
@@ -0,0 +1,220 @@
+from bisect import bisect_left
+
+from quran_transcript import alphabet as alpha
+from quran_transcript.corpus import QuranCorpus, get_corpus
+from quran_transcript.normalize import normalize_aya
+from quran_transcript.search_index import SearchIndex
+from quran_transcript.utils import (
+    SearchItem, PartOfUthmaniWord, _get_index_search_item)
+
+
+def edit_distances(pattern: str, text: str) -> list[int]:
+    """
+    Return the edit distances (Levenshtein) between `pattern` and every
+    prefix of `text`: distances[j] = distance(pattern, text[:j + 1]) using
+    the bit-parallel algorithm of Myers (Hyyrö's formulation) in
+    O(len(text)) big integer operations: the columns of the dynamic
+    programming matrix are kept as bit vectors of the vertical +1/-1 deltas
+    """
+    m = len(pattern)
+    if m == 0:
+        return list(range(1, len(text) + 1))
+    peq: dict[str, int] = {}
+    for idx, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << idx)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv = full
+    mv = 0
+    score = m
+    distances = []
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # shifting in 1: the first row is the distance to the empty pattern
+        # (the match starts at the first character of `text`)
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        distances.append(score)
+    return distances
+
+
+def _get_candidate_starts(
+    normalized_text: str, index: SearchIndex, max_edits: int
+) -> list[int]:
+    """
+    Return the sorted word starts in `index.text` where a match of at most
+    `max_edits` edits can start: `normalized_text` is split into
+    max_edits + 1 pieces one of them at least has to match exactly
+    (pigeonhole principle)
+    """
+    m = len(normalized_text)
+    num_pieces = max_edits + 1
+    starts = set()
+    for piece_idx in range(num_pieces):
+        piece_start = piece_idx * m // num_pieces
+        piece_end = (piece_idx + 1) * m // num_pieces
+        for seed in index.find_all(normalized_text[piece_start: piece_end]):
+            expected_start = seed - piece_start
+            word_idx = bisect_left(index.word_starts, expected_start - max_edits)
+            while (word_idx < len(index.word_starts)
+                   and index.word_starts[word_idx] <= expected_start + max_edits):
+                starts.add(index.word_starts[word_idx])
+                word_idx += 1
+    return sorted(starts)
+
+
+def _fuzzy_find(
+    normalized_text: str, index: SearchIndex, max_edits: int
+) -> list[tuple[int, int, int]]:
+    """
+    Return the non overlapping (edit distance, start, end) character spans
+    of `index.text` on word boundaries within `max_edits` of
+    `normalized_text` (the closest first)
+    """
+    m = len(normalized_text)
+    candidates = []
+    for start in _get_candidate_starts(normalized_text, index, max_edits):
+        stop = min(start + m + max_edits, len(index.text))
+        distances = edit_distances(normalized_text, index.text[start: stop])
+        best = None
+        word_idx = bisect_left(index.word_ends, start + 1)
+        while word_idx < len(index.word_ends) and index.word_ends[word_idx] <= stop:
+            end = index.word_ends[word_idx]
+            distance = distances[end - start - 1]
+            if distance <= max_edits and (best is None or distance < best[0]):
+                best = (distance, start, end)
+            word_idx += 1
+        if best is not None:
+            candidates.append(best)
+
+    # the closest candidates first dropping the overlapping ones
+    found = []
+    taken_starts = []
+    taken_ends = []
+    for distance, start, end in sorted(candidates):
+        idx = bisect_left(taken_starts, start)
+        if idx > 0 and taken_ends[idx - 1] > start:
+            continue
+        if idx < len(taken_starts) and taken_starts[idx] < end:
+            continue
+        taken_starts.insert(idx, start)
+        taken_ends.insert(idx, end)
+        found.append((distance, start, end))
+    return found
+
+
+def fuzzy_search(
+    text: str,
+    max_edits: int = 1,
+    corpus: QuranCorpus = None,
+    suffix=" ",
+    **kwargs,
+) -> list[SearchItem]:
+    """searches the whole Holy Quran for `text` allowing up to `max_edits`
+    character edits (insertions, deletions or substitutions) for noisy
+    transcripts (ex: "ة" vs "ه" or a dropped letter)
+
+    Every result is a run of whole imlaey words whose normalized script is
+    within `max_edits` of the normalized `text`. Candidates are found with
+    exact lookups of max_edits + 1 pieces of `text` in the `SearchIndex` of
+    the corpus then verified with the bit-parallel edit distance of Myers.
+    Matches including bismillah words are ranked with the other matches by
+    their edit distance (after the matches without bismillah of the same
+    distance)
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        max_edits (int): the maximum edit distance. Has to be less than the
+            number of characters of the normalized `text`
+        corpus (QuranCorpus): the corpus to search in (default: the corpus
+            of the default Quran script)
+        suffix (str): the separator of the words
+        the rest of **kwargs are from normalize_aya function
+
+    Returns:
+        list[SearchItem]: sorted by `edit_distance` then by position
+    """
+    assert max_edits >= 0, f'max_edits has to be >= 0 got: {max_edits}'
+    normalized_text: str = normalize_aya(text, remove_spaces=True, **kwargs)
+    if normalized_text == "":
+        return []
+    if corpus is None:
+        corpus = get_corpus()
+
+    # NOTE: Istiaatha is matched exactly (as `search`)
+    has_istiaatha = False
+    istiaatha_str = normalize_aya(
+        alpha.istiaatha.imlaey, remove_spaces=True, **kwargs)
+    istiaatha_start = normalized_text.find(istiaatha_str)
+    if istiaatha_start != -1:
+        normalized_text = normalized_text[istiaatha_start + len(istiaatha_str):]
+        has_istiaatha = True
+        if normalized_text == "":
+            return [
+                SearchItem(
+                    start_aya=None,
+                    num_ayat=None,
+                    imlaey_word_span=None,
+                    has_bismillah=None,
+                    has_istiaatha=has_istiaatha,
+                    uthmani_script=alpha.istiaatha.uthmani,
+                )
+            ]
+    assert max_edits < len(normalized_text), (
+        f'max_edits={max_edits} has to be less than the normalized text length'
+        + f' ({len(normalized_text)})')
+
+    found = []
+    plain_index = corpus.get_search_index(
+        include_bismillah=False, suffix=suffix, **kwargs)
+    for include_bismillah in [False, True]:
+        index = corpus.get_search_index(
+            include_bismillah=include_bismillah, suffix=suffix, **kwargs)
+        for distance, start, end in _fuzzy_find(normalized_text, index, max_edits):
+            # matches without bismillah words are found without bismillah
+            if include_bismillah and not _has_bismillah(
+                    start, end, index, plain_index):
+                continue
+            try:
+                item = _get_index_search_item(
+                    index, start, end, has_istiaatha, corpus)
+            except PartOfUthmaniWord:
+                # the imlaey words are a part of a single uthmani word
+                continue
+            item.edit_distance = distance
+            if has_istiaatha:
+                item.uthmani_script = (
+                    alpha.istiaatha.uthmani + suffix + item.uthmani_script)
+            found.append(item)
+    # stable: by position for the same distance
+    found.sort(key=lambda item: (item.edit_distance, item.has_bismillah))
+    return found
+
+
+def _has_bismillah(
+    start: int, end: int, index: SearchIndex, plain_index: SearchIndex
+) -> bool:
+    """
+    True if the span [start, end) of `index` (with bismillah) has
+    characters of a bismillah: the bismillah of an aya is the difference of
+    its lengths in `index` and `plain_index` (without bismillah)
+    """
+    for aya_idx in range(index.get_aya_idx(start), index.get_aya_idx(end - 1) + 1):
+        aya_start = index.aya_starts[aya_idx]
+        bismillah_len = (
+            index.aya_starts[aya_idx + 1] - aya_start
+            - plain_index.aya_starts[aya_idx + 1] + plain_index.aya_starts[aya_idx])
+        if bismillah_len > 0 and start < aya_start + bismillah_len and end > aya_start:
+            return True
+    return False
@@ -0,0 +1,261 @@
+from typing import Iterable, Iterator, Callable
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from array import array
+import os
+
+from quran_transcript import alphabet as alpha
+
+
+@lru_cache
+def _get_replacements(
+    ignore_hamazat: bool,
+    ignore_alef_maksoora: bool,
+    ignore_taa_marboota: bool,
+    normalize_taat: bool,
+    remove_small_alef: bool,
+    remove_tashkeel: bool,
+) -> tuple[tuple[str, str], ...]:
+    """
+    compile the normalization steps (every step replaces single characters)
+    into a single table: (char, replacement) where the replacement is the
+    result of applying the steps in order on the char.
+
+    NOTE: the table is applied with `str.replace` not `str.translate` as
+    `str.translate` looks up a dict for every character of non latin text
+    (slower than the previous `re.sub` passes)
+    """
+    # (characters, replacement) in the order of the original re.sub passes
+    steps: list[tuple[str, str]] = []
+    if ignore_alef_maksoora:
+        steps.append((alpha.imlaey.alef_maksoora, alpha.imlaey.alef))
+    if ignore_hamazat:
+        steps.append((alpha.imlaey.hamazat, alpha.imlaey.hamza))
+    if ignore_taa_marboota:
+        steps.append((alpha.imlaey.taa_marboota, alpha.imlaey.haa))
+    if normalize_taat:
+        steps.append((alpha.imlaey.taa_marboota, alpha.imlaey.taa_mabsoota))
+    if remove_small_alef:
+        steps.append((alpha.imlaey.small_alef, ''))
+    if remove_tashkeel:
+        steps.append((alpha.imlaey.tashkeel, ''))
+
+    table = {}
+    for char in sorted(set(''.join(chars for chars, _ in steps))):
+        out = char
+        for chars, replacement in steps:
+            if out != '' and out in chars:
+                out = replacement
+        if out != char:
+            table[char] = out
+
+    # the replacements are fixed points so the order of applying the table
+    # does not matter
+    assert not (set(table.values()) & set(table)), (
+        'A normalization replacement is normalized again')
+    return tuple(table.items())
+
+
+def normalize_aya(
+    text: str,
+    remove_spaces=True,
+    ignore_hamazat=False,
+    ignore_alef_maksoora=True,
+    ignore_taa_marboota=False,
+    normalize_taat=False,
+    remove_small_alef=True,
+    remove_tashkeel=False,
+    return_offsets=False,
+) -> str | tuple[str, array]:
+    """Apply filters to match input Kwargs on **Imlaey** text
+
+    Args:
+        remove_spaces (bool): remove spaces for text
+
+        ignore_hamazat (bool): making all hamazat equal (أ, آ, إ ء, ئ, ؤ) = (ء)
+        alphabet.imlaey.hmazat -> alphabet.imlaey.
+
+        ignore_alef_maksoora (bool): (ى) -> (ا).
+        alphabet.imlaey.alef_maksoora = alphabet.imlaey.alef
+
+        ignore_taa_marboota (bool): (ة) -> (ه).
+        alphabet.imlaey.taa_motaterfa -> alphabet.imlaey.haa
+
+        normalize_taat (bool): (ة) -> (ت).
+        alphabet.imlaey.taa_marboota = alphabet.taa_mabsoota
+
+        NOTE: We can not use `ignore_taaa_marboota` and `normalize_taaat` at
+        the same time
+
+        remove_small_alef (bool): remove small alef "ٰ" in
+        alphabet.imlaey.small_alef (alef khingarai)
+
+        remove_tashkeel (bool): remove tashkeel: "ًٌٍَُِّْ" in alphabet.imlaey.tashkeel
+
+        return_offsets (bool): return the source index in `text` of every
+        normalized character too
+
+        Return:
+            str: the normalied imlaey text
+            or (str, array('I')) if `return_offsets`: the normalized text
+            and for every normalized character its index in `text`
+    """
+    assert not (ignore_taa_marboota and normalize_taat), (
+        'You can not `ignore_taa_marboota` and `normaize_taat` at the same time')
+
+    # TODO: Ingonre alef as hamza
+
+    # every flags combination is compiled once into a table
+    replacements = _get_replacements(
+        bool(ignore_hamazat),
+        bool(ignore_alef_maksoora),
+        bool(ignore_taa_marboota),
+        bool(normalize_taat),
+        bool(remove_small_alef),
+        bool(remove_tashkeel),
+    )
+    if return_offsets:
+        return _normalize_with_offsets(
+            text, dict(replacements), bool(remove_spaces))
+
+    if remove_spaces:
+        # `str.split()` splits on `re` "\\s" characters
+        text = ''.join(text.split())
+    for char, replacement in replacements:
+        text = text.replace(char, replacement)
+    return text
+
+
+def _normalize_with_offsets(
+    text: str,
+    table: dict[str, str],
+    remove_spaces: bool,
+) -> tuple[str, array]:
+    """
+    single pass over `text` applying the replacements `table` and keeping
+    the source index of every output character (every replacement is a
+    single character or a deletion)
+    """
+    norm_chars = []
+    offsets = array('I')
+    for idx, char in enumerate(text):
+        if remove_spaces and char.isspace():
+            continue
+        char = table.get(char, char)
+        if char:
+            norm_chars.append(char)
+            offsets.append(idx)
+    return ''.join(norm_chars), offsets
+
+
+def get_normalization_profile(**kwargs) -> frozenset:
+    """
+    Return the `normalize_aya` flags (default values included) as a
+    hashable key: equivalent keyword arguments have the same profile
+    """
+    code = normalize_aya.__code__
+    flags = dict(zip(
+        code.co_varnames[1: code.co_argcount], normalize_aya.__defaults__))
+    flags.update(kwargs)
+    flags.pop('return_offsets', None)
+    return frozenset((name, bool(value)) for name, value in flags.items())
+
+
+def _compile_normalizer(
+    remove_spaces=True,
+    ignore_hamazat=False,
+    ignore_alef_maksoora=True,
+    ignore_taa_marboota=False,
+    normalize_taat=False,
+    remove_small_alef=True,
+    remove_tashkeel=False,
+) -> Callable[[str], str]:
+    """
+    Return a function equivalent to `normalize_aya` with the given flags
+    (flags resolved once instead of for every text)
+    """
+    assert not (ignore_taa_marboota and normalize_taat), (
+        'You can not `ignore_taa_marboota` and `normaize_taat` at the same time')
+    replacements = _get_replacements(
+        bool(ignore_hamazat),
+        bool(ignore_alef_maksoora),
+        bool(ignore_taa_marboota),
+        bool(normalize_taat),
+        bool(remove_small_alef),
+        bool(remove_tashkeel),
+    )
+
+    def normalize(text: str) -> str:
+        if remove_spaces:
+            text = ''.join(text.split())
+        for char, replacement in replacements:
+            text = text.replace(char, replacement)
+        return text
+
+    return normalize
+
+
+def _normalize_chunk(texts: list[str], normalize_kwargs: dict) -> list[str]:
+    # top level function to be pickled to the process pool
+    normalize = _compile_normalizer(**normalize_kwargs)
+    return [normalize(text) for text in texts]
+
+
+def normalize_many(
+    texts: Iterable[str],
+    chunk_size=10_000,
+    parallel_threshold=200_000,
+    max_workers: int | None = None,
+    **kwargs,
+) -> Iterator[str]:
+    """Normalize many texts with the same `normalize_aya` flags
+
+    Results are yielded in the input order while `texts` (any iterable or
+    generator) is consumed lazily chunk by chunk. After `parallel_threshold`
+    texts the next chunks are normalized in a `ProcessPoolExecutor`.
+
+    Args:
+        texts (Iterable[str]): the texts to normalize
+        chunk_size (int): number of texts sent to a worker at once
+        parallel_threshold (int): number of texts normalized in the calling
+            process before using the process pool (None: never use a pool)
+        max_workers (int): number of processes (default: `os.cpu_count()`)
+            1 disables the process pool
+        the rest of **kwargs are from normalize_aya function
+
+    Return:
+        Iterator[str]: the normalized texts
+    """
+    normalize = _compile_normalizer(**kwargs)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        parallel_threshold = None
+    texts = iter(texts)
+
+    # small inputs: no process pool overhead
+    num_texts = 0
+    while parallel_threshold is None or num_texts < parallel_threshold:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            return
+        num_texts += len(chunk)
+        for text in chunk:
+            yield normalize(text)
+
+    # multiprocessing is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # bounded number of chunks in flight to keep streaming
+        futures = deque()
+        while True:
+            while len(futures) < 2 * max_workers:
+                chunk = list(islice(texts, chunk_size))
+                if not chunk:
+                    break
+                futures.append(executor.submit(_normalize_chunk, chunk, kwargs))
+            if not futures:
+                return
+            yield from futures.popleft().result()
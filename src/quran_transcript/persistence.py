@@ -0,0 +1,159 @@
+import threading
+import time
+
+from quran_transcript.corpus import QuranCorpus
+
+
+class PersistenceWorker(object):
+    def __init__(
+        self,
+        corpus: QuranCorpus,
+        debounce: float = 2.0,
+        max_delay: float = 30.0,
+    ):
+        """
+        Saving the rasm maps of a corpus in a background thread: every
+        changed aya is marked dirty (`mark_dirty`) and rapid changes are
+        coalesced into a single save once no aya was marked for `debounce`
+        seconds (or `max_delay` seconds after the first unsaved change).
+        The corpus `save` writes atomically (temporary file then
+        `os.replace`) so the callers (ex: request handlers) never wait for
+        the disk.
+
+        Args:
+            corpus (QuranCorpus): the corpus to save
+            debounce (float): seconds without new changes before saving
+            max_delay (float): maximum seconds an unsaved change waits
+        """
+        self.corpus = corpus
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        # time.time() of the last successful save (None: never saved)
+        self.last_flush_time: float | None = None
+        # the exception of the last failed save (None: no failure)
+        self.last_error: Exception | None = None
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # (sura_idx, aya_idx) starting from 0 changed since the last save
+        self._dirty: set[tuple[int, int]] = set()
+        self._first_dirty_time: float | None = None
+        self._last_dirty_time: float | None = None
+        self._flush_now = False
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending_dirty(self) -> int:
+        """
+        The number of changed ayat not saved yet
+        """
+        return len(self._dirty)
+
+    def status(self) -> dict:
+        """
+        persistence lag info: {'pending_dirty', 'last_flush_time',
+        'last_error', 'running'}
+        """
+        return {
+            'pending_dirty': self.pending_dirty,
+            'last_flush_time': self.last_flush_time,
+            'last_error': None if self.last_error is None else repr(self.last_error),
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
+
+    def start(self):
+        assert self._thread is None, 'The persistence worker is already started'
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name='quran-persistence', daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """
+        stop the background thread (saving the pending changes if `flush`)
+        """
+        if self._thread is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        if flush and self._dirty:
+            self.flush()
+
+    def mark_dirty(self, sura_idx: int, aya_idx: int):
+        """
+        Args:
+            sura_idx (int): the index of the sura starting from 0
+            aya_idx (int): the index of the aya starting from 0
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty:
+                self._first_dirty_time = now
+            self._dirty.add((sura_idx, aya_idx))
+            self._last_dirty_time = now
+        self._wakeup.set()
+
+    def request_flush(self):
+        """
+        save the pending changes without waiting for the debounce window
+        """
+        with self._lock:
+            self._flush_now = True
+        self._wakeup.set()
+
+    def flush(self):
+        """
+        save the corpus now (in the calling thread)
+        """
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+            self._first_dirty_time = None
+            self._flush_now = False
+        try:
+            if self.corpus.journal_enabled:
+                self.corpus.compact()
+            else:
+                self.corpus.save()
+        except Exception as e:
+            # keeping the changes dirty to retry on the next save
+            with self._lock:
+                self._dirty |= dirty
+                # retrying after the debounce window
+                self._first_dirty_time = time.monotonic()
+                self._last_dirty_time = self._first_dirty_time
+            self.last_error = e
+            return
+        self.last_flush_time = time.time()
+        self.last_error = None
+
+    def _get_wait_time(self) -> float | None:
+        """
+        seconds to wait before the next save (None: nothing to save)
+        """
+        with self._lock:
+            if not self._dirty and not self._flush_now:
+                return None
+            if self._flush_now:
+                return 0.0
+            now = time.monotonic()
+            return max(0.0, min(
+                self._last_dirty_time + self.debounce - now,
+                self._first_dirty_time + self.max_delay - now,
+            ))
+
+    def _run(self):
+        while not self._stopping:
+            wait_time = self._get_wait_time()
+            if wait_time is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            elif wait_time > 0:
+                # a new change or a flush request restarts the computation
+                if self._wakeup.wait(wait_time):
+                    self._wakeup.clear()
+            else:
+                self.flush()
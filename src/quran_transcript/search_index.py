@@ -0,0 +1,159 @@
+from typing import Iterator, TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+from array import array
+
+if TYPE_CHECKING:
+    from quran_transcript.corpus import QuranCorpus
+
+
+class SearchIndex(object):
+    def __init__(
+        self,
+        corpus: 'QuranCorpus',
+        include_bismillah=False,
+        suffix=" ",
+        **kwargs,
+    ):
+        """
+        The normalized imlaey script of the whole Holy Quran as a single
+        string with sorted offsets tables so a character span is resolved to
+        ayat and words with `bisect` in O(log n)
+
+        Attributes:
+            text (str): the normalized imlaey of all ayat joined without
+                spaces (the same script `search` builds for its window)
+            word_starts (array): the start offset of every word in `text`
+            word_ends (array): the end offset (exclusive) of every word
+            aya_starts (array): the start offset of every aya in `text`
+                (num_ayat + 1 items the last is len(text))
+            aya_word_starts (array): the index of the first word of every
+                aya in `word_starts` (num_ayat + 1 items)
+
+        Args:
+            corpus (QuranCorpus): the corpus to index
+            include_bismillah (bool): prepend bismillah words to the first
+                aya of every sura having bismillah (as `search` does)
+            suffix (str): the separator of the words
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        self.include_bismillah = include_bismillah
+        self.suffix = suffix
+        self.normalize_kwargs = kwargs
+
+        self.word_starts = array('I')
+        self.word_ends = array('I')
+        self.aya_starts = array('I')
+        self.aya_word_starts = array('I')
+        aya_strs = []
+        char_idx = 0
+        normalized_ayat = corpus.get_normalized_imlaey_range(
+            0, corpus.num_ayat, suffix=suffix, **kwargs)
+        for words, aya_str, bismillah_words, bismillah_str in normalized_ayat:
+            self.aya_starts.append(char_idx)
+            self.aya_word_starts.append(len(self.word_starts))
+            if include_bismillah and bismillah_words is not None:
+                words = bismillah_words + words
+                aya_str = bismillah_str + aya_str
+            # the same character count of `_get_words_span`
+            for word in words:
+                self.word_starts.append(char_idx)
+                char_idx += len(word)
+                self.word_ends.append(char_idx)
+            aya_strs.append(aya_str)
+        self.text = ''.join(aya_strs)
+        self.aya_starts.append(len(self.text))
+        self.aya_word_starts.append(len(self.word_starts))
+
+        # `SuffixArray` of `text` (see `enable_suffix_array`)
+        self.suffix_array = None
+
+    @property
+    def num_ayat(self) -> int:
+        return len(self.aya_starts) - 1
+
+    def enable_suffix_array(self):
+        """
+        find occurrences with a suffix array of `text` in O(m log n) instead
+        of scanning `text` (loaded from the cache directory or built once)
+        """
+        if self.suffix_array is None:
+            # the suffix array module uses `search`
+            from quran_transcript.suffix_array import SuffixArray
+            self.suffix_array = SuffixArray.load_or_build(self.text)
+
+    def find(
+        self, normalized_text: str, text_start=0, text_end: int = None,
+    ) -> Iterator[tuple[int, int]]:
+        """
+        yield the (start, end) spans of the non overlapping occurrences of
+        `normalized_text` in `text` (like `re.finditer` of a literal text)
+        Args:
+            text_start (int), text_end (int): search text[text_start: text_end]
+                only (scanned without the suffix array)
+        """
+        if normalized_text == '':
+            return
+        if text_end is None:
+            text_end = len(self.text)
+        if (self.suffix_array is not None
+                and text_start == 0 and text_end == len(self.text)):
+            yield from self.suffix_array.find(normalized_text)
+            return
+        start = self.text.find(normalized_text, text_start, text_end)
+        while start != -1:
+            end = start + len(normalized_text)
+            yield start, end
+            start = self.text.find(normalized_text, end, text_end)
+
+    def find_all(self, normalized_text: str) -> list[int]:
+        """
+        Return the sorted start indices of every (overlapping) occurrence of
+        `normalized_text` in `text`
+        """
+        if normalized_text == '':
+            return []
+        if self.suffix_array is not None:
+            return self.suffix_array.find_all(normalized_text)
+        starts = []
+        start = self.text.find(normalized_text)
+        while start != -1:
+            starts.append(start)
+            start = self.text.find(normalized_text, start + 1)
+        return starts
+
+    def get_aya_idx(self, char_idx: int) -> int:
+        """
+        Return the absolute index of the aya containing `char_idx`
+        """
+        return bisect_right(self.aya_starts, char_idx) - 1
+
+    def get_words_span(
+        self, start: int, end: int
+    ) -> tuple[int, int, int, int] | None:
+        """
+        Resolve the character span [start, end) of `text` on word boundaries
+        (the same as `_get_words_span` of `search`)
+
+        Return:
+            (start_aya, start_word, end_aya, end_word): absolute aya indices
+            and word indices in the aya words (bismillah words included if
+            `include_bismillah`) where end_word is exclusive.
+            None if start is not a word start or end is not a word end
+        """
+        if start >= end:
+            return None
+        start_word = bisect_left(self.word_starts, start)
+        if start_word == len(self.word_starts) or self.word_starts[start_word] != start:
+            return None
+        end_word = bisect_left(self.word_ends, end)
+        if end_word == len(self.word_ends) or self.word_ends[end_word] != end:
+            return None
+
+        start_aya = bisect_right(self.aya_word_starts, start_word) - 1
+        end_aya = bisect_right(self.aya_word_starts, end_word) - 1
+        return (
+            start_aya,
+            start_word - self.aya_word_starts[start_aya],
+            end_aya,
+            end_word - self.aya_word_starts[end_aya] + 1,
+        )
@@ -0,0 +1,226 @@
+import argparse
+from pathlib import Path
+import threading
+import json
+
+from quran_transcript.corpus import (
+    QuranCorpus, DEFAULT_QURAN_PATH, _copy_sura, _refresh_corpus_mtime,
+    _write_atomic)
+
+MANIFEST_NAME = 'manifest.json'
+
+"""
+Sharded corpus layout (a directory):
+    manifest.json: {
+        "suar": [
+            {
+                "index": (int): sura number starting from 1,
+                "name": (str): sura name,
+                "num_ayat": (int): number of ayat in the sura,
+                "file": (str): the sura file name ex: "sura-001.json"
+            }
+        ]
+    }
+    sura-001.json ... sura-114.json: the sura object of the merged quran
+        dict: quran_dict['quran']['sura'][sura_idx]
+"""
+
+
+def _get_sura_file_name(sura_idx: int) -> str:
+    """
+    Args:
+        sura_idx (int): from 0 to 113
+    """
+    return f'sura-{sura_idx + 1:03d}.json'
+
+
+def _write_json_atomic(obj, path: str | Path):
+    _write_atomic(
+        path, json.dumps(obj, ensure_ascii=False, indent=2).encode('utf8'))
+
+
+class ShardedQuranCorpus(QuranCorpus):
+    supports_journal = False
+
+    def __init__(
+        self,
+        quran_path: str | Path,
+        **kwargs,
+    ):
+        """
+        `QuranCorpus` stored as a directory of one json file per sura and a
+        manifest (see `split_quran_script`). A sura file is loaded on the
+        first access of one of its ayat and `save` writes only the suar
+        whose rasm maps changed.
+        """
+        super().__init__(None, quran_path=quran_path, **kwargs)
+        with open(self.quran_path / MANIFEST_NAME, 'r', encoding='utf8') as f:
+            self.manifest = json.load(f)
+        self._lock = threading.Lock()
+        self._suar: list[dict] = [None] * len(self.manifest['suar'])
+        self._dirty_suar: set[int] = set()
+
+    def _get_init_args(self) -> tuple:
+        """
+        pickled as its path (loaded again from the directory: the changed suar not saved yet are not
+        included)
+        """
+        return (self.quran_path,)
+
+    @property
+    def num_suar(self) -> int:
+        return len(self.manifest['suar'])
+
+    @property
+    def quran_dict(self) -> dict:
+        """
+        The full quran dict (loads every sura)
+        """
+        return {'quran': {'sura': [
+            self.get_sura_object(sura_idx) for sura_idx in range(self.num_suar)
+        ]}}
+
+    @quran_dict.setter
+    def quran_dict(self, value):
+        # `QuranCorpus.__init__` sets it to None
+        assert value is None, 'ShardedQuranCorpus loads its suar lazily'
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        sura = self._suar[sura_idx]
+        if sura is None:
+            with self._lock:
+                sura = self._suar[sura_idx]
+                if sura is None:
+                    sura_file = self.manifest['suar'][sura_idx]['file']
+                    with open(self.quran_path / sura_file, 'r', encoding='utf8') as f:
+                        sura = json.load(f)
+                    self._suar[sura_idx] = sura
+        return sura
+
+    def get_sura(self, sura_idx: int) -> list[dict]:
+        return self.get_sura_object(sura_idx)['aya']
+
+    def get_sura_name(self, sura_idx: int) -> str:
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        return self.manifest['suar'][sura_idx]['name']
+
+    def get_num_ayat(self, sura_idx: int) -> int:
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+        return self.manifest['suar'][sura_idx]['num_ayat']
+
+    def get_loaded_suar(self) -> list[int]:
+        """
+        Return the indices (starting from 0) of the loaded suar
+        """
+        return [idx for idx, sura in enumerate(self._suar) if sura is not None]
+
+    def set_aya_maps(
+        self,
+        sura_idx: int,
+        aya_idx: int,
+        rasm_map: list[dict[str, str]],
+        bismillah_map: list[dict[str, str]] = None,
+    ):
+        # marked dirty under `_maps_lock` with the change (see `save`)
+        with self._maps_lock:
+            super().set_aya_maps(
+                sura_idx, aya_idx, rasm_map=rasm_map, bismillah_map=bismillah_map)
+            with self._lock:
+                self._dirty_suar.add(sura_idx)
+
+    def save(self, quran_path: str | Path = None):
+        """
+        write the changed suar files only. If `quran_path` is given the
+        whole corpus is exported to it (".json" file)
+        """
+        if quran_path is not None and Path(quran_path) != self.quran_path:
+            QuranCorpus(self.quran_dict).save(quran_path)
+            return
+
+        # serialized outside the lock so `set_aya_maps` waits for the copy only
+        with self._maps_lock:
+            with self._lock:
+                dirty_suar = sorted(self._dirty_suar)
+                self._dirty_suar = set()
+            suar = [_copy_sura(self._suar[sura_idx]) for sura_idx in dirty_suar]
+        for idx, (sura_idx, sura) in enumerate(zip(dirty_suar, suar)):
+            try:
+                _write_json_atomic(
+                    sura, self.quran_path / self.manifest['suar'][sura_idx]['file'])
+            except Exception:
+                # keeping the suar not written dirty to retry on the next save
+                with self._lock:
+                    self._dirty_suar.update(dirty_suar[idx:])
+                raise
+        _refresh_corpus_mtime(self)
+
+
+def split_quran_script(
+    corpus: QuranCorpus,
+    out_dir: str | Path,
+):
+    """
+    split the corpus into a directory of one file per sura and a manifest
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'suar': []}
+    for sura_idx in range(corpus.num_suar):
+        sura = corpus.get_sura_object(sura_idx)
+        file_name = _get_sura_file_name(sura_idx)
+        _write_json_atomic(sura, out_dir / file_name)
+        manifest['suar'].append({
+            'index': sura_idx + 1,
+            'name': corpus.get_sura_name(sura_idx),
+            'num_ayat': corpus.get_num_ayat(sura_idx),
+            'file': file_name,
+        })
+    _write_json_atomic(manifest, out_dir / MANIFEST_NAME)
+
+
+def join_quran_script(
+    in_dir: str | Path,
+    out_path: str | Path,
+):
+    """
+    join a directory of `split_quran_script` into a single ".json" script
+    """
+    ShardedQuranCorpus(in_dir).save(out_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        'Split the merged Quran script into a file per sura or join it back')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    split_parser = subparsers.add_parser(
+        'split', help='split a ".json" script into a directory')
+    split_parser.add_argument(
+        '--quran-file',
+        type=Path,
+        default=DEFAULT_QURAN_PATH,
+        help='The path to the merged Quran script "file.json"')
+    split_parser.add_argument(
+        '--output-dir',
+        type=Path,
+        help='The path to the output directory')
+
+    join_parser = subparsers.add_parser(
+        'join', help='join a directory into a ".json" script')
+    join_parser.add_argument(
+        '--input-dir',
+        type=Path,
+        help='The path to the directory of the split script')
+    join_parser.add_argument(
+        '--output-file',
+        type=Path,
+        help='The path to the output file "file.json"')
+
+    args = parser.parse_args()
+    match args.command:
+        case 'split':
+            split_quran_script(
+                QuranCorpus.from_file(args.quran_file), args.output_dir)
+        case 'join':
+            join_quran_script(args.input_dir, args.output_file)
@@ -0,0 +1,349 @@
+import argparse
+from pathlib import Path
+import threading
+import sqlite3
+import json
+
+from quran_transcript.corpus import (
+    QuranCorpus, DEFAULT_QURAN_PATH, _refresh_corpus_mtime)
+from quran_transcript.utils import (
+    Aya, SearchItem, search, normalize_aya, _get_istiaatha_str, _strip_istiaatha)
+from quran_transcript import alphabet as alpha
+
+SQLITE_SUFFIXES = ['.sqlite', '.db']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suar (
+    sura_idx INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    num_ayat INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ayat (
+    absolute_idx INTEGER PRIMARY KEY,
+    sura_idx INTEGER NOT NULL,
+    aya_idx INTEGER NOT NULL,
+    uthmani TEXT NOT NULL,
+    imlaey TEXT NOT NULL,
+    bismillah_uthmani TEXT,
+    bismillah_imlaey TEXT,
+    rasm_map TEXT,
+    bismillah_map TEXT,
+    UNIQUE (sura_idx, aya_idx)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS ayat_fts USING fts5(
+    norm_imlaey, tokenize='trigram'
+);
+"""
+
+
+def fts_normalize(text: str) -> str:
+    """
+    The normalization of the FTS index: the coarsest of every
+    `normalize_aya` profile, so for every normalization flags:
+    normalize_aya(query) in normalize_aya(aya) =>
+    fts_normalize(query) in fts_normalize(aya)
+    """
+    norm_text = normalize_aya(
+        text,
+        remove_spaces=True,
+        ignore_hamazat=True,
+        ignore_alef_maksoora=True,
+        ignore_taa_marboota=True,
+        remove_small_alef=True,
+        remove_tashkeel=True,
+    )
+    # `normalize_taat` maps taa marboota to taa mabsoota
+    return norm_text.replace(alpha.imlaey.taa_mabsoota, alpha.imlaey.haa)
+
+
+class SqliteQuranCorpus(QuranCorpus):
+    supports_journal = False
+
+    def __init__(
+        self,
+        quran_path: str | Path,
+        **kwargs,
+    ):
+        """
+        `QuranCorpus` stored in a sqlite3 database created by
+        `migrate_to_sqlite`. Setting rasm maps updates a single aya row
+        transactionally (no need to save the whole corpus).
+        """
+        super().__init__(None, quran_path=quran_path, **kwargs)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(quran_path), check_same_thread=False)
+        self._sura_names = []
+        self._num_ayat = []
+        self._sura_starts = [0]
+        for name, num_ayat in self._conn.execute(
+            'SELECT name, num_ayat FROM suar ORDER BY sura_idx'
+        ):
+            self._sura_names.append(name)
+            self._num_ayat.append(num_ayat)
+            self._sura_starts.append(self._sura_starts[-1] + num_ayat)
+
+    def _get_init_args(self) -> tuple:
+        """
+        pickled as its path (connected again to the database)
+        """
+        return (self.quran_path,)
+
+    @property
+    def num_suar(self) -> int:
+        return len(self._num_ayat)
+
+    @property
+    def quran_dict(self) -> dict:
+        """
+        The full quran dict (built on every call, avoid on hot paths)
+        """
+        return {'quran': {'sura': [
+            self.get_sura_object(sura_idx) for sura_idx in range(self.num_suar)
+        ]}}
+
+    @quran_dict.setter
+    def quran_dict(self, value):
+        # `QuranCorpus.__init__` sets it to None
+        assert value is None, 'The Quran of SqliteQuranCorpus is in the database'
+
+    def _check_sura(self, sura_idx: int):
+        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
+
+    def _row_to_aya(self, row: tuple) -> dict:
+        (aya_idx, uthmani, imlaey, bismillah_uthmani, bismillah_imlaey,
+         rasm_map, bismillah_map) = row
+        aya = {
+            '@index': str(aya_idx + 1),
+            self.uthmani_key: uthmani,
+            self.imlaey_key: imlaey,
+        }
+        if bismillah_uthmani is not None:
+            aya[self.bismillah_uthmani_key] = bismillah_uthmani
+        if bismillah_imlaey is not None:
+            aya[self.bismillah_imlaey_key] = bismillah_imlaey
+        if rasm_map is not None:
+            aya[self.map_key] = json.loads(rasm_map)
+        if bismillah_map is not None:
+            aya[self.bismillah_map_key] = json.loads(bismillah_map)
+        return aya
+
+    _AYA_COLUMNS = (
+        'aya_idx, uthmani, imlaey, bismillah_uthmani, bismillah_imlaey,'
+        + ' rasm_map, bismillah_map')
+
+    def get_sura(self, sura_idx: int) -> list[dict]:
+        self._check_sura(sura_idx)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {self._AYA_COLUMNS} FROM ayat'
+                + ' WHERE sura_idx = ? ORDER BY aya_idx', (sura_idx,)
+            ).fetchall()
+        return [self._row_to_aya(row) for row in rows]
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        return {
+            '@index': str(sura_idx + 1),
+            self.sura_name_key: self.get_sura_name(sura_idx),
+            'aya': self.get_sura(sura_idx),
+        }
+
+    def get_sura_name(self, sura_idx: int) -> str:
+        self._check_sura(sura_idx)
+        return self._sura_names[sura_idx]
+
+    def get_num_ayat(self, sura_idx: int) -> int:
+        self._check_sura(sura_idx)
+        return self._num_ayat[sura_idx]
+
+    def get_aya(self, sura_idx: int, aya_idx: int) -> dict:
+        absolute_idx = self.get_absolute_idx(sura_idx, aya_idx)
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT {self._AYA_COLUMNS} FROM ayat WHERE absolute_idx = ?',
+                (absolute_idx,),
+            ).fetchone()
+        return self._row_to_aya(row)
+
+    def set_aya_maps(
+        self,
+        sura_idx: int,
+        aya_idx: int,
+        rasm_map: list[dict[str, str]],
+        bismillah_map: list[dict[str, str]] = None,
+    ):
+        absolute_idx = self.get_absolute_idx(sura_idx, aya_idx)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE ayat SET rasm_map = ? WHERE absolute_idx = ?',
+                (json.dumps(rasm_map, ensure_ascii=False), absolute_idx),
+            )
+            if bismillah_map is not None:
+                self._conn.execute(
+                    'UPDATE ayat SET bismillah_map = ? WHERE absolute_idx = ?',
+                    (json.dumps(bismillah_map, ensure_ascii=False), absolute_idx),
+                )
+        self.invalidate_aya(sura_idx, aya_idx)
+        # the commit changes the database mtime (kept as the shared corpus)
+        _refresh_corpus_mtime(self)
+
+    def save(self, quran_path: str | Path = None):
+        """
+        Every `set_aya_maps` is already committed. If `quran_path` is given
+        the corpus is exported to it (".json" file)
+        """
+        if quran_path is not None:
+            QuranCorpus(self.quran_dict).save(quran_path)
+
+    def fts_shortlist(self, text: str) -> list[tuple[int, int]]:
+        """
+        Return (sura_idx, aya_idx) starting from 0 of the ayat that may contain
+        `text` (bismillah included) using the FTS5 index. The shortlist is a
+        superset of the ayat matching `text` within a single aya for every
+        `normalize_aya` flags
+        """
+        norm_text = fts_normalize(text)
+        if norm_text == '':
+            return []
+        with self._lock:
+            if len(norm_text) >= 3:
+                # trigram tokenizer supports substring phrase queries
+                rows = self._conn.execute(
+                    'SELECT rowid FROM ayat_fts WHERE ayat_fts MATCH ?'
+                    + ' ORDER BY rowid',
+                    ('"' + norm_text.replace('"', '""') + '"',),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    'SELECT rowid FROM ayat_fts WHERE instr(norm_imlaey, ?) > 0'
+                    + ' ORDER BY rowid',
+                    (norm_text,),
+                ).fetchall()
+
+        return [self.get_sura_aya_idx(absolute_idx) for absolute_idx, in rows]
+
+
+def search_fts(
+    text: str,
+    corpus: SqliteQuranCorpus,
+    suffix=" ",
+    **kwargs,
+) -> list[SearchItem]:
+    """searches the whole Holy Quran for `text` within a single aya
+
+    The FTS5 index shortlists the candidate ayat then the exact `search`
+    runs on every candidate aya only.
+    NOTE: matches spanning multiple ayat are not found (use `search`)
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        corpus (SqliteQuranCorpus): the corpus to search in
+        the rest of **kwargs are from normalize_aya function
+    """
+    # removing istiaatha from the shortlist query as `search` does (the
+    # FTS normalization of a normalized text is the FTS normalization of
+    # the text)
+    normalized_text, has_istiaatha = _strip_istiaatha(
+        normalize_aya(text, remove_spaces=True, **kwargs),
+        _get_istiaatha_str(suffix, kwargs),
+    )
+    if has_istiaatha and normalized_text == '':
+        return search(
+            text, start_aya=Aya(1, 1, corpus=corpus), window=0,
+            suffix=suffix, **kwargs)
+    norm_text = fts_normalize(normalized_text)
+
+    found = []
+    for sura_idx, aya_idx in corpus.fts_shortlist(norm_text):
+        found += search(
+            text,
+            start_aya=Aya(sura_idx + 1, aya_idx + 1, corpus=corpus),
+            window=0,
+            suffix=suffix,
+            **kwargs,
+        )
+    return found
+
+
+def migrate_to_sqlite(
+    corpus: QuranCorpus,
+    db_path: str | Path,
+):
+    """
+    Write the `corpus` into a new sqlite3 database at `db_path`
+    """
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.executescript(SCHEMA)
+        absolute_idx = 0
+        for sura_idx in range(corpus.num_suar):
+            num_ayat = corpus.get_num_ayat(sura_idx)
+            conn.execute(
+                'INSERT INTO suar VALUES (?, ?, ?)',
+                (sura_idx, corpus.get_sura_name(sura_idx), num_ayat),
+            )
+            for aya_idx in range(num_ayat):
+                aya = corpus.get_aya(sura_idx, aya_idx)
+                maps = [aya.get(corpus.map_key), aya.get(corpus.bismillah_map_key)]
+                maps = [None if m is None else json.dumps(m, ensure_ascii=False)
+                        for m in maps]
+                conn.execute(
+                    'INSERT INTO ayat VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        absolute_idx,
+                        sura_idx,
+                        aya_idx,
+                        aya[corpus.uthmani_key],
+                        aya[corpus.imlaey_key],
+                        aya.get(corpus.bismillah_uthmani_key),
+                        aya.get(corpus.bismillah_imlaey_key),
+                        *maps,
+                    ),
+                )
+                imlaey = aya[corpus.imlaey_key]
+                if corpus.bismillah_imlaey_key in aya:
+                    imlaey = aya[corpus.bismillah_imlaey_key] + imlaey
+                conn.execute(
+                    'INSERT INTO ayat_fts (rowid, norm_imlaey) VALUES (?, ?)',
+                    (absolute_idx, fts_normalize(imlaey)),
+                )
+                absolute_idx += 1
+    conn.close()
+
+
+def load_quran_script(quran_path: str | Path) -> QuranCorpus:
+    """
+    load the merged quran script either ".json" or ".xml" file
+    """
+    if Path(quran_path).suffix == '.xml':
+        import xmltodict
+        with open(quran_path, 'r', encoding='utf8') as f:
+            quran_dict = xmltodict.parse(f.read())
+        return QuranCorpus(quran_dict, quran_path=quran_path)
+    return QuranCorpus.from_file(quran_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        'Migrate the merged Quran script into a sqlite3 database')
+    parser.add_argument(
+        '--quran-file',
+        type=Path,
+        default=DEFAULT_QURAN_PATH,
+        help='The path to the merged Quran script either ".json" or ".xml"')
+    parser.add_argument(
+        '--output-file',
+        type=Path,
+        help=f'The path to the output database {SQLITE_SUFFIXES}')
+    args = parser.parse_args()
+
+    assert args.output_file.suffix in SQLITE_SUFFIXES, (
+        f'Output file extention has to be in {SQLITE_SUFFIXES}'
+        + f' your input: {args.output_file.suffix}')
+    assert not args.output_file.exists(), (
+        f'Output file already exists: {args.output_file}')
+
+    migrate_to_sqlite(
+        load_quran_script(args.quran_file),
+        db_path=args.output_file,
+    )
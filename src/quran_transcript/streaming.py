@@ -0,0 +1,167 @@
+from quran_transcript import alphabet as alpha
+from quran_transcript.corpus import QuranCorpus, get_corpus
+from quran_transcript.word_index import WordIndex, normalize_words
+from quran_transcript.utils import (
+    SearchItem, PartOfUthmaniWord, _get_index_search_item)
+
+
+class StreamingSearcher(object):
+    def __init__(
+        self,
+        corpus: QuranCorpus = None,
+        suffix=" ",
+        **kwargs,
+    ):
+        """
+        Incremental word aligned search of a growing transcript (ex: live
+        recitation): the words are fed as they come with `feed` and the
+        live candidates (runs of consecutive Quran words matching every word
+        fed so far) are extended by the new words only, so every update
+        costs O(new words x live candidates) instead of searching the whole
+        transcript again. Candidates cross ayat and suras boundaries
+        (with and without bismillah as `search_words`).
+
+        Istiaatha is removed if it is the first words fed.
+
+        Attributes:
+            words (list[str]): the normalized words fed so far (istiaatha
+                excluded)
+            has_istiaatha (bool): True if the transcript starts with istiaatha
+            candidates (list[tuple[int, int, bool]]): the live runs
+                (first position, last position, plain) in the word sequence of
+                `word_index` where plain is True for runs skipping bismillah
+
+        Args:
+            corpus (QuranCorpus): the corpus to search in (default: the corpus
+                of the default Quran script)
+            suffix (str): the separator of the words
+            the rest of **kwargs are from normalize_aya function
+        """
+        if corpus is None:
+            corpus = get_corpus()
+        self.corpus = corpus
+        self.suffix = suffix
+        self.normalize_kwargs = kwargs
+        self.word_index: WordIndex = corpus.get_word_index(suffix=suffix, **kwargs)
+        self._istiaatha_words = normalize_words(
+            alpha.istiaatha.imlaey, suffix=suffix, **kwargs)
+        self.reset()
+
+    def reset(self):
+        """
+        start a new transcript
+        """
+        self.words: list[str] = []
+        self.has_istiaatha = False
+        self.candidates: list[tuple[int, int, bool]] = []
+        # number of the istiaatha words fed so far (None if not istiaatha)
+        self._istiaatha_len = 0
+
+    @property
+    def num_candidates(self) -> int:
+        return len(self.candidates)
+
+    def feed(self, text: str | list[str]) -> int:
+        """
+        Extend the transcript with the words of `text` (imlaey script)
+
+        Return:
+            the number of live candidates
+        """
+        if isinstance(text, str):
+            text = [text]
+        for script in text:
+            for word in normalize_words(
+                    script, suffix=self.suffix, **self.normalize_kwargs):
+                self._feed_word(word)
+        return len(self.candidates)
+
+    def _feed_word(self, word: str):
+        # the first words may be istiaatha: the candidates are kept as usual
+        # (istiaatha words may be Quran words) until the istiaatha is complete
+        if self._istiaatha_len is not None:
+            if (self._istiaatha_len < len(self._istiaatha_words)
+                    and self._istiaatha_words[self._istiaatha_len] == word):
+                self._istiaatha_len += 1
+                if self._istiaatha_len == len(self._istiaatha_words):
+                    self.words = []
+                    self.candidates = []
+                    self.has_istiaatha = True
+                    self._istiaatha_len = None
+                    return
+            else:
+                self._istiaatha_len = None
+
+        index = self.word_index
+        word_id = index.vocab.get_id(word)
+        self.words.append(word)
+        if word_id is None:
+            self.candidates = []
+        elif len(self.words) == 1:
+            self.candidates = []
+            for pos in index.postings[word_id]:
+                if not index.is_bismillah[pos]:
+                    self.candidates.append((pos, pos, True))
+                self.candidates.append((pos, pos, False))
+        else:
+            candidates = []
+            for first, last, plain in self.candidates:
+                pos = index._next(last, plain=plain)
+                if pos is not None and index.word_ids[pos] == word_id:
+                    candidates.append((first, pos, plain))
+            self.candidates = candidates
+
+    def get_results(self, max_results: int = None) -> list[SearchItem]:
+        """
+        Return the current matches of the transcript as `SearchItem`s sorted by
+        position (matches including bismillah only if there are no matches
+        without it as `search`)
+
+        NOTE: candidates ending inside an uthmani word (ex: "يا" of "يا ابن
+        أم") are not returned until the rest of the uthmani word is fed
+
+        Args:
+            max_results (int): the maximum number of results (default: all)
+        """
+        if not self.words:
+            if self.has_istiaatha:
+                return [SearchItem(
+                    start_aya=None,
+                    num_ayat=None,
+                    imlaey_word_span=None,
+                    has_bismillah=None,
+                    has_istiaatha=True,
+                    uthmani_script=alpha.istiaatha.uthmani,
+                )]
+            return []
+
+        plain_runs = [
+            (first, last) for first, last, plain in self.candidates if plain]
+        plain = plain_runs != []
+        if plain:
+            runs, index = plain_runs, self.word_index.plain_index
+        else:
+            runs = [(first, last) for first, last, _ in self.candidates]
+            index = self.word_index.full_index
+
+        found = []
+        prev_end = 0
+        for first, last in sorted(runs):
+            if max_results is not None and len(found) == max_results:
+                break
+            start, end = self.word_index.get_char_span(first, last, plain=plain)
+            if found and start < prev_end:
+                continue
+            try:
+                item = _get_index_search_item(
+                    index, start, end, self.has_istiaatha, self.corpus)
+            except PartOfUthmaniWord:
+                continue
+            if item is None:
+                continue
+            if self.has_istiaatha:
+                item.uthmani_script = (
+                    alpha.istiaatha.uthmani + self.suffix + item.uthmani_script)
+            found.append(item)
+            prev_end = end
+        return found
@@ -0,0 +1,255 @@
+from pathlib import Path
+from array import array
+import hashlib
+import struct
+import sys
+
+from quran_transcript.corpus import (
+    QuranCorpus, get_corpus, get_cache_dir, _write_atomic)
+from quran_transcript.utils import Aya, SearchItem, search
+
+MAGIC = b'QTSUFA01'
+
+"""
+Suffix array file layout (little endian) in the cache directory named
+"{sha256 of the text}.suffix-array":
+    MAGIC (8 bytes)
+    length of the text n (uint32)
+    suffix array (uint32[n])
+    lcp array (uint32[n])
+"""
+
+
+def build_suffix_array(text: str, first_length=32) -> array:
+    """
+    Return the start indices of the suffixes of `text` in sorted order
+    using prefix doubling: suffixes are first sorted by their first
+    `first_length` characters then by their first 2 * length characters
+    using the ranks of the first `length` characters until every suffix has
+    a unique rank. O(n log^2 n)
+    """
+    n = len(text)
+    if n == 0:
+        return array('I')
+
+    def _rank(keys) -> int:
+        # ranks starting from 1 (0 is kept for "after the end")
+        current = 1
+        rank[suffixes[0]] = current
+        for prev_idx, idx in zip(suffixes, suffixes[1:]):
+            if keys[idx] != keys[prev_idx]:
+                current += 1
+            rank[idx] = current
+        return current
+
+    keys = [text[idx: idx + first_length] for idx in range(n)]
+    suffixes = sorted(range(n), key=keys.__getitem__)
+    rank = [0] * n
+    num_ranks = _rank(keys)
+    length = first_length
+    while num_ranks < n:
+        # (rank of the first half, rank of the second half) as a single int
+        keys = [
+            rank[idx] * (n + 1) + (rank[idx + length] if idx + length < n else 0)
+            for idx in range(n)
+        ]
+        suffixes.sort(key=keys.__getitem__)
+        rank = [0] * n
+        num_ranks = _rank(keys)
+        length *= 2
+    return array('I', suffixes)
+
+
+def build_lcp_array(text: str, suffix_array: array) -> array:
+    """
+    Return lcp[i]: the length of the longest common prefix of the suffixes
+    suffix_array[i - 1] and suffix_array[i] (lcp[0] = 0) using Kasai's
+    algorithm O(n)
+    """
+    n = len(text)
+    rank = [0] * n
+    for pos, idx in enumerate(suffix_array):
+        rank[idx] = pos
+    lcp = array('I', bytes(4 * n))
+    common = 0
+    for idx in range(n):
+        pos = rank[idx]
+        if pos == 0:
+            common = 0
+            continue
+        prev_idx = suffix_array[pos - 1]
+        while (idx + common < n and prev_idx + common < n
+               and text[idx + common] == text[prev_idx + common]):
+            common += 1
+        lcp[pos] = common
+        if common > 0:
+            common -= 1
+    return lcp
+
+
+def _to_little_endian(arr: array) -> bytes:
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_little_endian(data: bytes) -> array:
+    arr = array('I', data)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+class SuffixArray(object):
+    def __init__(self, text: str, suffix_array: array, lcp: array):
+        """
+        Substring lookup of `text` in O(m log n) for a query of length m
+        (see `build` and `find_all`)
+        """
+        assert len(suffix_array) == len(text) == len(lcp)
+        self.text = text
+        self.suffix_array = suffix_array
+        self.lcp = lcp
+
+    @classmethod
+    def build(cls, text: str):
+        suffix_array = build_suffix_array(text)
+        return cls(text, suffix_array, build_lcp_array(text, suffix_array))
+
+    @staticmethod
+    def get_cache_path(text: str) -> Path:
+        text_hash = hashlib.sha256(text.encode('utf8')).hexdigest()
+        return get_cache_dir() / f'{text_hash}.suffix-array'
+
+    @classmethod
+    def load_or_build(cls, text: str):
+        """
+        load the suffix array of `text` from the cache directory or build
+        and save it (failures of saving are ignored). A truncated or
+        invalid cache file is built and saved again
+        """
+        cache_path = cls.get_cache_path(text)
+        if cache_path.exists():
+            try:
+                return cls.load(text, cache_path)
+            except (AssertionError, struct.error, OSError):
+                pass
+        suffix_array = cls.build(text)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            suffix_array.save(cache_path)
+        except OSError:
+            pass
+        return suffix_array
+
+    def save(self, path: str | Path):
+        data = (
+            MAGIC
+            + struct.pack('<I', len(self.text))
+            + _to_little_endian(self.suffix_array)
+            + _to_little_endian(self.lcp)
+        )
+        _write_atomic(path, data)
+
+    @classmethod
+    def load(cls, text: str, path: str | Path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        assert data[:len(MAGIC)] == MAGIC, f'Not a suffix array file: {path}'
+        n, = struct.unpack_from('<I', data, len(MAGIC))
+        assert n == len(text), f'The suffix array is of another text: {path}'
+        start = len(MAGIC) + 4
+        assert len(data) == start + 8 * n, f'Truncated suffix array file: {path}'
+        return cls(
+            text,
+            _from_little_endian(data[start: start + 4 * n]),
+            _from_little_endian(data[start + 4 * n: start + 8 * n]),
+        )
+
+    def _lower_bound(self, query: str) -> int:
+        """
+        the first position in the suffix array whose suffix >= query
+        (comparing the first len(query) characters only)
+        """
+        text = self.text
+        suffix_array = self.suffix_array
+        m = len(query)
+        low, high = 0, len(suffix_array)
+        while low < high:
+            mid = (low + high) // 2
+            idx = suffix_array[mid]
+            if text[idx: idx + m] < query:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def find_all(self, query: str) -> list[int]:
+        """
+        Return the sorted start indices of every (overlapping) occurrence
+        of `query` in `text`: binary search of the first suffix starting
+        with `query` then the lcp array gives the following ones
+        """
+        m = len(query)
+        if m == 0:
+            return []
+        pos = self._lower_bound(query)
+        if pos == len(self.suffix_array):
+            return []
+        idx = self.suffix_array[pos]
+        if self.text[idx: idx + m] != query:
+            return []
+        starts = [idx]
+        pos += 1
+        while pos < len(self.suffix_array) and self.lcp[pos] >= m:
+            starts.append(self.suffix_array[pos])
+            pos += 1
+        starts.sort()
+        return starts
+
+    def find(self, query: str) -> list[tuple[int, int]]:
+        """
+        Return the (start, end) spans of the non overlapping occurrences of
+        `query` (the same as `SearchIndex.find`)
+        """
+        spans = []
+        end = 0
+        for start in self.find_all(query):
+            if start >= end:
+                end = start + len(query)
+                spans.append((start, end))
+        return spans
+
+
+def search_suffix_array(
+    text: str,
+    corpus: QuranCorpus = None,
+    suffix=" ",
+    **kwargs,
+) -> list[SearchItem]:
+    """searches the whole Holy Quran for `text` using suffix arrays
+
+    The same as `search(text, scope="quran")` but the occurrences are found
+    in O(m log n) by the suffix arrays of the `SearchIndex` of the corpus
+    (built once per normalization profile and saved in the cache directory)
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        corpus (QuranCorpus): the corpus to search in (default: the corpus
+            of the default Quran script)
+        the rest of **kwargs are from normalize_aya function
+    """
+    if corpus is None:
+        corpus = get_corpus()
+    for include_bismillah in [False, True]:
+        corpus.get_search_index(
+            include_bismillah=include_bismillah, suffix=suffix, **kwargs,
+        ).enable_suffix_array()
+    return search(
+        text,
+        start_aya=Aya(1, 1, corpus=corpus),
+        suffix=suffix,
+        scope="quran",
+        **kwargs,
+    )
@@ -1,9 +1,15 @@
+from typing import Iterable, Iterator
 from pathlib import Path
-import json
-import xmltodict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from array import array
+import heapq
 import re
+import os
 from quran_transcript import alphabet as alpha
+from quran_transcript.corpus import (
+    QuranCorpus, get_corpus, DEFAULT_QURAN_PATH)
+from quran_transcript.normalize import normalize_aya, normalize_many
 
 BASE_PATH = Path(__file__).parent
 
@@ -31,6 +37,15 @@ class WordSpan:
 
 
 @dataclass
+class CharSpan:
+    start: int
+    end: int
+    """
+    A span of characters [start, end) in `AyaFormat.imlaey`
+    """
+
+
+@dataclass(frozen=True, slots=True)
 class AyaFormat:
     sura_idx: int
     aya_idx: int
@@ -45,6 +60,9 @@ class AyaFormat:
     bismillah_imlaey: str = None
     bismillah_map: dict[str, list[str]] = None
     """
+    An immutable record of an aya (cached by the corpus of the aya and
+    rebuilt only if the rasm map of the aya changes)
+
     Attributes:
         sura_idx (int): the absoulte index of the sura starting form 1
         aya_idx (int): the absoulte index of the aya starting from 1
@@ -115,11 +133,13 @@ class AyaFormat:
 
 # TODO: Add quran_dict as default
 class Aya(object):
+    __slots__ = ("corpus", "sura_idx", "aya_idx")
+
     def __init__(
         self,
         sura_idx=1,
         aya_idx=1,
-        quran_path: str | Path = BASE_PATH / 'quran-script/quran-uthmani-imlaey.json',
+        quran_path: str | Path = DEFAULT_QURAN_PATH,
         quran_dict: dict = None,
         prefix="@",
         map_key="rasm_map",
@@ -129,51 +149,136 @@ class Aya(object):
         imlaey_key="imlaey",
         sura_name_key="name",
         join_prefix=" ",
+        corpus: QuranCorpus = None,
     ):
         """
         quran_path (str | Path) path to the quran json script with
             emlaey uthmani scripts
         sura_idx: the index of the Sura in the Quran starting with 1 to 114
         aya_idx: the index of the aya starting form 1
+        corpus (QuranCorpus): the corpus to use. If None: the process wide
+            shared corpus of `quran_path` is used (loaded once) or a
+            new corpus of `quran_dict` if given
         """
-        self.quran_path = Path(quran_path)
-        if quran_dict is None:
-            with open(self.quran_path, "r", encoding="utf8") as f:
-                self.quran_dict = json.load(f)
-        else:
-            self.quran_dict = quran_dict
-
-        # Loading Istiaath
-        self.istiaatha_imlaey = alpha.istiaatha.imlaey
-        self.istiaatha_uthmani = alpha.istiaatha.uthmani
+        if corpus is None:
+            keys = dict(
+                prefix=prefix,
+                map_key=map_key,
+                bismillah_map_key=bismillah_map_key,
+                bismillah_key=bismillah_key,
+                uthmani_key=uthmani_key,
+                imlaey_key=imlaey_key,
+                sura_name_key=sura_name_key,
+                join_prefix=join_prefix,
+            )
+            if quran_dict is None:
+                corpus = get_corpus(quran_path, **keys)
+            else:
+                corpus = QuranCorpus(quran_dict, quran_path=quran_path, **keys)
+        self.corpus = corpus
 
         self._check_indices(sura_idx - 1, aya_idx - 1)
         self.sura_idx = sura_idx - 1
         self.aya_idx = aya_idx - 1
 
-        self.map_key = map_key
-        self.bismillah_map_key = bismillah_map_key
-        self.uthmani_key = prefix + uthmani_key
-        self.imlaey_key = prefix + imlaey_key
-        self.sura_name_key = prefix + sura_name_key
-        self.bismillah_uthmani_key = f"{prefix}{bismillah_key}_{uthmani_key}"
-        self.bismillah_imlaey_key = f"{prefix}{bismillah_key}_{imlaey_key}"
-        self.join_prefix = join_prefix
+    @property
+    def quran_path(self) -> Path:
+        return self.corpus.quran_path
+
+    @property
+    def quran_dict(self) -> dict:
+        return self.corpus.quran_dict
+
+    @property
+    def istiaatha_imlaey(self) -> str:
+        return alpha.istiaatha.imlaey
+
+    @property
+    def istiaatha_uthmani(self) -> str:
+        return alpha.istiaatha.uthmani
+
+    @property
+    def uthmani_words(self) -> tuple[str, ...]:
+        """
+        The words of the uthmani script of the aya
+        """
+        return self.corpus.get_words('uthmani', self.absolute_idx)
+
+    @property
+    def imlaey_words(self) -> tuple[str, ...]:
+        """
+        The words of the imlaey script of the aya
+        """
+        return self.corpus.get_words('imlaey', self.absolute_idx)
+
+    @property
+    def uthmani_word_ids(self) -> array:
+        """
+        The word ids of the uthmani script (see `QuranCorpus.get_vocab`)
+        """
+        return self.corpus.get_word_ids('uthmani', self.absolute_idx)
+
+    @property
+    def imlaey_word_ids(self) -> array:
+        """
+        The word ids of the imlaey script (see `QuranCorpus.get_vocab`)
+        """
+        return self.corpus.get_word_ids('imlaey', self.absolute_idx)
+
+    @property
+    def bismillah_words(self) -> tuple[tuple[str, ...], tuple[str, ...]] | None:
+        """
+        (uthmani words, imlaey words) of the bismillah of the aya or None
+        if the aya has no bismillah (see `AyaFormat.bismillah_uthmani`)
+        """
+        uthmani_words = self.corpus.get_words('bismillah_uthmani', self.absolute_idx)
+        if uthmani_words is None:
+            return None
+        return (
+            uthmani_words,
+            self.corpus.get_words('bismillah_imlaey', self.absolute_idx),
+        )
+
+    @property
+    def map_key(self) -> str:
+        return self.corpus.map_key
+
+    @property
+    def bismillah_map_key(self) -> str:
+        return self.corpus.bismillah_map_key
+
+    @property
+    def uthmani_key(self) -> str:
+        return self.corpus.uthmani_key
+
+    @property
+    def imlaey_key(self) -> str:
+        return self.corpus.imlaey_key
+
+    @property
+    def sura_name_key(self) -> str:
+        return self.corpus.sura_name_key
+
+    @property
+    def bismillah_uthmani_key(self) -> str:
+        return self.corpus.bismillah_uthmani_key
+
+    @property
+    def bismillah_imlaey_key(self) -> str:
+        return self.corpus.bismillah_imlaey_key
+
+    @property
+    def join_prefix(self) -> str:
+        return self.corpus.join_prefix
 
     def _get_sura(self, sura_idx):
-        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
-        return self.quran_dict["quran"]["sura"][sura_idx]["aya"]
+        return self.corpus.get_sura(sura_idx)
 
     def _get_sura_object(self, sura_idx):
-        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
-        return self.quran_dict["quran"]["sura"][sura_idx]
+        return self.corpus.get_sura_object(sura_idx)
 
     def _get_aya(self, sura_idx, aya_idx):
-        assert aya_idx >= 0 and aya_idx < len(self._get_sura(sura_idx)), (
-            f"Sura index out of range sura_index={sura_idx + 1} "
-            + f"and len of sura={len(self._get_sura(sura_idx))}"
-        )
-        return self._get_sura(sura_idx)[aya_idx]
+        return self.corpus.get_aya(sura_idx, aya_idx)
 
     def _get(self, sura_idx, aya_idx) -> AyaFormat:
         """
@@ -223,35 +328,28 @@ class Aya(object):
                     if None: the aya is not the first aya of the sura
                     (Note: bismillah maping is set automaticllay no by the user)
         """
-        bismillah = {self.bismillah_uthmani_key: None,
-                     self.bismillah_imlaey_key: None}
-        for key in bismillah.keys():
-            if key in self._get_aya(sura_idx, aya_idx).keys():
-                bismillah[key] = self._get_aya(sura_idx, aya_idx)[key]
+        absolute_idx = self.corpus.get_absolute_idx(sura_idx, aya_idx)
+        aya_format = self.corpus.aya_formats.get(absolute_idx)
+        if aya_format is not None:
+            return aya_format
 
-        bismillah_map = None
-        if self.bismillah_map_key in self._get_aya(sura_idx, aya_idx).keys():
-            bismillah_map = self._get_aya(sura_idx, aya_idx)[
-                self.bismillah_map_key]
-
-        rasm_map = None
-        if self.map_key in self._get_aya(sura_idx, aya_idx).keys():
-            rasm_map = self._get_aya(sura_idx, aya_idx)[self.map_key]
-
-        return AyaFormat(
+        aya = self._get_aya(sura_idx, aya_idx)
+        aya_format = AyaFormat(
             sura_idx=sura_idx + 1,
             aya_idx=aya_idx + 1,
-            sura_name=self._get_sura_object(sura_idx)[self.sura_name_key],
-            num_ayat_in_sura=len(self._get_sura(sura_idx)),
-            uthmani=self._get_aya(sura_idx, aya_idx)[self.uthmani_key],
-            imlaey=self._get_aya(sura_idx, aya_idx)[self.imlaey_key],
-            rasm_map=rasm_map,
-            bismillah_uthmani=bismillah[self.bismillah_uthmani_key],
-            bismillah_imlaey=bismillah[self.bismillah_imlaey_key],
-            bismillah_map=bismillah_map,
+            sura_name=self.corpus.get_sura_name(sura_idx),
+            num_ayat_in_sura=self.corpus.get_num_ayat(sura_idx),
+            uthmani=aya[self.uthmani_key],
+            imlaey=aya[self.imlaey_key],
+            rasm_map=aya.get(self.map_key),
+            bismillah_uthmani=aya.get(self.bismillah_uthmani_key),
+            bismillah_imlaey=aya.get(self.bismillah_imlaey_key),
+            bismillah_map=aya.get(self.bismillah_map_key),
             istiaatha_uthmani=self.istiaatha_uthmani,
             istiaatha_imlaey=self.istiaatha_imlaey,
         )
+        self.corpus.aya_formats[absolute_idx] = aya_format
+        return aya_format
 
     def get(self) -> AyaFormat:
         """
@@ -282,13 +380,7 @@ class Aya(object):
         """
         check sura ds compatibility
         """
-        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
-
-        assert aya_idx >= 0 and aya_idx < len(self._get_sura(sura_idx)), (
-            f"Aya index out of range (sura_index={sura_idx + 1} "
-            + f"aya_index={aya_idx + 1}) "
-            + f"and length of sura={len(self._get_sura(sura_idx))}"
-        )
+        self.corpus.check_indices(sura_idx, aya_idx)
 
     def _set_ids(self, sura_idx, aya_idx):
         self.sura_idx = sura_idx
@@ -310,44 +402,52 @@ class Aya(object):
         aya_idx: the index of the aya starting form 1
         """
         return Aya(
-            quran_path=self.quran_path,
             sura_idx=sura_idx,
             aya_idx=aya_idx,
-            quran_dict=self.quran_dict,
+            corpus=self.corpus,
         )
 
-    def step(self, step_len: int):
-        """
-        Return new Aya object with "step_len" aya after of before
+    @classmethod
+    def from_absolute(
+        cls,
+        absolute_idx: int,
+        quran_path: str | Path = DEFAULT_QURAN_PATH,
+        corpus: QuranCorpus = None,
+        **kwargs,
+    ):
+        """Return new Aya of the absolute aya index in the Holy Quran
+        Args:
+            absolute_idx (int): the absoulte index of the aya in the Holy
+                Quran from 0 to 6235
+            the rest of **kwargs are of `Aya.__init__`
         """
-        aya_relative_idx = step_len + self.aya_idx
+        if corpus is None:
+            corpus = Aya(quran_path=quran_path, **kwargs).corpus
+        sura_idx, aya_idx = corpus.get_sura_aya_idx(absolute_idx)
+        return cls(sura_idx=sura_idx + 1, aya_idx=aya_idx + 1, corpus=corpus)
 
-        # +VE or zero aya idx
-        if aya_relative_idx >= 0:
-            sura_idx = self.sura_idx
-            while True:
-                num_ayat = self._get(
-                    sura_idx=sura_idx, aya_idx=0).num_ayat_in_sura
-                if aya_relative_idx < num_ayat:
-                    break
-                aya_relative_idx -= num_ayat
-                sura_idx = (sura_idx + 1) % 114
+    @property
+    def absolute_idx(self) -> int:
+        """
+        The absolute index of the aya in the Holy Quran from 0 to 6235
+        """
+        return self.corpus.get_sura_starts()[self.sura_idx] + self.aya_idx
 
-        # -VE aya idx
-        else:
-            sura_idx = (self.sura_idx - 1) % 114
-            while True:
-                num_ayat = self._get(
-                    sura_idx=sura_idx, aya_idx=0).num_ayat_in_sura
-                aya_relative_idx += num_ayat
-                if aya_relative_idx >= 0:
-                    break
+    def distance(self, other: "Aya") -> int:
+        """
+        Return the number of ayat from the this aya to the `other` aya
+        (-ve if `other` is before this aya)
+        """
+        return other.absolute_idx - self.absolute_idx
 
-        return Aya(
-            quran_path=self.quran_path,
-            sura_idx=sura_idx + 1,
-            aya_idx=aya_relative_idx + 1,
-            quran_dict=self.quran_dict,
+    def step(self, step_len: int):
+        """
+        Return new Aya object with "step_len" aya after of before
+        (wrapping around the end and the start of the Holy Quran)
+        """
+        return Aya.from_absolute(
+            (self.absolute_idx + step_len) % self.corpus.num_ayat,
+            corpus=self.corpus,
         )
 
     # TODO: Add vertix
@@ -359,22 +459,21 @@ class Aya(object):
             num_aya: loop for ayat until reaching aya + num_ayat - 1
         """
         if num_ayat is not None:
-            aya = self
-            for _ in range(num_ayat):
-                yield aya
-                aya = aya.step(1)
+            total_ayat = self.corpus.num_ayat
+            start_idx = self.absolute_idx
+            for idx in range(start_idx, start_idx + num_ayat):
+                yield Aya.from_absolute(idx % total_ayat, corpus=self.corpus)
             return
 
         aya_start_idx = self.aya_idx
         for sura_loop_idx in range(self.sura_idx, 114):
             for aya_loop_idx in range(
-                aya_start_idx, len(self._get_sura(sura_loop_idx))
+                aya_start_idx, self.corpus.get_num_ayat(sura_loop_idx)
             ):
                 yield Aya(
-                    quran_path=self.quran_path,
                     sura_idx=sura_loop_idx + 1,
                     aya_idx=aya_loop_idx + 1,
-                    quran_dict=self.quran_dict,
+                    corpus=self.corpus,
                 )
             aya_start_idx = 0
 
@@ -436,14 +535,10 @@ class Aya(object):
 
         # check first aya (set bismillah map)
         bismillah_map = None
-        if (
-            self.get().bismillah_uthmani is not None
-            and self.get().bismillah_map is None
-        ):
-            bismillah_uthmani = self.get().bismillah_uthmani.split(self.join_prefix)
-            bismillah_uthmani = [[word] for word in bismillah_uthmani]
-            bismillah_imlaey = self.get().bismillah_imlaey.split(self.join_prefix)
-            bismillah_imlaey = [[word] for word in bismillah_imlaey]
+        bismillah_words = self.bismillah_words
+        if bismillah_words is not None and self.get().bismillah_map is None:
+            bismillah_uthmani = [[word] for word in bismillah_words[0]]
+            bismillah_imlaey = [[word] for word in bismillah_words[1]]
 
             bismillah_map = self._get_map_dict(
                 uthmani_list=bismillah_uthmani, imlaey_list=bismillah_imlaey
@@ -455,18 +550,16 @@ class Aya(object):
         )
 
         # save quran script file
-        self.quran_dict["quran"]["sura"][self.sura_idx]["aya"][self.aya_idx][
-            self.map_key
-        ] = rasm_map
-        if bismillah_map is not None:
-            self.quran_dict["quran"]["sura"][self.sura_idx]["aya"][self.aya_idx][
-                self.bismillah_map_key
-            ] = bismillah_map
+        self.corpus.set_aya_maps(
+            self.sura_idx,
+            self.aya_idx,
+            rasm_map=rasm_map,
+            bismillah_map=bismillah_map,
+        )
 
     def save_quran_dict(self):
         # save the file
-        with open(self.quran_path, "w+", encoding="utf8") as f:
-            json.dump(self.quran_dict, f, ensure_ascii=False, indent=2)
+        self.corpus.save()
 
         # # TODO for debuging
         # with open(self.quran_path.parent / 'text.xml', 'w+', encoding='utf8') as f:
@@ -531,22 +624,28 @@ class Aya(object):
             inlcude_bismillah (bool): if True it will include bismillah in the
                 encoded dictionary as a part of the first aya
         """
-        uthmani_words = []
-        imlaey_words = []
-        if include_bismillah and (self.get().bismillah_uthmani is not None):
-            uthmani_words += self.get().bismillah_uthmani.split(self.join_prefix)
-            imlaey_words += self.get().bismillah_imlaey.split(self.join_prefix)
-
-        uthmani_words += self.get().uthmani.split(self.join_prefix)
-        imlaey_words += self.get().imlaey.split(self.join_prefix)
-
-        if len(uthmani_words) == len(imlaey_words):
-            return {idx: idx for idx in range(len(uthmani_words))}
+        # the word ids are enough to compare the number of words
+        absolute_idx = self.absolute_idx
+        uthmani_ids = self.corpus.get_word_ids('uthmani', absolute_idx)
+        imlaey_ids = self.corpus.get_word_ids('imlaey', absolute_idx)
+        bismillah_imlaey_ids = self.corpus.get_word_ids('bismillah_imlaey', absolute_idx)
+        include_bismillah = include_bismillah and (bismillah_imlaey_ids is not None)
+        if include_bismillah:
+            uthmani_ids = (
+                self.corpus.get_word_ids('bismillah_uthmani', absolute_idx)
+                + uthmani_ids)
+            imlaey_ids = bismillah_imlaey_ids + imlaey_ids
+
+        if len(uthmani_ids) == len(imlaey_ids):
+            return {idx: idx for idx in range(len(uthmani_ids))}
 
         # len mismatch
+        imlaey_words = self.imlaey_words
+        if include_bismillah:
+            imlaey_words = self.bismillah_words[1] + imlaey_words
         iml_idx = 0
         imlaey2uthmani = {}
-        for uth_idx in range(len(uthmani_words)):
+        for uth_idx in range(len(uthmani_ids)):
             # special words of Uthmani Rasm
             span = self._get_unique_rasm_map_span(iml_idx, imlaey_words)
             if span is not None:
@@ -565,7 +664,7 @@ class Aya(object):
 
         assert sorted(imlaey2uthmani.keys())[-1] == len(imlaey_words) - 1
         #
-        assert sorted(imlaey2uthmani.values())[-1] == len(uthmani_words) - 1
+        assert sorted(imlaey2uthmani.values())[-1] == len(uthmani_ids) - 1
 
         return imlaey2uthmani
 
@@ -576,9 +675,9 @@ class Aya(object):
         alphabet.unique_rasm.rasm_map
         Else: None
         """
-        for unique_rasm in alpha.unique_rasm.rasm_map:
-            span = len(unique_rasm["imlaey"].split(self.join_prefix))
-            if self.join_prefix.join(words[idx: idx + span]) == unique_rasm["imlaey"]:
+        for unique_rasm_words in _get_unique_rasm_imlaey_words(self.join_prefix):
+            span = len(unique_rasm_words)
+            if tuple(words[idx: idx + span]) == unique_rasm_words:
                 return span
         return None
 
@@ -610,11 +709,10 @@ class Aya(object):
                     "The Imlay Word is part of uthmani word")
 
         # Preparing Uthamni Words
-        uthmani_words = []
-        if include_bismillah and (self.get().bismillah_uthmani is not None):
-            uthmani_words += self.get().bismillah_uthmani.split(self.join_prefix)
-
-        uthmani_words += self.get().uthmani.split(self.join_prefix)
+        uthmani_words = self.uthmani_words
+        bismillah_words = self.bismillah_words
+        if include_bismillah and (bismillah_words is not None):
+            uthmani_words = bismillah_words[0] + uthmani_words
 
         out_script = ""
         prev_uth_idx = -1
@@ -629,6 +727,17 @@ class Aya(object):
         return out_script
 
 
+@lru_cache
+def _get_unique_rasm_imlaey_words(join_prefix=" ") -> tuple[tuple[str, ...], ...]:
+    """
+    the imlaey words of every item in alphabet.unique_rasm.rasm_map
+    """
+    return tuple(
+        tuple(unique_rasm["imlaey"].split(join_prefix))
+        for unique_rasm in alpha.unique_rasm.rasm_map
+    )
+
+
 @dataclass
 class SearchItem:
     start_aya: Aya
@@ -637,6 +746,11 @@ class SearchItem:
     uthmani_script: int
     has_bismillah: bool = False
     has_istiaatha: bool = False
+    edit_distance: int = 0
+    # (start, end, suffix, normalize kwargs) of the match in the normalized
+    # imlaey of the matched ayat (see `imlaey_char_spans`)
+    _match: tuple = field(default=None, repr=False, compare=False)
+    _imlaey_char_spans: list = field(default=None, repr=False, compare=False)
     """
     start_aya (Aya): the start aya of the first search
 
@@ -647,6 +761,9 @@ class SearchItem:
 
     has_istiaatha (bool): True if the search item has istiaatha
 
+    edit_distance (int): the edit distance between the normalized query and
+        the matched imlaey (always 0 for exact search, see `fuzzy_search`)
+
     imlaey_word_span (WordSpan):
         start: the start word idx of the imlaey scriptin thestart_aya
         end: the end imlaey_idx of the imlaey (start_aya + num_ayat - 1)
@@ -670,13 +787,174 @@ class SearchItem:
 
         return out_str
 
+    @property
+    def imlaey_char_spans(self) -> list[CharSpan]:
+        """
+        The character spans of the match in `AyaFormat.imlaey` of every
+        matched aya (start_aya to start_aya + num_ayat - 1) computed on the
+        first access. The diacritics after the last matched character are
+        included.
+        NOTE: characters matched in bismillah or istiaatha are not included
+        """
+        if self._imlaey_char_spans is None:
+            self._imlaey_char_spans = self._get_imlaey_char_spans()
+        return self._imlaey_char_spans
+
+    def _get_imlaey_char_spans(self) -> list[CharSpan]:
+        if self._match is None:
+            return []
+        match_start, match_end, suffix, normalize_kwargs = self._match
+        normalized_ayat = self.start_aya.corpus.get_normalized_imlaey_range(
+            self.start_aya.absolute_idx, self.num_ayat, suffix=suffix,
+            **normalize_kwargs)
+
+        spans = []
+        aya_start = 0
+        for idx, (_, aya_str, _, bismillah_str) in enumerate(normalized_ayat):
+            if self.has_bismillah and bismillah_str is not None:
+                aya_start += len(bismillah_str)
+            start = min(max(match_start - aya_start, 0), len(aya_str))
+            end = min(max(match_end - aya_start, 0), len(aya_str))
+            aya_start += len(aya_str)
+
+            imlaey = self.start_aya.step(idx).get().imlaey
+            offsets = _get_imlaey_offsets(imlaey, suffix, normalize_kwargs)
+            if start == end:
+                char_idx = offsets[start] if start < len(offsets) else len(imlaey)
+                spans.append(CharSpan(start=char_idx, end=char_idx))
+                continue
+
+            # including the removed characters (ex: tashkeel) after the
+            # last matched character
+            char_end = offsets[end - 1] + 1
+            next_start = offsets[end] if end < len(offsets) else len(imlaey)
+            while char_end < next_start and not imlaey[char_end].isspace():
+                char_end += 1
+            spans.append(CharSpan(start=offsets[start], end=char_end))
+        return spans
+
+
+class LazySearchItem(object):
+    __slots__ = (
+        "corpus",
+        "start_aya_idx",
+        "num_ayat",
+        "imlaey_word_span",
+        "has_bismillah",
+        "has_istiaatha",
+        "suffix",
+        "edit_distance",
+        "_match",
+        "_start_aya",
+        "_uthmani_script",
+        "_imlaey_char_spans",
+    )
+
+    def __init__(
+        self,
+        corpus: QuranCorpus,
+        start_aya_idx: int | None,
+        num_ayat: int | None,
+        imlaey_word_span: WordSpan | None,
+        has_bismillah: bool | None,
+        has_istiaatha: bool,
+        suffix=" ",
+        _match: tuple = None,
+    ):
+        """
+        A compact `SearchItem` (see `iter_search`): holds the absolute index
+        of the start aya, the imlaey word span and the flags only. The `Aya`
+        handle (`start_aya`) and the `uthmani_script` are built on the first
+        access so positions only consumers do not pay for them.
+
+        Attributes:
+            start_aya_idx (int): the absolute index of the start aya (0 to
+                6235) or None for istiaatha only
+            the rest are the same as `SearchItem`
+        """
+        self.corpus = corpus
+        self.start_aya_idx = start_aya_idx
+        self.num_ayat = num_ayat
+        self.imlaey_word_span = imlaey_word_span
+        self.has_bismillah = has_bismillah
+        self.has_istiaatha = has_istiaatha
+        self.suffix = suffix
+        self.edit_distance = 0
+        self._match = _match
+        self._start_aya = None
+        self._uthmani_script = None
+        self._imlaey_char_spans = None
+
+    @property
+    def start_aya(self) -> Aya | None:
+        if self._start_aya is None and self.start_aya_idx is not None:
+            self._start_aya = Aya.from_absolute(
+                self.start_aya_idx, corpus=self.corpus)
+        return self._start_aya
+
+    @property
+    def uthmani_script(self) -> str:
+        """
+        Raises:
+            PartOfUthmaniWord: if the imlaey words are a part of a single
+                uthmani word (raised by `search` directly)
+        """
+        if self._uthmani_script is None:
+            if self.start_aya_idx is None:
+                self._uthmani_script = alpha.istiaatha.uthmani
+            else:
+                uthmani_script = _get_uthmani_of_result_item(
+                    self, suffix=self.suffix)
+                if self.has_istiaatha:
+                    uthmani_script = (
+                        alpha.istiaatha.uthmani + self.suffix + uthmani_script)
+                self._uthmani_script = uthmani_script
+        return self._uthmani_script
+
+    @property
+    def imlaey_char_spans(self) -> list[CharSpan]:
+        """
+        see `SearchItem.imlaey_char_spans`
+        """
+        if self._imlaey_char_spans is None:
+            self._imlaey_char_spans = SearchItem._get_imlaey_char_spans(self)
+        return self._imlaey_char_spans
+
+    def to_search_item(self) -> SearchItem:
+        return SearchItem(
+            start_aya=self.start_aya,
+            num_ayat=self.num_ayat,
+            imlaey_word_span=self.imlaey_word_span,
+            uthmani_script=self.uthmani_script,
+            has_bismillah=self.has_bismillah,
+            has_istiaatha=self.has_istiaatha,
+            edit_distance=self.edit_distance,
+            _match=self._match,
+        )
+
+    __str__ = SearchItem.__str__
+
+    def __repr__(self):
+        return (
+            f"LazySearchItem(start_aya_idx={self.start_aya_idx}"
+            f", num_ayat={self.num_ayat}"
+            f", imlaey_word_span={self.imlaey_word_span}"
+            f", has_bismillah={self.has_bismillah}"
+            f", has_istiaatha={self.has_istiaatha})"
+        )
+
 
 # TODO: Add Examples
 def search(
     text: str,
-    start_aya: Aya = Aya(1, 1),
+    start_aya: Aya = None,
     window: int = 2,
     suffix=" ",
+    scope="window",
+    min_results: int = None,
+    max_window: int = None,
+    top_k: int = None,
+    rank="proximity",
     **kwargs,
 ) -> list[SearchItem]:
     """searches the Holy Quran of Imlaey script to match the given text
@@ -692,11 +970,41 @@ def search(
         text (str): the text to search with (expected with imlaey script)
 
         start_aya (Aya): The Pivot Aya to set Search with.
+            (default: the first aya of the Holy Quran)
 
         winodw (int): the search winodw:
         [start_aya - winowd //2, start_aya + winodw //2]
 
         suffix (str): the suffix that sperate the quran words either imlaey or uthmani
+
+        scope (str): either:
+            * "window": search the window arround `start_aya`
+            * "quran": search the whole Holy Quran (from the first aya to the
+            last one) using the prebuilt `SearchIndex` of the corpus.
+            `window` is ignored and `text` is matched literally. If the
+            normalized text has a single split into the Quran words (and
+            can not overlap itself) the matches with and without bismillah
+            are found by a single lookup of the `WordIndex` of the corpus,
+            otherwise the index is searched without then with bismillah
+
+        min_results (int): if given: the window is expanded around
+            `start_aya` by doubling it (starting from `window`) until at least
+            `min_results` items are found or the window reaches
+            `max_window`. The normalized ayat of the previous windows are
+            reused (cached by the corpus) so the cost depends on the distance
+            of the matches not on `max_window` (the windows are slices of the
+            whole Quran `SearchIndex` if already built). (scope="window" only)
+
+        max_window (int): the largest window of `min_results`
+            (default: the whole Holy Quran)
+
+        top_k (int): return the best `top_k` items only sorted by `rank`. The
+            uthmani script is built for the returned items only
+
+        rank (str): the ranking of `top_k`:
+            * "proximity": the nearest items to `start_aya` (the number of
+            ayat between the first aya of the item and `start_aya`) first
+            (in the search order for the same distance)
         the rest of **kwargs are from normalize_aya function below
     Returns:
         list[SearchItem]: Every SearchItem is:
@@ -717,28 +1025,328 @@ def search(
         NOTE: if istiaatha is only will return:
         start_aya=None, num_ayat=None, imlaey_word_span=None, has_bismillah=None
     """
+    assert scope in ["window", "quran"], f'Unknown search scope: {scope}'
+    assert rank in ["proximity"], f'Unknown rank: {rank}'
     normalized_text: str = normalize_aya(text, remove_spaces=True, **kwargs)
     if normalized_text == "":
         return []
 
+    if start_aya is None:
+        start_aya = Aya(1, 1)
+    istiaatha_imlaey_str = _get_istiaatha_str(suffix, kwargs)
+
+    if min_results is not None:
+        assert scope == "window", 'min_results is for scope="window" only'
+        if max_window is None:
+            max_window = start_aya.corpus.num_ayat - 1
+        window = min(window, max_window)
+        # windows are slices of the whole Quran indices if already built
+        search_indices = [
+            start_aya.corpus.get_search_index(
+                include_bismillah=include_bismillah, suffix=suffix, build=False,
+                **kwargs)
+            for include_bismillah in [False, True]
+        ]
+        if None in search_indices:
+            search_indices = None
+        while True:
+            found = _search_normalized(
+                normalized_text,
+                start_aya=start_aya,
+                window=window,
+                suffix=suffix,
+                scope=scope,
+                istiaatha_imlaey_str=istiaatha_imlaey_str,
+                normalize_kwargs=kwargs,
+                search_indices=search_indices,
+                top_k=top_k,
+            )
+            if len(found) >= min_results or window >= max_window:
+                return found
+            window = min(max(2 * window, 1), max_window)
+
+    return _search_normalized(
+        normalized_text,
+        start_aya=start_aya,
+        window=window,
+        suffix=suffix,
+        scope=scope,
+        istiaatha_imlaey_str=istiaatha_imlaey_str,
+        normalize_kwargs=kwargs,
+        top_k=top_k,
+    )
+
+
+def iter_search(
+    text: str,
+    start_aya: Aya = None,
+    window: int = 2,
+    suffix=" ",
+    scope="window",
+    **kwargs,
+) -> Iterator[LazySearchItem]:
+    """the same results of `search` (in the same order) yielded one by one
+    as `LazySearchItem`s: the uthmani script and the `Aya` of an item are
+    built on their first access only, so a consumer stopping early (ex:
+    the first match) or reading the positions only does not pay for the
+    rest.
+
+    The window is searched as a slice of the whole Quran `SearchIndex` if
+    already built (and `text` is literal) else by scanning its normalized
+    ayat. Items including bismillah are yielded only if there are no items
+    without it (as `search`)
+
+    NOTE: `PartOfUthmaniWord` is raised on accessing `uthmani_script` of
+    the item not by the search
+
+    Example:
+        >> for item in iter_search('الحمد لله', start_aya=Aya(1, 1),
+                remove_tashkeel=True):
+        >>     print(item.start_aya_idx, item.imlaey_word_span)
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        start_aya (Aya): The Pivot Aya to set Search with.
+            (default: the first aya of the Holy Quran)
+        window (int): the search window (see `search`)
+        suffix (str): the suffix that sperate the quran words
+        scope (str): "window" or "quran" (see `search`)
+        the rest of **kwargs are from normalize_aya function
+    """
+    assert scope in ["window", "quran"], f'Unknown search scope: {scope}'
+    normalized_text: str = normalize_aya(text, remove_spaces=True, **kwargs)
+    if normalized_text == "":
+        return
+    if start_aya is None:
+        start_aya = Aya(1, 1)
+    corpus = start_aya.corpus
+
+    normalized_text, has_istiaatha = _strip_istiaatha(
+        normalized_text, _get_istiaatha_str(suffix, kwargs))
+    if has_istiaatha and normalized_text == "":
+        # istiaatha only
+        yield LazySearchItem(
+            corpus=corpus,
+            start_aya_idx=None,
+            num_ayat=None,
+            imlaey_word_span=None,
+            has_bismillah=None,
+            has_istiaatha=True,
+            suffix=suffix,
+        )
+        return
+
+    loop_aya = start_aya.step(-window // 2)
+    use_index = scope == "quran" or (
+        window < corpus.num_ayat and re.escape(normalized_text) == normalized_text)
+    for bismillah_flag in [False, True]:
+        matches = None
+        if use_index:
+            index = corpus.get_search_index(
+                include_bismillah=bismillah_flag, suffix=suffix,
+                build=scope == "quran", **kwargs)
+            if index is not None:
+                matches = _iter_index_matches(
+                    normalized_text, index,
+                    aya_range=(
+                        None if scope == "quran"
+                        else (loop_aya.absolute_idx, window + 1)),
+                )
+        # not indexed or a match across the end of the Quran
+        if matches is None:
+            matches = _iter_window_matches(
+                normalized_text,
+                loop_aya=loop_aya,
+                window=window,
+                include_bismillah=bismillah_flag,
+                suffix=suffix,
+                normalize_kwargs=kwargs,
+            )
+
+        num_found = 0
+        for start_aya_idx, num_ayat, word_span, match in matches:
+            num_found += 1
+            yield LazySearchItem(
+                corpus=corpus,
+                start_aya_idx=start_aya_idx,
+                num_ayat=num_ayat,
+                imlaey_word_span=word_span,
+                has_bismillah=bismillah_flag,
+                has_istiaatha=has_istiaatha,
+                suffix=suffix,
+                _match=match,
+            )
+        if num_found > 0:
+            return
+
+
+def search_many(
+    texts: Iterable[str],
+    start_ayat: Aya | list[Aya] = None,
+    window: int = 2,
+    suffix=" ",
+    scope="window",
+    chunk_size=1_000,
+    parallel_threshold=10_000,
+    max_workers: int | None = None,
+    **kwargs,
+) -> list[list[SearchItem]]:
+    """searches the Holy Quran for many texts with the same flags
+
+    The same results of calling `search` for every text (in the input order)
+    but the texts are normalized in one pass, the istiaatha once and the
+    windows are not rebuilt for every text: every window is a slice of the
+    whole Quran `SearchIndex` of the normalization profile (shared by all
+    the texts) and the texts are matched literally in it.
+    Batches larger than `parallel_threshold` are searched in a
+    `ProcessPoolExecutor` by chunks of `chunk_size` texts (only for the
+    shared corpora of `get_corpus`).
+
+    Args:
+        texts (Iterable[str]): the texts to search with (expected with imlaey script)
+        start_ayat (Aya | list[Aya]): the pivot aya of every text or a single
+            aya for all the texts (default: the first aya of the Holy Quran)
+        window (int): the search window (see `search`)
+        suffix (str): the suffix that sperate the quran words
+        scope (str): "window" or "quran" (see `search`)
+        chunk_size (int): number of texts sent to a worker at once
+        parallel_threshold (int): the minimum number of texts to use a process
+            pool (None: never use a pool)
+        max_workers (int): number of processes (default: `os.cpu_count()`)
+            1 disables the process pool
+        the rest of **kwargs are from normalize_aya function below
+
+    Returns:
+        list[list[SearchItem]]: the results of every text
+    """
+    assert scope in ["window", "quran"], f'Unknown search scope: {scope}'
+    texts = list(texts)
+    if start_ayat is None:
+        start_ayat = Aya(1, 1)
+    if isinstance(start_ayat, Aya):
+        start_ayat = [start_ayat] * len(texts)
+    assert len(start_ayat) == len(texts), (
+        f'Got {len(start_ayat)} start ayat for {len(texts)} texts')
+    if not texts:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    corpus = start_ayat[0].corpus
+    if (parallel_threshold is None
+            or len(texts) < parallel_threshold
+            or max_workers <= 1
+            or corpus.cache_key is None):
+        return _search_many(texts, start_ayat, window, suffix, scope, kwargs)
+
+    # imported lazily (see `tests/test_import_time.py`)
+    from concurrent.futures import ProcessPoolExecutor
+
+    # built before forking so the workers share them
+    for include_bismillah in [False, True]:
+        corpus.get_search_index(
+            include_bismillah=include_bismillah, suffix=suffix, **kwargs)
+    chunks = [
+        (texts[idx: idx + chunk_size], start_ayat[idx: idx + chunk_size],
+         window, suffix, scope, kwargs)
+        for idx in range(0, len(texts), chunk_size)
+    ]
+    found = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_found in executor.map(_search_many_chunk, chunks):
+            found += chunk_found
+    return found
+
+
+def _search_many_chunk(args: tuple) -> list[list[SearchItem]]:
+    return _search_many(*args)
+
+
+def _search_many(
+    texts: list[str],
+    start_ayat: list[Aya],
+    window: int,
+    suffix: str,
+    scope: str,
+    normalize_kwargs: dict,
+) -> list[list[SearchItem]]:
+    istiaatha_imlaey_str = _get_istiaatha_str(suffix, normalize_kwargs)
+    # the whole Quran indices of the shared profile (without, with bismillah)
+    search_indices = [
+        start_ayat[0].corpus.get_search_index(
+            include_bismillah=include_bismillah, suffix=suffix, **normalize_kwargs)
+        for include_bismillah in [False, True]
+    ]
+    found = []
+    for normalized_text, start_aya in zip(
+        normalize_many(texts, remove_spaces=True, max_workers=1, **normalize_kwargs),
+        start_ayat,
+    ):
+        if normalized_text == "":
+            found.append([])
+            continue
+        found.append(_search_normalized(
+            normalized_text,
+            start_aya=start_aya,
+            window=window,
+            suffix=suffix,
+            scope=scope,
+            istiaatha_imlaey_str=istiaatha_imlaey_str,
+            normalize_kwargs=normalize_kwargs,
+            search_indices=(
+                search_indices if start_aya.corpus is start_ayat[0].corpus else None),
+        ))
+    return found
+
+
+def _get_istiaatha_str(suffix: str, normalize_kwargs: dict) -> str:
+    """
+    the normalized imlaey istiaatha without spaces
+    """
+    istiaatha_imlaey_words = normalize_aya(
+        alpha.istiaatha.imlaey,
+        remove_spaces=False,
+        **normalize_kwargs,
+    ).split(suffix)
+    return "".join(istiaatha_imlaey_words)
+
+
+def _search_normalized(
+    normalized_text: str,
+    start_aya: Aya,
+    window: int,
+    suffix: str,
+    scope: str,
+    istiaatha_imlaey_str: str,
+    normalize_kwargs: dict,
+    search_indices: list = None,
+    top_k: int = None,
+) -> list[SearchItem]:
+    """
+    `search` of a normalized text (spaces removed)
+    Args:
+        top_k (int): keep the `top_k` items nearest to `start_aya` only
+            (see `search`)
+        search_indices (list[SearchIndex]): the whole Quran indices without
+            and with bismillah of `normalize_kwargs`. If given: the window is
+            searched as a slice of them if `normalized_text` is a literal text
+    """
+    kwargs = normalize_kwargs
     # Prepare ayat within [-window/2, window/2]
     loop_aya = start_aya.step(-window // 2)
+    if (search_indices is not None
+            and scope == "window"
+            and window < start_aya.corpus.num_ayat
+            and re.escape(normalized_text) == normalized_text):
+        scope = "window_index"
 
     # ----------------------------------
     # Checking for Itiaatha
     # ----------------------------------
     # NOTE: Assuming Istiaatha is at the first only
-    has_istiaatha = False
-    istiaatha_imlaey_words = normalize_aya(
-        start_aya.get().istiaatha_imlaey,
-        remove_spaces=False,
-        **kwargs,
-    ).split(suffix)
-    istiaatha_imlaey_str = "".join(istiaatha_imlaey_words)
-    re_span = re.search(istiaatha_imlaey_str, normalized_text)
-    if re_span:
-        normalized_text = normalized_text[re_span.span()[1]:]
-        has_istiaatha = True
+    normalized_text, has_istiaatha = _strip_istiaatha(
+        normalized_text, istiaatha_imlaey_str)
+    if has_istiaatha:
         if normalized_text == "":
             # return istiaatha only
             return [
@@ -748,133 +1356,463 @@ def search(
                     imlaey_word_span=None,
                     has_bismillah=None,
                     has_istiaatha=has_istiaatha,
-                    uthmani_script=start_aya.get().istiaatha_uthmani,
+                    uthmani_script=alpha.istiaatha.uthmani,
                 )
             ]
 
-    found = []
-    for bismillah_flag in [False, True]:
-        aya_imlaey_words, aya_imlaey_str = _get_imlaey_words_and_str(
-            start_aya=loop_aya,
-            window=window,
+    if scope == "quran":
+        found = _search_word_index(
+            normalized_text,
+            corpus=start_aya.corpus,
+            has_istiaatha=has_istiaatha,
             suffix=suffix,
-            include_bismillah=bismillah_flag,
-            **kwargs,
+            normalize_kwargs=kwargs,
+            top_k=top_k,
+            center_aya_idx=start_aya.absolute_idx,
         )
-
-        for re_search in re.finditer(normalized_text, aya_imlaey_str):
-            if re_search is not None:
-                span = _get_words_span(
-                    start=re_search.span()[0],
-                    end=re_search.span()[1],
-                    words_list=aya_imlaey_words,
-                )
-                if span is not None:
-                    start_vertex, end_vertex = span
-                    found.append(
-                        SearchItem(
-                            start_aya=loop_aya.step(start_vertex.aya_idx),
-                            num_ayat=end_vertex.aya_idx - start_vertex.aya_idx + 1,
-                            imlaey_word_span=WordSpan(
-                                start=start_vertex.word_idx, end=end_vertex.word_idx
-                            ),
-                            has_bismillah=bismillah_flag,
-                            has_istiaatha=has_istiaatha,
-                            uthmani_script="",
-                        )
+        if found is not None:
+            if has_istiaatha:
+                for item in found:
+                    item.uthmani_script = (
+                        alpha.istiaatha.uthmani + suffix + item.uthmani_script
                     )
-                    found[-1].uthmani_script = _get_uthmani_of_result_item(
-                        found[-1], suffix=suffix
+            return found
+
+    found = []
+    for bismillah_flag in [False, True]:
+        found = None
+        if scope in ["quran", "window_index"]:
+            if search_indices is not None:
+                index = search_indices[int(bismillah_flag)]
+            else:
+                index = start_aya.corpus.get_search_index(
+                    include_bismillah=bismillah_flag, suffix=suffix, **kwargs)
+            found = _search_index(
+                normalized_text,
+                index,
+                has_istiaatha=has_istiaatha,
+                corpus=start_aya.corpus,
+                aya_range=(
+                    (loop_aya.absolute_idx, window + 1)
+                    if scope == "window_index" else None),
+                top_k=top_k,
+                center_aya_idx=start_aya.absolute_idx,
+            )
+        # a match across the end of the Quran in a wrapping window
+        if found is None:
+            found = []
+            for start_aya_idx, num_ayat, word_span, match in _iter_window_matches(
+                normalized_text,
+                loop_aya=loop_aya,
+                window=window,
+                include_bismillah=bismillah_flag,
+                suffix=suffix,
+                normalize_kwargs=kwargs,
+            ):
+                found.append(
+                    SearchItem(
+                        start_aya=Aya.from_absolute(
+                            start_aya_idx, corpus=start_aya.corpus),
+                        num_ayat=num_ayat,
+                        imlaey_word_span=word_span,
+                        has_bismillah=bismillah_flag,
+                        has_istiaatha=has_istiaatha,
+                        uthmani_script="",
+                        _match=match,
                     )
+                )
+            # the uthmani script of the kept items only
+            if top_k is not None:
+                found = _get_top_k(found, start_aya.absolute_idx, top_k)
+            for item in found:
+                item.uthmani_script = _get_uthmani_of_result_item(
+                    item, suffix=suffix
+                )
         if found != []:
             # add istiaatah uthamni script
             if has_istiaatha:
                 for item in found:
                     item.uthmani_script = (
-                        start_aya.get().istiaatha_uthmani + suffix + item.uthmani_script
+                        alpha.istiaatha.uthmani + suffix + item.uthmani_script
                     )
             return found
 
     return found
 
 
-def normalize_aya(
-    text: str,
-    remove_spaces=True,
-    ignore_hamazat=False,
-    ignore_alef_maksoora=True,
-    ignore_taa_marboota=False,
-    normalize_taat=False,
-    remove_small_alef=True,
-    remove_tashkeel=False,
-) -> str:
-    """Apply filters to match input Kwargs on **Imlaey** text
+def _search_word_index(
+    normalized_text: str,
+    corpus: QuranCorpus,
+    has_istiaatha: bool,
+    suffix: str,
+    normalize_kwargs: dict,
+    top_k: int = None,
+    center_aya_idx: int = 0,
+) -> list[SearchItem] | None:
+    """
+    search the whole Quran with a single lookup of the `WordIndex` (the
+    runs with and without bismillah at once) instead of the two passes of
+    `_search_normalized`. The word index finds the matches of
+    `normalized_text` split into the Quran words, so it is used only if its
+    results are the results of `_search_index`: `normalized_text` is a
+    literal text with a single split into the words of the vocabulary and
+    its occurrences can not overlap
+
+    Return:
+        the found items or None if the word index can not be used
+    """
+    if (suffix != corpus.join_prefix
+            or re.escape(normalized_text) != normalized_text
+            or any(normalized_text[:length] == normalized_text[-length:]
+                   for length in range(1, len(normalized_text)))):
+        return None
+    word_index = corpus.get_word_index(suffix=suffix, **normalize_kwargs)
+    words, num_splits = word_index.split_text(normalized_text)
+    if num_splits == 0:
+        # no match begins and ends on word boundaries
+        return []
+    if num_splits > 1:
+        return None
+    plain_spans, full_spans = word_index.find(words)
+    if plain_spans:
+        index, spans = word_index.plain_index, plain_spans
+    else:
+        index, spans = word_index.full_index, full_spans
+    return _search_index(
+        normalized_text,
+        index,
+        has_istiaatha=has_istiaatha,
+        corpus=corpus,
+        top_k=top_k,
+        center_aya_idx=center_aya_idx,
+        spans=spans,
+    )
 
-    Args:
-        remove_spaces (bool): remove spaces for text
 
-        ignore_hamazat (bool): making all hamazat equal (أ, آ, إ ء, ئ, ؤ) = (ء)
-        alphabet.imlaey.hmazat -> alphabet.imlaey.
+def _search_index(
+    normalized_text: str,
+    index,
+    has_istiaatha: bool,
+    corpus: QuranCorpus,
+    aya_range: tuple[int, int] = None,
+    top_k: int = None,
+    center_aya_idx: int = 0,
+    spans: list[tuple[int, int]] = None,
+) -> list[SearchItem]:
+    """
+    search the whole Quran `SearchIndex` resolving word boundaries with
+    bisect instead of `_get_words_span`
+    Args:
+        aya_range (tuple[int, int]): (absolute start aya, number of ayat) to
+            search within (default: the whole Quran) wrapping around the end
+            of the Quran.
+        top_k (int): return the `top_k` items nearest to `center_aya_idx`
+            only: the occurrences are popped from a heap by their distance
+            and resolved (words span and uthmani script) until `top_k`
+            items are found
+        spans (list[tuple[int, int]]): the occurrences if already found
+            (ex: by the `WordIndex`) instead of searching `index`
+
+    Return:
+        the found items or None if a match is across the end of the Quran
+        (can not be resolved by `index`)
+    """
+    ring_searchable = False
+    if spans is None:
+        spans = _find_in_range(normalized_text, index, aya_range)
+        if spans is None:
+            return None
+        ring_searchable = _is_ring_searchable(normalized_text, index, aya_range)
+    if top_k is not None and ring_searchable:
+        if aya_range is None:
+            aya_range = (0, index.num_ayat)
+        spans = _iter_nearest_spans(
+            normalized_text, index, aya_range, center_aya_idx)
+    elif top_k is not None:
+        heap = [
+            (_get_aya_distance(index.get_aya_idx(start), center_aya_idx, index.num_ayat),
+             order, start, end)
+            for order, (start, end) in enumerate(spans)
+        ]
+        heapq.heapify(heap)
+        spans = (heapq.heappop(heap)[2:] for _ in range(len(heap)))
 
-        ignore_alef_maksoora (bool): (ى) -> (ا).
-        alphabet.imlaey.alef_maksoora = alphabet.imlaey.alef
+    found = []
+    for start, end in spans:
+        if top_k is not None and len(found) == top_k:
+            break
+        item = _get_index_search_item(index, start, end, has_istiaatha, corpus)
+        if item is not None:
+            found.append(item)
+    return found
 
-        ignore_taa_marboota (bool): (ة) -> (ه).
-        alphabet.imlaey.taa_motaterfa -> alphabet.imlaey.haa
 
-        normalize_taat (bool): (ة) -> (ت).
-        alphabet.imlaey.taa_marboota = alphabet.taa_mabsoota
+def _is_ring_searchable(normalized_text: str, index, aya_range: tuple[int, int]) -> bool:
+    """
+    True if the occurrences of `normalized_text` can be found ring by ring
+    (`_iter_nearest_spans`): the ayat range does not wrap around the end of
+    the Quran and `normalized_text` can not overlap itself (no prefix is a
+    suffix) so every occurrence is a non overlapping occurrence
+    """
+    if aya_range is not None and aya_range[0] + aya_range[1] > index.num_ayat:
+        return False
+    return not any(
+        normalized_text[:length] == normalized_text[-length:]
+        for length in range(1, len(normalized_text)))
+
+
+def _iter_nearest_spans(
+    normalized_text: str,
+    index,
+    aya_range: tuple[int, int],
+    center_aya_idx: int,
+) -> Iterator[tuple[int, int]]:
+    """
+    yield the (start, end) spans of the occurrences of `normalized_text` in
+    the ayat of `aya_range` (not wrapping) sorted by the distance of their
+    first aya to `center_aya_idx` then by position.
+    The ayat are scanned ring by ring (distances [0, 1), [1, 2), [2, 4),
+    [4, 8), ...) so a consumer stopping early does not scan the far ayat
+    """
+    num_ayat = index.num_ayat
+    range_start, range_end = aya_range[0], aya_range[0] + aya_range[1]
+    text_end = index.aya_starts[range_end]
+    length = len(normalized_text)
+    min_distance, max_distance = 0, 1
+    while min_distance <= num_ayat // 2:
+        # the aya offsets from the center of the ring (both sides)
+        offset_ranges = [(min_distance, max_distance)]
+        left_start = max(num_ayat - max_distance + 1, max_distance)
+        if left_start < num_ayat - min_distance + 1:
+            offset_ranges.append(
+                (left_start, min(num_ayat - min_distance + 1, num_ayat)))
+
+        ring_spans = []
+        for offset_start, offset_end in offset_ranges:
+            if offset_start >= min(offset_end, num_ayat):
+                continue
+            start_idx = (center_aya_idx + offset_start) % num_ayat
+            end_idx = start_idx + min(offset_end, num_ayat) - offset_start
+            # split the ayat wrapping around the end of the Quran
+            for first, last in [(start_idx, min(end_idx, num_ayat)),
+                                (0, end_idx - num_ayat)]:
+                first, last = max(first, range_start), min(last, range_end)
+                if first >= last:
+                    continue
+                ring_start = index.aya_starts[first]
+                ring_end = index.aya_starts[last]
+                start = index.text.find(
+                    normalized_text, ring_start,
+                    min(ring_end + length - 1, text_end))
+                while start != -1 and start < ring_end:
+                    ring_spans.append((
+                        _get_aya_distance(
+                            index.get_aya_idx(start), center_aya_idx, num_ayat),
+                        start,
+                        start + length,
+                    ))
+                    start = index.text.find(
+                        normalized_text, start + length,
+                        min(ring_end + length - 1, text_end))
+        ring_spans.sort()
+        for _, start, end in ring_spans:
+            yield start, end
+        min_distance, max_distance = max_distance, 2 * max_distance
+
+
+def _get_aya_distance(aya_idx: int, other_aya_idx: int, num_ayat: int) -> int:
+    """
+    the number of ayat between two absolute aya indices (wrapping around
+    the end of the Quran as `Aya.step`)
+    """
+    distance = abs(aya_idx - other_aya_idx)
+    return min(distance, num_ayat - distance)
 
-        NOTE: We can not use `ignore_taaa_marboota` and `normalize_taaat` at
-        the same time
 
-        remove_small_alef (bool): remove small alef "ٰ" in
-        alphabet.imlaey.small_alef (alef khingarai)
+def _get_top_k(
+    items: list[SearchItem], center_aya_idx: int, top_k: int
+) -> list[SearchItem]:
+    """
+    the `top_k` items nearest to `center_aya_idx` (in the order of `items`
+    for the same distance)
+    """
+    return heapq.nsmallest(
+        top_k,
+        items,
+        key=lambda item: _get_aya_distance(
+            item.start_aya.absolute_idx, center_aya_idx,
+            item.start_aya.corpus.num_ayat),
+    )
 
-        remove_tashkeel (bool): remove tashkeel: "ًٌٍَُِّْ" in alphabet.imlaey.tashkeel
 
-        Return:
-            str: the normalied imlaey text
+def _find_in_range(
+    normalized_text: str, index, aya_range: tuple[int, int] = None,
+) -> Iterable[tuple[int, int]] | None:
+    """
+    the (start, end) spans of the non overlapping occurrences of
+    `normalized_text` in the ayat of `aya_range` (absolute start aya,
+    number of ayat) of `index` (default: the whole Quran) or None if an
+    occurrence is across the end of the Quran (see `_find_wrapped`)
     """
-    assert not (ignore_taa_marboota and normalize_taat), (
-        'You can not `ignore_taa_marboota` and `normaize_taat` at the same time')
+    if aya_range is None:
+        return index.find(normalized_text)
+    start_idx, num_ayat = aya_range
+    assert num_ayat <= index.num_ayat
+    text_start = index.aya_starts[start_idx]
+    if start_idx + num_ayat <= index.num_ayat:
+        return index.find(
+            normalized_text, text_start, index.aya_starts[start_idx + num_ayat])
+    return _find_wrapped(
+        normalized_text,
+        index,
+        text_start,
+        index.aya_starts[start_idx + num_ayat - index.num_ayat],
+    )
+
 
-    norm_text = text
+def _find_wrapped(
+    normalized_text: str, index, text_start: int, text_end: int,
+) -> list[tuple[int, int]] | None:
+    """
+    the (start, end) spans of the non overlapping occurrences of
+    `normalized_text` in index.text[text_start:] + index.text[:text_end]
+    (a window wrapping around the end of the Quran) as spans of `index.text`
+    or None if an occurrence is across the end
+    """
+    window_text = index.text[text_start:] + index.text[:text_end]
+    tail_len = len(index.text) - text_start
+    spans = []
+    start = window_text.find(normalized_text)
+    while start != -1:
+        end = start + len(normalized_text)
+        if start < tail_len < end:
+            return None
+        if start < tail_len:
+            spans.append((text_start + start, text_start + end))
+        else:
+            spans.append((start - tail_len, end - tail_len))
+        start = window_text.find(normalized_text, end)
+    return spans
+
+
+def _get_index_search_item(
+    index,
+    start: int,
+    end: int,
+    has_istiaatha: bool,
+    corpus: QuranCorpus,
+) -> SearchItem | None:
+    """
+    Return the SearchItem of the characters span [start, end) of the
+    `SearchIndex` text (None if not on word boundaries)
+    """
+    match = _get_index_match(index, start, end)
+    if match is None:
+        return None
+    start_aya_idx, num_ayat, word_span, match = match
+    item = SearchItem(
+        start_aya=Aya.from_absolute(start_aya_idx, corpus=corpus),
+        num_ayat=num_ayat,
+        imlaey_word_span=word_span,
+        has_bismillah=index.include_bismillah,
+        has_istiaatha=has_istiaatha,
+        uthmani_script="",
+        _match=match,
+    )
+    item.uthmani_script = _get_uthmani_of_result_item(item, suffix=index.suffix)
+    return item
 
-    # TODO: Ingonre alef as hamza
 
-    if remove_spaces:
-        norm_text = re.sub(r"\s+", "", norm_text)
+def _get_index_match(
+    index, start: int, end: int
+) -> tuple[int, int, WordSpan, tuple] | None:
+    """
+    Return (absolute start aya index, number of ayat, imlaey word span,
+    match) of the characters span [start, end) of the `SearchIndex` text
+    (None if not on word boundaries) where match is `SearchItem._match`
+    """
+    span = index.get_words_span(start, end)
+    if span is None:
+        return None
+    start_aya_idx, start_word_idx, end_aya_idx, end_word_idx = span
+    aya_start = index.aya_starts[start_aya_idx]
+    return (
+        start_aya_idx,
+        end_aya_idx - start_aya_idx + 1,
+        WordSpan(start=start_word_idx, end=end_word_idx),
+        (start - aya_start, end - aya_start, index.suffix, index.normalize_kwargs),
+    )
 
-    if ignore_alef_maksoora:
-        norm_text = re.sub(alpha.imlaey.alef_maksoora,
-                           alpha.imlaey.alef, norm_text)
 
-    if ignore_hamazat:
-        norm_text = re.sub(f"[{alpha.imlaey.hamazat}]",
-                           alpha.imlaey.hamza, norm_text)
+def _iter_index_matches(
+    normalized_text: str, index, aya_range: tuple[int, int] = None,
+) -> Iterator[tuple[int, int, WordSpan, tuple]] | None:
+    """
+    the `_get_index_match` of every occurrence of `normalized_text` in
+    `index` within `aya_range` (see `_search_index`) or None if an
+    occurrence is across the end of the Quran
+    """
+    spans = _find_in_range(normalized_text, index, aya_range)
+    if spans is None:
+        return None
+    matches = (_get_index_match(index, start, end) for start, end in spans)
+    return (match for match in matches if match is not None)
 
-    if ignore_taa_marboota:
-        norm_text = re.sub(
-            f"[{alpha.imlaey.taa_marboota}]",
-            alpha.imlaey.haa,
-            norm_text,
-        )
 
-    if normalize_taat:
-        norm_text = re.sub(
-            f"[{alpha.imlaey.taa_marboota}]",
-            alpha.imlaey.taa_mabsoota,
-            norm_text,
+def _iter_window_matches(
+    normalized_text: str,
+    loop_aya: Aya,
+    window: int,
+    include_bismillah: bool,
+    suffix: str,
+    normalize_kwargs: dict,
+) -> Iterator[tuple[int, int, WordSpan, tuple]]:
+    """
+    yield (absolute start aya index, number of ayat, imlaey word span, match)
+    of the matches of the `normalized_text` regex in the window of `window`
+    + 1 ayat starting from `loop_aya` where match is `SearchItem._match`
+    """
+    aya_imlaey_words, aya_imlaey_str, aya_starts = _get_imlaey_words_and_str(
+        start_aya=loop_aya,
+        window=window,
+        suffix=suffix,
+        include_bismillah=include_bismillah,
+        **normalize_kwargs,
+    )
+    num_ayat = loop_aya.corpus.num_ayat
+    for re_search in re.finditer(normalized_text, aya_imlaey_str):
+        span = _get_words_span(
+            start=re_search.span()[0],
+            end=re_search.span()[1],
+            words_list=aya_imlaey_words,
         )
+        if span is not None:
+            start_vertex, end_vertex = span
+            aya_start = aya_starts[start_vertex.aya_idx]
+            yield (
+                (loop_aya.absolute_idx + start_vertex.aya_idx) % num_ayat,
+                end_vertex.aya_idx - start_vertex.aya_idx + 1,
+                WordSpan(start=start_vertex.word_idx, end=end_vertex.word_idx),
+                (
+                    re_search.span()[0] - aya_start,
+                    re_search.span()[1] - aya_start,
+                    suffix,
+                    normalize_kwargs,
+                ),
+            )
 
-    if remove_small_alef:
-        norm_text = re.sub(alpha.imlaey.small_alef, "", norm_text)
-
-    if remove_tashkeel:
-        norm_text = re.sub(f"[{alpha.imlaey.tashkeel}]", "", norm_text)
 
-    return norm_text
+def _strip_istiaatha(
+    normalized_text: str, istiaatha_imlaey_str: str
+) -> tuple[str, bool]:
+    """
+    Return (the text after istiaatha, has_istiaatha)
+    NOTE: Assuming Istiaatha is at the first only
+    """
+    re_span = re.search(istiaatha_imlaey_str, normalized_text)
+    if re_span:
+        return normalized_text[re_span.span()[1]:], True
+    return normalized_text, False
 
 
 def _get_words_span(
@@ -981,35 +1919,49 @@ def _get_imlaey_words_and_str(
     include_bismillah=False,
     suffix=" ",
     **kwargs,
-) -> tuple[list[list[str]], str]:
+) -> tuple[list[list[str]], str, list[int]]:
     """
-    return (words, scipt): The imlaey script either of multiple ayat
+    return (words, scipt, aya_starts): The imlaey script either of multiple ayat
         words: 2D list dimention(0) is of length of number of ayat, dimention(1)
             is the aya words
         script: the joined script of ayat without spaces
+        aya_starts: the index of the start of every aya in the script
     """
     aya_imlaey_words: list[list[str]] = []
-    aya_imlaey_str = ""
-    for aya in start_aya.get_ayat_after(num_ayat=window + 1):
-        aya_words = []
-
+    aya_imlaey_strs: list[str] = []
+    aya_starts: list[int] = []
+    aya_start = 0
+    # normalized once per normalization profile by the corpus
+    normalized_ayat = start_aya.corpus.get_normalized_imlaey_range(
+        start_aya.absolute_idx, window + 1, suffix=suffix, **kwargs)
+    for words, words_str, bismillah_words, bismillah_str in normalized_ayat:
         # Including Bismillah at The start of sura except for:
         # Alfatiha [is an Aya] and Al tuoba
-        if include_bismillah and (aya.get().bismillah_imlaey is not None):
-            aya_words += normalize_aya(
-                aya.get().bismillah_imlaey,
-                remove_spaces=False,
-                **kwargs,
-            ).split(suffix)
-
-        # Aya Words
-        aya_words += normalize_aya(
-            aya.get().imlaey,
-            remove_spaces=False,
-            **kwargs,
-        ).split(suffix)
-        aya_imlaey_words.append(aya_words)
-
-        # imlaey String With spaces removed
-        aya_imlaey_str += re.sub(r"\s+", "", "".join(aya_words))
-    return aya_imlaey_words, aya_imlaey_str
+        if include_bismillah and (bismillah_words is not None):
+            aya_imlaey_words.append(list(bismillah_words + words))
+            aya_imlaey_strs.append(bismillah_str + words_str)
+        else:
+            aya_imlaey_words.append(list(words))
+            aya_imlaey_strs.append(words_str)
+        aya_starts.append(aya_start)
+        aya_start += len(aya_imlaey_strs[-1])
+
+    # imlaey String With spaces removed
+    return aya_imlaey_words, "".join(aya_imlaey_strs), aya_starts
+
+
+def _get_imlaey_offsets(imlaey: str, suffix: str, normalize_kwargs: dict) -> array:
+    """
+    return the index in `imlaey` of every character of its normalized script
+    without spaces (as in `_get_imlaey_words_and_str`)
+    """
+    norm_imlaey, offsets = normalize_aya(
+        imlaey, remove_spaces=False, return_offsets=True, **normalize_kwargs)
+    script_offsets = array('I')
+    word_start = 0
+    for word in norm_imlaey.split(suffix):
+        for char_idx, char in enumerate(word):
+            if not char.isspace():
+                script_offsets.append(offsets[word_start + char_idx])
+        word_start += len(word) + len(suffix)
+    return script_offsets
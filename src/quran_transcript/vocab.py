@@ -0,0 +1,76 @@
+from typing import Iterable
+from array import array
+
+
+class Vocabulary(object):
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        Mapping every distinct word to an integer id (starting from 0) so
+        the Holy Quran is stored as compact `array('I')` of word ids and
+        words are compared, counted and matched as integers.
+
+        Args:
+            words (Iterable[str]): initial words to add
+        """
+        self.word2id: dict[str, int] = {}
+        self.id2word: list[str] = []
+        # number of occurrences of every word id (see `encode`)
+        self.counts = array('I')
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.id2word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word2id
+
+    def __getitem__(self, word_id: int) -> str:
+        return self.id2word[word_id]
+
+    def add(self, word: str) -> int:
+        """
+        Return the id of the `word` adding it to the vocabulary if new
+        """
+        word_id = self.word2id.get(word)
+        if word_id is None:
+            word_id = len(self.id2word)
+            self.word2id[word] = word_id
+            # interning to share a single str object for every occurrence
+            self.id2word.append(word)
+            self.counts.append(0)
+        return word_id
+
+    def get_id(self, word: str, default: int = None) -> int | None:
+        return self.word2id.get(word, default)
+
+    def encode(self, words: Iterable[str], add=False) -> array:
+        """
+        Return the word ids of `words`
+        Args:
+            add (bool): add new words to the vocabulary and count every word
+                occurrence. If False: every word has to be in the
+                vocabulary (raises KeyError)
+        """
+        if not add:
+            return array('I', map(self.word2id.__getitem__, words))
+        word2id = self.word2id
+        counts = self.counts
+        ids = array('I')
+        for word in words:
+            word_id = word2id.get(word)
+            if word_id is None:
+                word_id = self.add(word)
+            counts[word_id] += 1
+            ids.append(word_id)
+        return ids
+
+    def decode(self, word_ids: Iterable[int]) -> tuple[str, ...]:
+        return tuple(map(self.id2word.__getitem__, word_ids))
+
+    def get_count(self, word: str) -> int:
+        """
+        Return the number of occurrences of `word` in the encoded words
+        """
+        word_id = self.word2id.get(word)
+        return 0 if word_id is None else self.counts[word_id]
@@ -0,0 +1,319 @@
+from array import array
+
+from quran_transcript import alphabet as alpha
+from quran_transcript.corpus import QuranCorpus, get_corpus
+from quran_transcript.normalize import normalize_aya
+from quran_transcript.search_index import SearchIndex
+from quran_transcript.utils import SearchItem, _get_index_search_item
+
+
+class WordIndex(object):
+    def __init__(
+        self,
+        corpus: QuranCorpus,
+        suffix=" ",
+        **kwargs,
+    ):
+        """
+        Inverted index of the normalized imlaey words of the whole Holy
+        Quran: every word (and every two consecutive words) is mapped to
+        its positions in the global word sequence so a run of consecutive
+        words is found by checking the positions of its rarest bigram only.
+
+        The global sequence holds the bismillah words of every sura too as
+        optional positions: a run either skips them (the ayat are
+        consecutive) or includes them, so a single lookup finds the matches
+        of both `search` passes (without and with bismillah).
+
+        Attributes:
+            plain_index (SearchIndex): the index without bismillah
+            full_index (SearchIndex): the index with bismillah. Positions in
+                the global sequence are the word indices of `full_index`
+            vocab (Vocabulary): the normalized imlaey words of the corpus
+                (`QuranCorpus.get_normalized_vocab` shared with the corpus)
+            word_ids (array): the word id of every position
+            is_bismillah (bytearray): 1 for the positions of bismillah words
+            plain_positions (array): the position in `plain_index` of every
+                position (the next non bismillah word for bismillah words)
+            postings (dict[int, array]): {word id: positions}
+            bigram_postings (dict[int, array]): {bigram id: positions of the
+                first word} for the bigrams of both sequences (with and
+                without bismillah). bigram id = first id * len(vocab) + second id
+
+        Args:
+            corpus (QuranCorpus): the corpus to index
+            suffix (str): the separator of the words
+            **kwargs: the flags of `normalize_aya` (except `remove_spaces`)
+        """
+        self.suffix = suffix
+        self.normalize_kwargs = kwargs
+        self.plain_index: SearchIndex = corpus.get_search_index(
+            include_bismillah=False, suffix=suffix, **kwargs)
+        self.full_index: SearchIndex = corpus.get_search_index(
+            include_bismillah=True, suffix=suffix, **kwargs)
+
+        assert suffix == corpus.join_prefix, (
+            f'The words of the corpus are split by {corpus.join_prefix!r}'
+            + f' got suffix={suffix!r}')
+        full = self.full_index
+        num_words = len(full.word_starts)
+        self.vocab = corpus.get_normalized_vocab(**kwargs)
+        # the positions of `full_index`: bismillah words then the aya words
+        self.word_ids = array('I')
+        for absolute_idx in range(corpus.num_ayat):
+            for field in ['bismillah_imlaey', 'imlaey']:
+                word_ids = corpus.get_normalized_word_ids(
+                    field, absolute_idx, **kwargs)
+                if word_ids is not None:
+                    self.word_ids.extend(word_ids)
+        assert len(self.word_ids) == num_words
+
+        self.is_bismillah = bytearray(num_words)
+        self.plain_positions = array('I', bytes(4 * num_words))
+        plain_pos = 0
+        for aya_idx in range(full.num_ayat):
+            full_start = full.aya_word_starts[aya_idx]
+            full_end = full.aya_word_starts[aya_idx + 1]
+            plain_len = (self.plain_index.aya_word_starts[aya_idx + 1]
+                         - self.plain_index.aya_word_starts[aya_idx])
+            num_bismillah = full_end - full_start - plain_len
+            for pos in range(full_start, full_end):
+                if pos - full_start < num_bismillah:
+                    self.is_bismillah[pos] = 1
+                else:
+                    plain_pos += 1
+                self.plain_positions[pos] = plain_pos - (
+                    0 if self.is_bismillah[pos] else 1)
+        assert plain_pos == len(self.plain_index.word_starts)
+
+        postings: dict[int, list[int]] = {}
+        bigram_postings: dict[int, list[int]] = {}
+        vocab_size = len(self.vocab)
+        for pos, word_id in enumerate(self.word_ids):
+            postings.setdefault(word_id, []).append(pos)
+            bigrams = set()
+            next_pos = self._next(pos, plain=False)
+            if next_pos is not None:
+                bigrams.add(word_id * vocab_size + self.word_ids[next_pos])
+            if not self.is_bismillah[pos]:
+                next_pos = self._next(pos, plain=True)
+                if next_pos is not None:
+                    bigrams.add(word_id * vocab_size + self.word_ids[next_pos])
+            for bigram_id in bigrams:
+                bigram_postings.setdefault(bigram_id, []).append(pos)
+        self.postings = {
+            word_id: array('I', positions) for word_id, positions in postings.items()}
+        self.bigram_postings = {
+            bigram_id: array('I', positions)
+            for bigram_id, positions in bigram_postings.items()}
+        # the length of the longest word (see `split_text`)
+        self._max_word_len = max(map(len, self.vocab.id2word))
+
+    def _next(self, pos: int, plain: bool) -> int | None:
+        """
+        the next position (skipping bismillah words if `plain`)
+        """
+        pos += 1
+        if plain:
+            while pos < len(self.word_ids) and self.is_bismillah[pos]:
+                pos += 1
+        return pos if pos < len(self.word_ids) else None
+
+    def _prev(self, pos: int, plain: bool) -> int | None:
+        """
+        the previous position (skipping bismillah words if `plain`)
+        """
+        pos -= 1
+        if plain:
+            while pos >= 0 and self.is_bismillah[pos]:
+                pos -= 1
+        return pos if pos >= 0 else None
+
+    def _match_run(
+        self, word_ids: list[int], anchor: int, anchor_pos: int, plain: bool,
+    ) -> tuple[int, int] | None:
+        """
+        Return the (first, last) positions of the run of `word_ids` where
+        word_ids[anchor] is at `anchor_pos` or None
+        """
+        if plain and self.is_bismillah[anchor_pos]:
+            return None
+        pos = anchor_pos
+        for word_id in word_ids[anchor + 1:]:
+            pos = self._next(pos, plain=plain)
+            if pos is None or self.word_ids[pos] != word_id:
+                return None
+        last = pos
+        pos = anchor_pos
+        for word_id in reversed(word_ids[:anchor]):
+            pos = self._prev(pos, plain=plain)
+            if pos is None or self.word_ids[pos] != word_id:
+                return None
+        return pos, last
+
+    def split_text(self, text: str) -> tuple[list[str] | None, int]:
+        """
+        Split a normalized text without spaces into the words of the
+        vocabulary
+
+        Return:
+            (words, num_splits): the words of the first split (None if
+            there is no split) and the number of the ways to split `text`
+            (counted up to 2)
+        """
+        word2id = self.vocab.word2id
+        # num_splits[start]: the number of splits of text[start:] and
+        # next_start[start]: the end of the first word of its first split
+        num_splits = [0] * len(text) + [1]
+        next_start = [0] * len(text)
+        for start in range(len(text) - 1, -1, -1):
+            for end in range(start + 1, min(start + self._max_word_len, len(text)) + 1):
+                if num_splits[end] and text[start: end] in word2id:
+                    if not num_splits[start]:
+                        next_start[start] = end
+                    num_splits[start] = min(num_splits[start] + num_splits[end], 2)
+                    if num_splits[start] == 2:
+                        break
+        if not num_splits[0]:
+            return None, 0
+        words = []
+        start = 0
+        while start < len(text):
+            words.append(text[start: next_start[start]])
+            start = next_start[start]
+        return words, num_splits[0]
+
+    def find(self, words: list[str]) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """
+        Find the runs of consecutive `words` (normalized)
+
+        Return:
+            (plain_spans, full_spans): the non overlapping (start, end)
+            character spans in the text of `plain_index` (runs skipping
+            bismillah) and of `full_index` (runs including bismillah)
+        """
+        word_ids = [self.vocab.get_id(word) for word in words]
+        if not word_ids or None in word_ids:
+            return [], []
+
+        # the anchor: the rarest word or bigram of the query
+        if len(word_ids) == 1:
+            anchor = 0
+            positions = self.postings[word_ids[0]]
+        else:
+            vocab_size = len(self.vocab)
+            empty = array('I')
+            candidates = [
+                (self.bigram_postings.get(
+                    word_ids[idx] * vocab_size + word_ids[idx + 1], empty), idx)
+                for idx in range(len(word_ids) - 1)
+            ]
+            positions, anchor = min(candidates, key=lambda item: len(item[0]))
+
+        plain_runs = []
+        full_runs = []
+        for pos in positions:
+            for plain, runs in [(True, plain_runs), (False, full_runs)]:
+                run = self._match_run(word_ids, anchor, pos, plain=plain)
+                if run is not None:
+                    runs.append(run)
+
+        plain_spans = []
+        for first, last in sorted(plain_runs):
+            start, end = self.get_char_span(first, last, plain=True)
+            if not plain_spans or start >= plain_spans[-1][1]:
+                plain_spans.append((start, end))
+        full_spans = []
+        for first, last in sorted(full_runs):
+            start, end = self.get_char_span(first, last, plain=False)
+            if not full_spans or start >= full_spans[-1][1]:
+                full_spans.append((start, end))
+        return plain_spans, full_spans
+
+    def get_char_span(self, first: int, last: int, plain: bool) -> tuple[int, int]:
+        """
+        Return the (start, end) character span of the run of positions
+        [first, last] in the text of `plain_index` if `plain` else of
+        `full_index`
+        """
+        if plain:
+            return (self.plain_index.word_starts[self.plain_positions[first]],
+                    self.plain_index.word_ends[self.plain_positions[last]])
+        return self.full_index.word_starts[first], self.full_index.word_ends[last]
+
+
+def normalize_words(text: str, suffix=" ", **kwargs) -> list[str]:
+    """
+    Return the normalized words of `text` (as the words of `WordIndex`)
+    Args:
+        suffix (str): the separator of the words
+        the rest of **kwargs are from normalize_aya function
+    """
+    words = normalize_aya(text, remove_spaces=False, **kwargs).split(suffix)
+    words = [''.join(word.split()) for word in words]
+    return [word for word in words if word != '']
+
+
+def search_words(
+    text: str,
+    corpus: QuranCorpus = None,
+    suffix=" ",
+    **kwargs,
+) -> list[SearchItem]:
+    """searches the whole Holy Quran for the words of `text` using the
+    `WordIndex` of the corpus
+
+    Like `search(text, scope="quran")` but the query is matched word by
+    word: a result is a run of consecutive Quran words equal to the
+    normalized words of `text` (the words of the query have to be split as
+    the words of the Quran). Runs including bismillah are returned only if
+    there are no runs without it (as `search`)
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        corpus (QuranCorpus): the corpus to search in (default: the corpus
+            of the default Quran script)
+        suffix (str): the separator of the words
+        the rest of **kwargs are from normalize_aya function
+    """
+    if corpus is None:
+        corpus = get_corpus()
+    word_index = corpus.get_word_index(suffix=suffix, **kwargs)
+
+    words = normalize_words(text, suffix=suffix, **kwargs)
+    if not words:
+        return []
+
+    # removing istiaatha (and the words before it)
+    has_istiaatha = False
+    istiaatha_uthmani = alpha.istiaatha.uthmani
+    istiaatha_words = normalize_words(alpha.istiaatha.imlaey, suffix=suffix, **kwargs)
+    for idx in range(len(words) - len(istiaatha_words) + 1):
+        if words[idx: idx + len(istiaatha_words)] == istiaatha_words:
+            words = words[idx + len(istiaatha_words):]
+            has_istiaatha = True
+            break
+    if has_istiaatha and not words:
+        return [SearchItem(
+            start_aya=None,
+            num_ayat=None,
+            imlaey_word_span=None,
+            has_bismillah=None,
+            has_istiaatha=True,
+            uthmani_script=istiaatha_uthmani,
+        )]
+
+    plain_spans, full_spans = word_index.find(words)
+    if plain_spans:
+        index, spans = word_index.plain_index, plain_spans
+    else:
+        index, spans = word_index.full_index, full_spans
+    found = []
+    for start, end in spans:
+        item = _get_index_search_item(index, start, end, has_istiaatha, corpus)
+        if item is not None:
+            if has_istiaatha:
+                item.uthmani_script = (
+                    istiaatha_uthmani + suffix + item.uthmani_script)
+            found.append(item)
+    return found
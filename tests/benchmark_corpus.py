@@ -0,0 +1,144 @@
+import time
+import json
+import sys
+import tempfile
+from pathlib import Path
+from quran_transcript import Aya
+from quran_transcript.corpus import (
+    DEFAULT_QURAN_PATH, QuranCorpus)
+from quran_transcript.binary_corpus import (
+    compile_binary_corpus, MmapQuranCorpus)
+
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------
+    # Loading the Quran json script once
+    # -------------------------------------------------------------------
+    start_time = time.time()
+    with open(DEFAULT_QURAN_PATH, 'r', encoding='utf8') as f:
+        json.load(f)
+    json_time = time.time() - start_time
+    print(f'Single json.load: {json_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Constructing Aya objects (shared corpus)
+    # -------------------------------------------------------------------
+    # first Aya loads the corpus
+    start_time = time.time()
+    Aya(1, 1)
+    print(f'First Aya (loads the corpus): {(time.time() - start_time) * 1000:.2f} ms')
+
+    num_ayat = 10_000
+    start_time = time.time()
+    for idx in range(num_ayat):
+        Aya(114, idx % 6 + 1)
+    total_time = time.time() - start_time
+    print(f'{num_ayat} Aya objects: {total_time * 1000:.2f} ms '
+          f'({total_time / num_ayat * 1e6:.2f} us per Aya)')
+    print(f'Before the shared corpus: ~{json_time * num_ayat:.0f} s '
+          '(a json.load per Aya)')
+
+    # -------------------------------------------------------------------
+    # Aya.get() throughput (cached AyaFormat records)
+    # -------------------------------------------------------------------
+    ayat = list(Aya(1, 1).get_ayat_after())
+    start_time = time.time()
+    for aya in ayat:
+        aya.get()
+    print(f'First get() of all ayat: {(time.time() - start_time) * 1000:.2f} ms')
+
+    num_gets = 100_000
+    start_time = time.time()
+    for idx in range(num_gets):
+        ayat[idx % len(ayat)].get()
+    total_time = time.time() - start_time
+    print(f'{num_gets} cached get(): {total_time * 1000:.2f} ms '
+          f'({num_gets / total_time:.0f} get/s)')
+
+    # -------------------------------------------------------------------
+    # Integer coded Quran (word ids) vs words
+    # -------------------------------------------------------------------
+    corpus = Aya(1, 1).corpus
+    start_time = time.time()
+    vocab = corpus.get_vocab('imlaey')
+    print(f'Building vocabularies: {(time.time() - start_time) * 1000:.2f} ms')
+    words_size = 0
+    ids_size = 0
+    for absolute_idx in range(corpus.num_ayat):
+        # the words split from the aya text (a str object per occurrence)
+        words = tuple(corpus.get_aya(
+            *corpus.get_sura_aya_idx(absolute_idx))[corpus.imlaey_key].split(' '))
+        words_size += sys.getsizeof(words) + sum(sys.getsizeof(w) for w in words)
+        ids_size += sys.getsizeof(corpus.get_word_ids('imlaey', absolute_idx))
+    ids_size += sum(sys.getsizeof(word) for word in vocab.id2word)
+    print(f'Imlaey words: {words_size / 1e6:.2f} MB, '
+          f'word ids + vocabulary ({len(vocab)} words): {ids_size / 1e6:.2f} MB')
+
+    # -------------------------------------------------------------------
+    # Stepping ayat (absolute aya index)
+    # -------------------------------------------------------------------
+    aya = Aya(1, 1)
+    start_time = time.time()
+    for step in range(-3000, 3000):
+        aya.step(step)
+    total_time = time.time() - start_time
+    print(f'6000 steps of length [-3000, 3000): {total_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Binary (mmap) corpus vs json corpus
+    # -------------------------------------------------------------------
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bin_path = Path(tmp_dir) / 'quran.bin'
+        start_time = time.time()
+        compile_binary_corpus(
+            QuranCorpus.from_file(DEFAULT_QURAN_PATH), bin_path)
+        print(f'Compiling binary corpus: {(time.time() - start_time) * 1000:.2f} ms')
+
+        start_time = time.time()
+        QuranCorpus.from_file(DEFAULT_QURAN_PATH)
+        print(f'Loading json corpus: {(time.time() - start_time) * 1000:.2f} ms')
+
+        start_time = time.time()
+        corpus = MmapQuranCorpus(bin_path)
+        print(f'Loading binary corpus: {(time.time() - start_time) * 1000:.2f} ms')
+
+        start_time = time.time()
+        for aya in Aya(1, 1, corpus=corpus).get_ayat_after():
+            aya.get()
+        print(f'Reading all ayat from the binary corpus: '
+              f'{(time.time() - start_time) * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Saving a rasm map: journal append vs full file rewrite
+    # -------------------------------------------------------------------
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        quran_path = Path(tmp_dir) / 'quran.json'
+        quran_path.write_bytes(Path(DEFAULT_QURAN_PATH).read_bytes())
+        corpus = QuranCorpus.from_file(quran_path)
+        rasm_map = [{'uthmani': 'a', 'imlaey': 'a'}]
+
+        num_saves = 20
+        start_time = time.time()
+        for idx in range(num_saves):
+            corpus.set_aya_maps(0, 0, rasm_map=rasm_map)
+            corpus.save()
+        total_time = time.time() - start_time
+        print(f'Full rewrite save: {total_time / num_saves * 1000:.2f} ms per save')
+
+        corpus.enable_journal()
+        num_saves = 1000
+        start_time = time.time()
+        for idx in range(num_saves):
+            corpus.set_aya_maps(0, idx % 7, rasm_map=rasm_map)
+            corpus.save()
+        total_time = time.time() - start_time
+        print(f'Journal save: {total_time / num_saves * 1000:.3f} ms per save')
+
+        start_time = time.time()
+        QuranCorpus.from_file(quran_path)
+        print(f'Loading with {num_saves} journal records: '
+              f'{(time.time() - start_time) * 1000:.2f} ms')
+
+        start_time = time.time()
+        corpus.compact()
+        print(f'Compacting the journal: {(time.time() - start_time) * 1000:.2f} ms')
@@ -0,0 +1,125 @@
+import time
+import re
+from quran_transcript import alphabet as alpha
+from quran_transcript import Aya, search
+from quran_transcript.normalize import normalize_aya, normalize_many
+
+
+def normalize_aya_re(
+    text: str,
+    remove_spaces=True,
+    ignore_hamazat=False,
+    ignore_alef_maksoora=True,
+    ignore_taa_marboota=False,
+    normalize_taat=False,
+    remove_small_alef=True,
+    remove_tashkeel=False,
+) -> str:
+    """
+    The previous `normalize_aya` (a `re.sub` pass per flag) for comparison
+    """
+    norm_text = text
+    if remove_spaces:
+        norm_text = re.sub(r"\s+", "", norm_text)
+    if ignore_alef_maksoora:
+        norm_text = re.sub(alpha.imlaey.alef_maksoora,
+                           alpha.imlaey.alef, norm_text)
+    if ignore_hamazat:
+        norm_text = re.sub(f"[{alpha.imlaey.hamazat}]",
+                           alpha.imlaey.hamza, norm_text)
+    if ignore_taa_marboota:
+        norm_text = re.sub(
+            f"[{alpha.imlaey.taa_marboota}]", alpha.imlaey.haa, norm_text)
+    if normalize_taat:
+        norm_text = re.sub(
+            f"[{alpha.imlaey.taa_marboota}]", alpha.imlaey.taa_mabsoota, norm_text)
+    if remove_small_alef:
+        norm_text = re.sub(alpha.imlaey.small_alef, "", norm_text)
+    if remove_tashkeel:
+        norm_text = re.sub(f"[{alpha.imlaey.tashkeel}]", "", norm_text)
+    return norm_text
+
+
+if __name__ == "__main__":
+    texts = [aya.get().imlaey for aya in Aya(1, 1).get_ayat_after()]
+    profiles = {
+        'default': {},
+        'all flags': dict(
+            ignore_hamazat=True,
+            ignore_taa_marboota=True,
+            remove_tashkeel=True,
+        ),
+    }
+
+    # -------------------------------------------------------------------
+    # Normalizing the full corpus: re.sub passes vs compiled table
+    # -------------------------------------------------------------------
+    for name, kwargs in profiles.items():
+        for text in texts:
+            assert normalize_aya(text, **kwargs) == normalize_aya_re(text, **kwargs)
+
+        start_time = time.time()
+        for text in texts:
+            normalize_aya_re(text, **kwargs)
+        re_time = time.time() - start_time
+
+        start_time = time.time()
+        for text in texts:
+            normalize_aya(text, **kwargs)
+        compiled_time = time.time() - start_time
+        print(f'Normalizing {len(texts)} ayat ({name}): '
+              f're.sub: {re_time * 1000:.2f} ms, '
+              f'compiled: {compiled_time * 1000:.2f} ms '
+              f'(x{re_time / compiled_time:.1f})')
+
+    # -------------------------------------------------------------------
+    # search (normalizes every aya of the window)
+    # -------------------------------------------------------------------
+    num_queries = 200
+    start_time = time.time()
+    for idx in range(num_queries):
+        search('الحمد لله رب العالمين', start_aya=Aya(1, 1), window=50)
+    total_time = time.time() - start_time
+    print(f'{num_queries} searches (window=50): {total_time * 1000:.2f} ms '
+          f'({total_time / num_queries * 1000:.2f} ms per search)')
+
+    # -------------------------------------------------------------------
+    # normalize_many vs a normalize_aya loop
+    # -------------------------------------------------------------------
+    for num_texts in [1_000, 100_000, 1_000_000]:
+        many_texts = [texts[idx % len(texts)] for idx in range(num_texts)]
+
+        start_time = time.time()
+        loop_out = [normalize_aya(text) for text in many_texts]
+        loop_time = time.time() - start_time
+
+        start_time = time.time()
+        many_out = list(normalize_many(many_texts, parallel_threshold=None))
+        many_time = time.time() - start_time
+        assert many_out == loop_out
+
+        start_time = time.time()
+        pool_out = list(normalize_many(
+            (text for text in many_texts), parallel_threshold=0))
+        pool_time = time.time() - start_time
+        assert pool_out == loop_out
+
+        print(f'Normalizing {num_texts} texts: loop: {loop_time * 1000:.2f} ms, '
+              f'normalize_many: {many_time * 1000:.2f} ms, '
+              f'normalize_many (process pool): {pool_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # search: first query vs repeated queries (normalized corpus cache)
+    # -------------------------------------------------------------------
+    corpus = Aya(1, 1).corpus
+    start_time = time.time()
+    search('قل هو الله احد', start_aya=Aya(1, 1), window=corpus.num_ayat,
+           remove_tashkeel=True)
+    print(f'First search over the whole Quran: '
+          f'{(time.time() - start_time) * 1000:.2f} ms')
+    start_time = time.time()
+    search('قل هو الله احد', start_aya=Aya(1, 1), window=corpus.num_ayat,
+           remove_tashkeel=True)
+    print(f'Repeated search over the whole Quran: '
+          f'{(time.time() - start_time) * 1000:.2f} ms')
+    print(f'Normalized corpus cache: {corpus.normalized_cache_info()}')
@@ -0,0 +1,246 @@
+import time
+import tempfile
+import random
+from quran_transcript import (
+    Aya, search, search_many, iter_search, normalize_aya, fuzzy_search)
+from quran_transcript.suffix_array import SuffixArray
+from quran_transcript.word_index import search_words
+from quran_transcript.streaming import StreamingSearcher
+
+
+QUERIES = [
+    ('الحمد لله', dict(remove_tashkeel=True)),
+    ('فبأي آلاء ربكما تكذبان', dict(remove_tashkeel=True)),
+    ('قل أعوذ برب الناس ملك الناس', dict(remove_tashkeel=True)),
+    ('إياك نعبد وإياك نستعين', dict(remove_tashkeel=True)),
+]
+
+
+if __name__ == "__main__":
+    corpus = Aya(1, 1).corpus
+    # the window covering the whole Quran in order
+    middle_aya = Aya.from_absolute(corpus.num_ayat // 2)
+    window = corpus.num_ayat - 1
+
+    # -------------------------------------------------------------------
+    # Building the whole Quran search index
+    # -------------------------------------------------------------------
+    start_time = time.time()
+    for include_bismillah in [False, True]:
+        corpus.get_search_index(
+            include_bismillah=include_bismillah, remove_tashkeel=True)
+    print(f'Building search indices: {(time.time() - start_time) * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Whole Quran: window scan vs search index
+    # -------------------------------------------------------------------
+    for text, kwargs in QUERIES:
+        start_time = time.time()
+        window_results = search(
+            text, start_aya=middle_aya, window=window, **kwargs)
+        window_time = time.time() - start_time
+
+        start_time = time.time()
+        index_results = search(text, scope='quran', **kwargs)
+        index_time = time.time() - start_time
+
+        assert [str(r) for r in window_results] == [str(r) for r in index_results]
+        print(f'{text} ({len(index_results)} results): '
+              f'window scan: {window_time * 1000:.2f} ms, '
+              f'scope="quran": {index_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Suffix array: build, load and query latency vs scanning the text
+    # -------------------------------------------------------------------
+    index = corpus.get_search_index(remove_tashkeel=True)
+    start_time = time.time()
+    suffix_array = SuffixArray.build(index.text)
+    print(f'Building the suffix array of {len(index.text)} chars: '
+          f'{(time.time() - start_time) * 1000:.2f} ms')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = f'{tmp_dir}/quran.suffix-array'
+        suffix_array.save(path)
+        start_time = time.time()
+        SuffixArray.load(index.text, path)
+        print(f'Loading the suffix array: {(time.time() - start_time) * 1000:.2f} ms')
+
+    num_queries = 1000
+    for text, kwargs in QUERIES + [('من', dict(remove_tashkeel=True))]:
+        normalized_text = normalize_aya(text, **kwargs)
+        start_time = time.time()
+        for _ in range(num_queries):
+            scan_spans = list(index.find(normalized_text))
+        scan_time = (time.time() - start_time) / num_queries
+
+        start_time = time.time()
+        for _ in range(num_queries):
+            suffix_array_spans = suffix_array.find(normalized_text)
+        suffix_array_time = (time.time() - start_time) / num_queries
+        assert scan_spans == suffix_array_spans
+        print(f'{text} ({len(scan_spans)} occurrences): '
+              f'scan: {scan_time * 1e6:.1f} us, '
+              f'suffix array: {suffix_array_time * 1e6:.1f} us')
+
+    # -------------------------------------------------------------------
+    # Word index: build and query latency vs scope="quran"
+    # -------------------------------------------------------------------
+    start_time = time.time()
+    corpus.get_word_index(remove_tashkeel=True)
+    print(f'Building the word index: {(time.time() - start_time) * 1000:.2f} ms')
+
+    num_queries = 100
+    for text, kwargs in QUERIES + [('من', dict(remove_tashkeel=True))]:
+        start_time = time.time()
+        for _ in range(num_queries):
+            index_results = search(text, scope='quran', **kwargs)
+        index_time = (time.time() - start_time) / num_queries
+
+        start_time = time.time()
+        for _ in range(num_queries):
+            word_results = search_words(text, **kwargs)
+        word_time = (time.time() - start_time) / num_queries
+
+        # word aligned matches are a subset of the literal matches
+        assert set(str(r) for r in word_results) <= set(str(r) for r in index_results)
+        print(f'{text} ({len(word_results)} results): '
+              f'scope="quran": {index_time * 1000:.2f} ms, '
+              f'word index: {word_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Fuzzy search: query latency by the maximum edit distance
+    # -------------------------------------------------------------------
+    num_queries = 20
+    for text, kwargs in QUERIES:
+        for max_edits in [0, 1, 2, 3]:
+            start_time = time.time()
+            for _ in range(num_queries):
+                fuzzy_results = fuzzy_search(text, max_edits=max_edits, **kwargs)
+            fuzzy_time = (time.time() - start_time) / num_queries
+            print(f'{text} max_edits={max_edits} ({len(fuzzy_results)} results): '
+                  f'{fuzzy_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Batch search: a loop over `search` vs `search_many`
+    # -------------------------------------------------------------------
+    random.seed(0)
+    texts = []
+    start_ayat = []
+    while len(texts) < 2000:
+        aya_idx = random.randrange(corpus.num_ayat)
+        words = Aya.from_absolute(aya_idx).get().imlaey.split()
+        start = random.randrange(len(words))
+        end = random.randrange(start, min(len(words), start + 8)) + 1
+        start_aya = Aya.from_absolute(
+            (aya_idx + random.randint(-1, 1)) % corpus.num_ayat)
+        try:
+            search(' '.join(words[start: end]), start_aya=start_aya, window=4,
+                   remove_tashkeel=True)
+        except Exception:
+            # a part of an uthmani word
+            continue
+        texts.append(' '.join(words[start: end]))
+        start_ayat.append(start_aya)
+
+    start_time = time.time()
+    loop_results = [
+        search(text, start_aya=start_aya, window=4, remove_tashkeel=True)
+        for text, start_aya in zip(texts, start_ayat)
+    ]
+    loop_time = time.time() - start_time
+    for max_workers in [1, None]:
+        start_time = time.time()
+        batch_results = search_many(
+            texts, start_ayat=start_ayat, window=4, parallel_threshold=500,
+            max_workers=max_workers, remove_tashkeel=True)
+        batch_time = time.time() - start_time
+        assert ([[str(r) for r in results] for results in loop_results]
+                == [[str(r) for r in results] for results in batch_results])
+        print(f'{len(texts)} texts: loop over search: {loop_time * 1000:.2f} ms, '
+              f'search_many(max_workers={max_workers}): {batch_time * 1000:.2f} ms '
+              f'({loop_time / batch_time:.1f}x)')
+
+    # -------------------------------------------------------------------
+    # Live recitation: feeding a word at a time vs searching the prefix
+    # -------------------------------------------------------------------
+    recitation = []
+    for aya in Aya(2, 1).get_ayat_after(num_ayat=10):
+        recitation += aya.get().imlaey.split()
+    searcher = StreamingSearcher(remove_tashkeel=True)
+    start_time = time.time()
+    for word in recitation:
+        searcher.feed(word)
+        searcher.get_results()
+    stream_time = time.time() - start_time
+
+    start_time = time.time()
+    for idx in range(len(recitation)):
+        search_words(' '.join(recitation[: idx + 1]), remove_tashkeel=True)
+    prefix_time = time.time() - start_time
+    print(f'{len(recitation)} recited words: '
+          f'search_words of every prefix: {prefix_time * 1000:.2f} ms, '
+          f'StreamingSearcher: {stream_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Adaptive window: doubling around start_aya vs the whole Quran window
+    # -------------------------------------------------------------------
+    for text, start_aya in [
+        ('الحمد لله رب العالمين', Aya(1, 3)),
+        ('ولقد يسرنا القرآن للذكر', Aya(54, 10)),
+        ('قل هو الله أحد', Aya(100, 1)),
+        ('الم ذلك الكتاب لا ريب فيه', Aya(30, 1)),
+    ]:
+        start_time = time.time()
+        adaptive_results = search(
+            text, start_aya=start_aya, min_results=1, remove_tashkeel=True)
+        adaptive_time = time.time() - start_time
+
+        start_time = time.time()
+        window_results = search(
+            text, start_aya=start_aya, window=corpus.num_ayat - 1,
+            remove_tashkeel=True)
+        window_time = time.time() - start_time
+        print(f'{text} ({len(adaptive_results)}/{len(window_results)} results): '
+              f'whole window: {window_time * 1000:.2f} ms, '
+              f'min_results=1: {adaptive_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Top-k by proximity vs every result
+    # -------------------------------------------------------------------
+    for text in ['من', 'الله', 'الحمد لله']:
+        start_time = time.time()
+        all_results = search(
+            text, start_aya=middle_aya, scope='quran', remove_tashkeel=True)
+        all_time = time.time() - start_time
+
+        start_time = time.time()
+        top_results = search(
+            text, start_aya=middle_aya, scope='quran', top_k=5,
+            remove_tashkeel=True)
+        top_time = time.time() - start_time
+        print(f'{text} ({len(all_results)} results): '
+              f'all: {all_time * 1000:.2f} ms, top_k=5: {top_time * 1000:.2f} ms')
+
+    # -------------------------------------------------------------------
+    # Lazy search: the first item and the positions only vs `search`
+    # -------------------------------------------------------------------
+    for text in ['من', 'الله', 'الحمد لله']:
+        start_time = time.time()
+        all_results = search(text, scope='quran', remove_tashkeel=True)
+        all_time = time.time() - start_time
+
+        start_time = time.time()
+        next(iter_search(text, scope='quran', remove_tashkeel=True))
+        first_time = time.time() - start_time
+
+        start_time = time.time()
+        positions = [
+            (item.start_aya_idx, item.imlaey_word_span)
+            for item in iter_search(text, scope='quran', remove_tashkeel=True)]
+        positions_time = time.time() - start_time
+        assert positions == [
+            (item.start_aya.absolute_idx, item.imlaey_word_span)
+            for item in all_results]
+        print(f'{text} ({len(all_results)} results): '
+              f'search: {all_time * 1000:.2f} ms, '
+              f'iter_search first item: {first_time * 1000:.2f} ms, '
+              f'iter_search positions: {positions_time * 1000:.2f} ms')
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+import os
+
+# cumulative import time budget of `import quran_transcript` in micro seconds
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+def get_import_time(module='quran_transcript') -> int:
+    """
+    Return the cumulative import time of `module` in micro seconds using
+    `python -X importtime`
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env, check=True)
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise ValueError(f'{module} not found in importtime output')
+
+
+def test_import_time_budget():
+    import_time = min(get_import_time() for _ in range(3))
+    assert import_time < IMPORT_TIME_BUDGET_US, (
+        f'import quran_transcript took {import_time / 1000:.1f} ms '
+        + f'budget={IMPORT_TIME_BUDGET_US / 1000:.1f} ms')
+
+
+def test_import_loads_no_quran_files():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    code = (
+        'import quran_transcript\n'
+        'from quran_transcript import corpus, alphabet\n'
+        'assert corpus._CORPORA == {}, "Quran corpus loaded at import"\n'
+        'assert "imlaey" not in vars(alphabet), "alphabet loaded at import"\n'
+    )
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+
+if __name__ == "__main__":
+    import_time = get_import_time()
+    print(f'import quran_transcript: {import_time / 1000:.2f} ms '
+          f'(budget={IMPORT_TIME_BUDGET_US / 1000:.1f} ms)')
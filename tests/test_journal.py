@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+from quran_transcript.corpus import DEFAULT_QURAN_PATH, QuranCorpus
+from quran_transcript.persistence import PersistenceWorker
+
+RASM_MAP = [{'uthmani': 'a', 'imlaey': 'a'}]
+NEW_RASM_MAP = [{'uthmani': 'b', 'imlaey': 'b'}]
+
+
+class FailingSaveCorpus(QuranCorpus):
+    """
+    a corpus whose `save` fails `num_failures` times (ex: a full disk)
+    """
+    num_failures = 1
+
+    def save(self, *args, **kwargs):
+        if self.num_failures > 0:
+            self.num_failures -= 1
+            raise OSError('No space left on device')
+        return super().save(*args, **kwargs)
+
+
+def copy_quran_script(tmp_dir: str | Path) -> Path:
+    quran_path = Path(tmp_dir) / 'quran.json'
+    quran_path.write_bytes(Path(DEFAULT_QURAN_PATH).read_bytes())
+    return quran_path
+
+
+def test_torn_record_is_skipped(tmp_path):
+    quran_path = copy_quran_script(tmp_path)
+    corpus = QuranCorpus.from_file(quran_path)
+    corpus.enable_journal()
+    corpus.set_aya_maps(0, 0, rasm_map=RASM_MAP)
+    corpus.set_aya_maps(0, 1, rasm_map=RASM_MAP)
+
+    # a crash while appending the record of the third aya
+    with open(corpus.journal_path, 'a', encoding='utf8') as f:
+        f.write('{"sura_idx":0,"aya_idx":2,"rasm_map":[{"uth')
+
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 0)[loaded.map_key] == RASM_MAP
+    assert loaded.get_aya(0, 1)[loaded.map_key] == RASM_MAP
+    assert loaded.get_aya(0, 2).get(loaded.map_key) != RASM_MAP
+
+    # a new record after the torn one starts on its own line
+    loaded.enable_journal()
+    loaded.set_aya_maps(0, 3, rasm_map=RASM_MAP)
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 3)[loaded.map_key] == RASM_MAP
+
+
+def test_compacting_journal_recovery(tmp_path):
+    quran_path = copy_quran_script(tmp_path)
+    corpus = QuranCorpus.from_file(quran_path)
+    corpus.enable_journal()
+    corpus.set_aya_maps(0, 0, rasm_map=RASM_MAP)
+    corpus.set_aya_maps(0, 1, rasm_map=RASM_MAP)
+
+    # a crash while compacting: the journal was renamed but the main file
+    # was not written and a newer record went to a new journal
+    journal_path = corpus.journal_path
+    compacting_path = Path(f'{journal_path}.compacting')
+    journal_path.rename(compacting_path)
+    record = {
+        'sura_idx': 0,
+        'aya_idx': 1,
+        'rasm_map': NEW_RASM_MAP,
+        'bismillah_map': None,
+    }
+    journal_path.write_text(json.dumps(record) + '\n', encoding='utf8')
+
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 0)[loaded.map_key] == RASM_MAP
+    # the new journal is replayed after the compacting one
+    assert loaded.get_aya(0, 1)[loaded.map_key] == NEW_RASM_MAP
+
+    loaded.enable_journal()
+    loaded.compact()
+    assert not compacting_path.exists()
+    assert not journal_path.exists()
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 0)[loaded.map_key] == RASM_MAP
+    assert loaded.get_aya(0, 1)[loaded.map_key] == NEW_RASM_MAP
+
+
+def test_failed_save_is_retried(tmp_path):
+    quran_path = copy_quran_script(tmp_path)
+    corpus = FailingSaveCorpus.from_file(quran_path)
+    worker = PersistenceWorker(corpus, debounce=0.0)
+    corpus.set_aya_maps(0, 0, rasm_map=RASM_MAP)
+    worker.mark_dirty(0, 0)
+
+    worker.flush()
+    assert isinstance(worker.last_error, OSError)
+    assert worker.pending_dirty == 1
+    assert worker.last_flush_time is None
+    assert worker.status()['last_error'] is not None
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 0).get(loaded.map_key) != RASM_MAP
+
+    # the retry saves the change
+    worker.flush()
+    assert worker.last_error is None
+    assert worker.pending_dirty == 0
+    assert worker.last_flush_time is not None
+    loaded = QuranCorpus.from_file(quran_path)
+    assert loaded.get_aya(0, 0)[loaded.map_key] == RASM_MAP
@@ -0,0 +1,163 @@
+import pytest
+from quran_transcript import Aya, search, search_many, iter_search, fuzzy_search
+from quran_transcript.corpus import CACHE_DIR_ENV
+from quran_transcript.streaming import StreamingSearcher
+from quran_transcript.suffix_array import search_suffix_array
+from quran_transcript.word_index import search_words
+from quran_transcript.utils import _get_aya_distance
+
+NORMALIZE_KWARGS = {'remove_tashkeel': True}
+
+QUERIES = [
+    'الحمد لله رب العالمين',
+    'فبأي آلاء ربكما تكذبان',
+    # with bismillah
+    'بسم الله الرحمن الرحيم الم ذلك الكتاب',
+    # with istiaatha
+    'أعوذ بالله من الشيطان الرجيم قل هو الله أحد',
+    # istiaatha only
+    'أعوذ بالله من الشيطان الرجيم',
+    # across ayat
+    'الرحيم مالك يوم الدين',
+    'لا يوجد',
+]
+
+# the end of the Quran then its start
+WRAP_AROUND_QUERY = 'من الجنة والناس بسم الله الرحمن الرحيم الحمد لله'
+
+
+def get_key(item) -> tuple:
+    """
+    the fields of a `SearchItem` (or a `LazySearchItem`) to compare
+    """
+    return (
+        None if item.start_aya is None else item.start_aya.absolute_idx,
+        item.num_ayat,
+        None if item.imlaey_word_span is None else (
+            item.imlaey_word_span.start, item.imlaey_word_span.end),
+        item.has_bismillah,
+        item.has_istiaatha,
+        item.uthmani_script,
+    )
+
+
+def get_keys(items) -> list[tuple]:
+    return [get_key(item) for item in items]
+
+
+def search_quran(text: str) -> list[tuple]:
+    return get_keys(search(text, scope='quran', **NORMALIZE_KWARGS))
+
+
+@pytest.mark.parametrize('text', QUERIES)
+def test_scope_quran(text):
+    # a window of the whole Holy Quran
+    start_aya = Aya.from_absolute(3118)
+    expected = get_keys(search(
+        text, start_aya=start_aya, window=start_aya.corpus.num_ayat - 1,
+        **NORMALIZE_KWARGS))
+    assert search_quran(text) == expected
+
+
+@pytest.mark.parametrize('text', QUERIES)
+def test_suffix_array(text, monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    expected = search_quran(text)
+    assert get_keys(search_suffix_array(text, **NORMALIZE_KWARGS)) == expected
+
+
+@pytest.mark.parametrize('text', QUERIES)
+def test_search_words(text):
+    assert get_keys(search_words(text, **NORMALIZE_KWARGS)) == search_quran(text)
+
+
+@pytest.mark.parametrize('text', QUERIES)
+def test_fuzzy_search_without_edits(text):
+    found = fuzzy_search(text, max_edits=0, **NORMALIZE_KWARGS)
+    assert all(item.edit_distance == 0 for item in found)
+    assert get_keys(found) == search_quran(text)
+
+
+@pytest.mark.parametrize('text', QUERIES)
+def test_streaming_searcher(text):
+    searcher = StreamingSearcher(**NORMALIZE_KWARGS)
+    for word in text.split():
+        searcher.feed(word)
+    assert get_keys(searcher.get_results()) == search_quran(text)
+
+
+@pytest.mark.parametrize('text, start_aya, window', [
+    (text, Aya(2, 255), 6) for text in QUERIES] + [
+    (WRAP_AROUND_QUERY, Aya(114, 6), 4),
+    ('الله', Aya(1, 1), 20),
+])
+def test_top_k(text, start_aya, window):
+    found = search(text, start_aya=start_aya, window=window, **NORMALIZE_KWARGS)
+    num_ayat = start_aya.corpus.num_ayat
+    expected = sorted(found, key=lambda item: 0 if item.start_aya is None else (
+        _get_aya_distance(item.start_aya.absolute_idx, start_aya.absolute_idx, num_ayat)))
+    for top_k in [1, 3]:
+        top_found = search(
+            text, start_aya=start_aya, window=window, top_k=top_k,
+            **NORMALIZE_KWARGS)
+        assert get_keys(top_found) == get_keys(expected[:top_k])
+
+
+@pytest.mark.parametrize('text, start_aya', [
+    ('الحمد لله', Aya(2, 1)),
+    ('فبأي آلاء ربكما تكذبان', Aya(55, 1)),
+    (WRAP_AROUND_QUERY, Aya(113, 1)),
+])
+def test_min_results(text, start_aya):
+    min_results, max_window = 2, 64
+    # the doubling windows of `min_results`
+    window = 1
+    while True:
+        expected = search(
+            text, start_aya=start_aya, window=window, **NORMALIZE_KWARGS)
+        if len(expected) >= min_results or window >= max_window:
+            break
+        window = min(2 * window, max_window)
+    found = search(
+        text, start_aya=start_aya, window=1, min_results=min_results,
+        max_window=max_window, **NORMALIZE_KWARGS)
+    assert get_keys(found) == get_keys(expected)
+
+
+def test_wrap_around():
+    found = search(
+        WRAP_AROUND_QUERY, start_aya=Aya(114, 6), window=4, **NORMALIZE_KWARGS)
+    # from the last aya to the second aya of Al-Fatiha
+    assert [get_key(item)[:5] for item in found] == [
+        (Aya(114, 6).absolute_idx, 3, (0, 2), False, False)]
+    assert found[0].uthmani_script.startswith(Aya(114, 6).get().uthmani)
+
+
+@pytest.mark.parametrize('text, start_aya, window, scope', [
+    (text, Aya(1, 1), 8, scope) for text in QUERIES for scope in ['window', 'quran']
+] + [
+    (WRAP_AROUND_QUERY, Aya(114, 6), 4, 'window'),
+])
+def test_iter_search(text, start_aya, window, scope):
+    expected = get_keys(search(
+        text, start_aya=start_aya, window=window, scope=scope,
+        **NORMALIZE_KWARGS))
+    found = list(iter_search(
+        text, start_aya=start_aya, window=window, scope=scope,
+        **NORMALIZE_KWARGS))
+    assert get_keys(found) == expected
+
+
+@pytest.mark.parametrize('scope', ['window', 'quran'])
+def test_search_many(scope):
+    texts = QUERIES + [WRAP_AROUND_QUERY]
+    start_ayat = [Aya(1, 1)] * len(QUERIES) + [Aya(114, 6)]
+    expected = [
+        get_keys(search(
+            text, start_aya=start_aya, window=4, scope=scope, **NORMALIZE_KWARGS))
+        for text, start_aya in zip(texts, start_ayat)
+    ]
+    found = search_many(
+        texts, start_ayat=start_ayat, window=4, scope=scope, max_workers=1,
+        **NORMALIZE_KWARGS)
+    assert [get_keys(items) for items in found] == expected
@@ -0,0 +1,55 @@
+import json
+import tempfile
+from pathlib import Path
+from quran_transcript import sharded_corpus
+from quran_transcript.corpus import DEFAULT_QURAN_PATH, QuranCorpus
+from quran_transcript.sharded_corpus import (
+    ShardedQuranCorpus, split_quran_script)
+from quran_transcript.persistence import PersistenceWorker
+
+
+def read_sura_file(quran_dir: Path, sura_idx: int) -> dict:
+    sura_file = quran_dir / sharded_corpus._get_sura_file_name(sura_idx)
+    with open(sura_file, 'r', encoding='utf8') as f:
+        return json.load(f)
+
+
+def test_failed_save_is_retried(monkeypatch):
+    rasm_map = [{'uthmani': 'a', 'imlaey': 'a'}]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        quran_dir = Path(tmp_dir) / 'quran'
+        split_quran_script(QuranCorpus.from_file(DEFAULT_QURAN_PATH), quran_dir)
+        corpus = ShardedQuranCorpus(quran_dir)
+        worker = PersistenceWorker(corpus, debounce=0.0)
+        corpus.set_aya_maps(0, 0, rasm_map=rasm_map)
+        corpus.set_aya_maps(1, 0, rasm_map=rasm_map)
+        worker.mark_dirty(0, 0)
+        worker.mark_dirty(1, 0)
+
+        # a full disk while writing the second sura
+        write_json_atomic = sharded_corpus._write_json_atomic
+        num_writes = 0
+
+        def failing_write_json_atomic(obj, path):
+            nonlocal num_writes
+            num_writes += 1
+            if num_writes == 2:
+                raise OSError('No space left on device')
+            write_json_atomic(obj, path)
+
+        monkeypatch.setattr(
+            sharded_corpus, '_write_json_atomic', failing_write_json_atomic)
+        worker.flush()
+        assert isinstance(worker.last_error, OSError)
+        assert worker.pending_dirty == 2
+        assert corpus._dirty_suar == {1}
+        assert read_sura_file(quran_dir, 0)['aya'][0][corpus.map_key] == rasm_map
+        assert read_sura_file(quran_dir, 1)['aya'][0].get(corpus.map_key) != rasm_map
+
+        # the retry writes the sura not written
+        worker.flush()
+        assert worker.last_error is None
+        assert worker.pending_dirty == 0
+        assert corpus._dirty_suar == set()
+        assert num_writes == 3
+        assert read_sura_file(quran_dir, 1)['aya'][0][corpus.map_key] == rasm_map
@@ -0,0 +1,20 @@
+from quran_transcript.corpus import CACHE_DIR_ENV
+from quran_transcript.suffix_array import SuffixArray
+
+
+def test_truncated_cache_is_rebuilt(monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    text = 'بسماللهالرحمنالرحيمالحمدللهربالعالمينالرحمنالرحيم'
+    suffix_array = SuffixArray.load_or_build(text)
+    cache_path = SuffixArray.get_cache_path(text)
+    data = cache_path.read_bytes()
+
+    # a crash while writing the cache (or a file of an older version)
+    for corrupted_data in [data[: len(data) // 2], data[:10], b'', data[:-1]]:
+        cache_path.write_bytes(corrupted_data)
+        loaded = SuffixArray.load_or_build(text)
+        assert loaded.suffix_array == suffix_array.suffix_array
+        assert loaded.lcp == suffix_array.lcp
+        assert loaded.find_all('الرحيم') == suffix_array.find_all('الرحيم')
+        # the cache file is written again
+        assert cache_path.read_bytes() == data